@@ -3,25 +3,68 @@ By: Deon Hua
 Date: 16 May 2013
 Description: pyAsteroids - a remake of the original game in python! The game contains
 a few functions to control the game's menus and overall gameplay. The main()
-function is used to call all of this.
+function is used to call all of this. Importing the module does nothing but
+import; pygame is only initialized by main(), one part at a time as it is
+needed: the display first, fonts when text is first drawn and the mixer once
+the main menu is on screen.
+
+Usage: python Asteroids.py [--timings] [--size WxH] [--window WxH] [--fullscreen]
+                           [--smooth] [--swarm]
 '''
 
-#Import and Initialize
-import pygame, pygame.mixer, asteroidsSprites, random
-pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((640, 480))
+#Import
+import time
+STARTED = time.perf_counter()
+import argparse, importlib.util, pygame, pygame.mixer, asteroidsAssets, asteroidsClock, asteroidsDisplay, \
+       asteroidsProfiler, asteroidsSound, asteroidsSprites, asteroidsWorld
+
+#The Display showing the game, and the surface the game is drawn on, opened
+#by init().
+display = None
+screen = None
+
+#The SoundManager shared by every game, made by the first one.
+sounds = None
+
+#Files needed by play(), preloaded while the menu is shown.
+GAME_ASSETS = asteroidsWorld.ASSETS + ("./Audio/engine.ogg", "./Audio/laser.ogg", \
+                                       "./Audio/explosion.ogg", "./Audio/powerup.ogg")
+
+#Particles are drawn when NumPy is there to move them.
+PARTICLES = importlib.util.find_spec("numpy") is not None
+
+#Times each step of starting up, until the main menu is first shown.
+startup = asteroidsProfiler.PhaseTimer(STARTED)
+startup.lap("imports")
 
 
 
-def main():
-    '''This function defines the 'mainline logic' for Asteroids. It takes no
-    parameters and returns no values. However, it does process returned values
-    from the main_menu() function and goes through the proper functions from that.'''
+def init(new_display=None):
+    '''This function initializes the display, opens the window of the given
+    asteroidsDisplay.Display (by default a 640x480 window) and shows a blank
+    frame at once, before anything is loaded. It returns nothing.'''
+    global display, screen
+    display = new_display or asteroidsDisplay.Display()
+    pygame.display.init()
+    startup.lap("display init")
+    screen = display.open("Asteroids!")
+    startup.lap("window")
+    screen.fill((0, 0, 0))
+    display.present()
+    startup.lap("first frame")
+
+def main(timings=False, new_display=None, swarm=False):
+    '''This function defines the 'mainline logic' for Asteroids. It returns no
+    values. However, it does process returned values from the main_menu()
+    function and goes through the proper functions from that. If timings is
+    True, how long each step of starting up took is printed once the main
+    menu is first shown. The game is shown on the given Display, or in a
+    640x480 window. If swarm is True, every game is played in the swarm
+    stress mode.'''
     #Display
-    pygame.display.set_caption("Asteroids!")
+    init(new_display)
     
-    option = main_menu()
+    option = main_menu(timings)
     
     keepGoing = True
     
@@ -32,7 +75,7 @@ def main():
             help_menu()
             option = main_menu()
         elif option == "play":
-            play()
+            play(swarm=swarm)
             option = main_menu()
             
       
@@ -42,21 +85,35 @@ def main():
     pygame.quit()
     
 
-def main_menu():
+def main_menu(timings=False):
     '''This function is the main menu for asteroids. It displays the title and
-    three buttons for the user to choose from. It takes no parameters, but returns
-    quit, play, or help depending on what button is pressed.'''
+    three buttons for the user to choose from. It returns quit, play, or help
+    depending on what button is pressed. Starting up ends once the menu is
+    ready, before it waits for the user; if timings is True, how long each
+    step took is printed then.'''
     #Entities
-    background = pygame.Surface(screen.get_size())
-    background = pygame.image.load("menu.png")
+    background = asteroidsAssets.load_scaled("menu.png", screen.get_size(), False)
+    startup.lap("menu image")
     screen.blit(background, (0,0))
+    display.present()
+    startup.lap("menu shown")
+    
+    #Start the mixer, then start loading the game in the background while the
+    #player is in the menu
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    asteroidsAssets.preload(GAME_ASSETS)
     
 
     #Create Sprites
     cursor = asteroidsSprites.Cursor()
-    play_button = asteroidsSprites.Button(500, 150, "play")
-    help_button = asteroidsSprites.Button(500, 250, "help")
-    quit_button = asteroidsSprites.Button(500, 350, "quit")
+    play_button = asteroidsSprites.Button(*display.from_base(500, 150), variant="play")
+    help_button = asteroidsSprites.Button(*display.from_base(500, 250), variant="help")
+    quit_button = asteroidsSprites.Button(*display.from_base(500, 350), variant="quit")
+    startup.lap("menu sprites")
+    startup.finish()
+    if timings:
+        print(startup.report())
     
     allSprites = pygame.sprite.OrderedUpdates(quit_button, play_button, help_button, cursor)
     
@@ -85,7 +142,7 @@ def main_menu():
                 if event.key == pygame.K_ESCAPE:
                     return "quit"
             elif event.type == pygame.MOUSEMOTION:
-                cursor.update_position (pygame.mouse.get_pos())
+                cursor.update_position(display.to_logical(pygame.mouse.get_pos()))
                     
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if cursor.rect.colliderect(play_button.rect):
@@ -97,11 +154,10 @@ def main_menu():
                 
    
                 
-        #Refresh Screen
+        #Refresh Screen, only updating the parts that changed
         allSprites.clear(screen, background)
         allSprites.update()
-        allSprites.draw(screen)
-        pygame.display.flip()
+        display.present(allSprites.draw(screen))
                 
         
     
@@ -109,15 +165,15 @@ def help_menu():
     '''The help menu displays the instructions (a small backstory and controls)
     for the user. It takes no parameters and returns nothing.'''
     #Entities
-    background = pygame.Surface(screen.get_size())
-    background = pygame.image.load("help.png")
+    background = asteroidsAssets.load_scaled("help.png", screen.get_size(), False)
     screen.blit(background, (0,0))
+    display.present()
 
     #SPAWN BUTTONS
     
     cursor = asteroidsSprites.Cursor()
-    back_button = asteroidsSprites.Button(50,20,"back")
-    allSprites = pygame.sprite.Group(back_button, cursor)
+    back_button = asteroidsSprites.Button(*display.from_base(50, 20), variant="back")
+    allSprites = pygame.sprite.RenderUpdates(back_button, cursor)
     
     #ACTION
     
@@ -145,23 +201,47 @@ def help_menu():
                     keepGoing = False
                     
             elif event.type == pygame.MOUSEMOTION:
-                cursor.update_position (pygame.mouse.get_pos())
+                cursor.update_position(display.to_logical(pygame.mouse.get_pos()))
                     
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if cursor.rect.colliderect(back_button.rect):
                     keepGoing = False
             
                 
-        #Refresh Screen
+        #Refresh Screen, only updating the parts that changed
         allSprites.clear(screen, background)
         allSprites.update()
-        allSprites.draw(screen)
-        pygame.display.flip()
+        display.present(allSprites.draw(screen))
+
+def load_sounds():
+    '''This function makes the SoundManager for the game and loads the sound
+    effects into it. The engine loops on a channel of its own; explosions and
+    powerups are more important than lasers and may cut them off, and a
+    sound is not restarted within a few frames of itself. It takes no
+    parameters and returns the SoundManager.'''
+    manager = asteroidsSound.SoundManager(channels=8, loops=("engine",))
+    manager.load("engine", "./Audio/engine.ogg", 0.2)
+    manager.load("laser", "./Audio/laser.ogg", 0.4, priority=1, min_interval=30)
+    manager.load("explosion", "./Audio/explosion.ogg", 0.4, priority=2, min_interval=60)
+    manager.load("powerup", "./Audio/powerup.ogg", 0.5, priority=3)
+    return manager
 
-def play(): 
+def play(recording=None, swarm=False):
     '''This function runs the in-game animation loop and is where most of the
     action occurs. Music and images are initialized in this loop in order for
-    usage during the game. The function takes no parameters and returns nothing.'''
+    usage during the game. The game logic itself lives in asteroidsWorld.World;
+    this loop turns key presses into actions for it, plays the sounds it asks
+    for and draws it. The game logic steps 30 times a second no matter how
+    fast frames are drawn; frames are drawn up to 144 times a second, with the
+    sprites blended between steps. If an asteroidsReplay.Recording is given,
+    the game is seeded from it and every step's actions are recorded, so the
+    game can be replayed exactly; the recording should be empty, as it holds
+    this one game. Every phase of each frame is timed: F3 shows or hides the
+    timings on screen and F4 saves them to profile.json and profile.csv. If
+    swarm is True (and there is no recording, which has its own options),
+    the game is played in the swarm stress mode, where asteroids split and
+    multiply, and the timings are shown from the start so the frame budget
+    can be watched. The function returns nothing.'''
     
     #Entities
     background = pygame.Surface(screen.get_size())
@@ -169,56 +249,36 @@ def play():
     screen.blit(background, (0,0))
     
     #Load Fonts
-    myCustomFont = pygame.font.Font("good times rg.ttf", 63)
+    myCustomFont = asteroidsAssets.load_font("good times rg.ttf", 63)
     game_over = myCustomFont.render("Game Over!", 1, (255,255,255))
         
-    #Load Music
-    music = pygame.mixer.music.load("./Audio/vigil.ogg")
-    pygame.mixer.music.play(-1)
-    pygame.mixer.music.set_volume(0.5)
-    explosion = pygame.mixer.Sound("./Audio/explosion.ogg")
-    powerup_sound = pygame.mixer.Sound("./Audio/powerup.ogg")
-    engine = pygame.mixer.Sound("./Audio/engine.ogg")
-    laser = pygame.mixer.Sound("./Audio/laser.ogg")
-    engine.set_volume(0.2)
-    explosion.set_volume(0.4)
-    laser.set_volume(0.4)
-    powerup_sound.set_volume(0.5)
+    #Load the music and sounds, only the first time a game is played. The
+    #mixer is normally started by the main menu already.
+    global sounds
+    if sounds is None:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        sounds = load_sounds()
+    sounds.play_music("./Audio/vigil.ogg", 0.5)
     
-    #Load images to prevent load from disk everytime the sprite is initialized
-    asteroid_image = pygame.image.load("asteroid.png")
-    ufo_image = pygame.image.load("UFO.png")
-    powerup_images = []
-    for number in range (1, 4):
-        image = pygame.image.load("./Powerups/%d.png" %number)
-        powerup_images.append(image)
-            
-    #Create sprites
-    scorekeeper = asteroidsSprites.ScoreKeeper()
-    space = asteroidsSprites.Space()
-    spaceship = asteroidsSprites.Spaceship(screen)
-    
-    #Create Sprite Groups
-    spaceshipSprite = pygame.sprite.Group(spaceship)
-    asteroidSprites = pygame.sprite.Group()        
-    rocketSprites = pygame.sprite.Group()
-    enemyRocketSprites = pygame.sprite.Group()
-    shieldSprites = pygame.sprite.GroupSingle()    
-    powerupSprites = pygame.sprite.Group()
-    ufoSprites = pygame.sprite.Group()
-     
-    #Larger Groups
-    dangerSprites = pygame.sprite.Group(enemyRocketSprites, asteroidSprites, ufoSprites)
-
-    allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)    
+    #Create the game world
+    if recording is None:
+        options = asteroidsWorld.SWARM if swarm else {}
+        world = asteroidsWorld.World(screen, asteroidsWorld.load_images(), frame_rate=30, \
+                                     interpolate=True, particles=PARTICLES, **options)
+    else:
+        world = recording.new_world(screen, asteroidsWorld.load_images(), interpolate=True, \
+                                    particles=PARTICLES)
     
     #ACTION
     
     #Assign         
-    clock = pygame.time.Clock()
+    timestep = asteroidsClock.FixedTimestep(rate=30, max_steps=5, max_fps=144)
+    profiler = asteroidsProfiler.FrameProfiler()
+    world.set_profiler(profiler)
+    if swarm:
+        profiler.toggle_overlay()
+    actions = 0
     keepGoing = True
     pause = False
      
@@ -229,7 +289,8 @@ def play():
     while keepGoing:
         
         #Time
-        clock.tick(30)
+        steps = timestep.tick()
+        profiler.begin()
 
         #Events
         for event in pygame.event.get():
@@ -249,200 +310,104 @@ def play():
                                 if event.key == pygame.K_p:
                                     pause = not pause
                         pygame.event.clear()
+                    timestep.reset()
                         
+                #Shows/Hides the frame timings if F3 is pressed, saves them if F4 is
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                    world.repaint()
+                if event.key == pygame.K_F4:
+                    profiler.save_json("profile.json")
+                    profiler.save_csv("profile.csv")
+                    
                 if event.key == pygame.K_RIGHT:
-                    spaceship.rotate_right()
+                    actions |= asteroidsWorld.ROTATE_RIGHT
                 if event.key == pygame.K_LEFT:
-                    spaceship.rotate_left()
-                    
-                #Activates the shields if "s" is pressed and the capacity is over 50
-                if event.key == pygame.K_s and (scorekeeper.get_shield() > 50):
-                    shield = asteroidsSprites.Shield(spaceship.rect.centerx, \
-                                                     spaceship.rect.centery, \
-                                                     scorekeeper.get_shield())
-                    shieldSprites.add(shield)
-                    allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)
+                    actions |= asteroidsWorld.ROTATE_LEFT
+                #Activates the shields if "s" is pressed
+                if event.key == pygame.K_s:
+                    actions |= asteroidsWorld.SHIELD
                 #Allows player to shoot if spacebar is pressed.
                 if event.key == pygame.K_SPACE:
-                    rocket = asteroidsSprites.Rocket(spaceship.get_angle(), \
-                                                     spaceship.rect.centerx, \
-                                                     spaceship.rect.centery, \
-                                                     screen, True)
-                    engine.stop()
-                    laser.play()
-                    rocketSprites.add(rocket)
-                    
-                    allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                                , enemyRocketSprites, scorekeeper)  
+                    actions |= asteroidsWorld.FIRE
                     
         #Allows for the user to move "forwards" by using the up arrow key.       
         keys = pygame.key.get_pressed()
 
         if keys[pygame.K_UP]:
-            spaceship.move_forwards()
-            engine.play(-1)
-        else:
-            engine.stop()
-        
-        #Ensures that there are 5 asteroids at all times.
-        while len(asteroidSprites.sprites()) < 5:
-            new_asteroid = asteroidsSprites.Asteroid(screen, asteroid_image)
-            asteroidSprites.add(new_asteroid)
-            
-            dangerSprites = pygame.sprite.Group(enemyRocketSprites, asteroidSprites, ufoSprites)
-            allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)   
-        
-        #Spawns a UFO if none exist, every 10 sec. when the score is larger than 250
-        if not ufoSprites and ((pygame.time.get_ticks()/1000 % 10) == 0) and \
-           (scorekeeper.get_score() >= 250):
-            ufo = asteroidsSprites.UFO(screen, ufo_image)
-            ufoSprites.add(ufo)
-            
-            dangerSprites = pygame.sprite.Group(enemyRocketSprites, asteroidSprites, ufoSprites)
-            allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)  
-        
-        #UFO AI shooting
-        if ufoSprites and ((pygame.time.get_ticks()/25 %20) == 0):
-            if ufo.shoot(spaceship.rect.centerx, spaceship.rect.centery) == 1:
-                if spaceship.rect.centery < ufo.rect.centery:
-                    rocket = asteroidsSprites.Rocket(90, ufo.rect.centerx, ufo.rect.centery, \
-                                                     screen, False)
-                else:
-                    rocket = asteroidsSprites.Rocket(270, ufo.rect.centerx, ufo.rect.centery, \
-                                                     screen, False)
-                engine.stop()
-                laser.play()
-                
-                enemyRocketSprites.add(rocket)
-                
-                dangerSprites = pygame.sprite.Group(enemyRocketSprites, asteroidSprites,\
-                                                    ufoSprites)    
-                allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)  
-                
-            elif ufo.shoot(spaceship.rect.centerx, spaceship.rect.centery) == 2:
-                if spaceship.rect.centerx < ufo.rect.centerx:
-                    rocket = asteroidsSprites.Rocket(180, ufo.rect.centerx, ufo.rect.centery, \
-                                                     screen, False)
-                else:
-                    rocket = asteroidsSprites.Rocket(0, ufo.rect.centerx, ufo.rect.centery, \
-                                                     screen, False)
-                enemyRocketSprites.add(rocket)
-                
-                dangerSprites = pygame.sprite.Group(enemyRocketSprites, asteroidSprites,\
-                                                    ufoSprites)
-                engine.stop()
-                laser.play()
-                allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)  
-                  
-                
-        #Charging / Draining the shield.    
-        if shieldSprites:    
-            shield.update_location(spaceship.rect.centerx, spaceship.rect.centery)
-            shield.update_capacity(scorekeeper.get_shield())
-            #If shield is drained, empty the shieldSprites group.
-            if not scorekeeper.get_shield():
-                shieldSprites.empty()
-            scorekeeper.enable_shield()
+            actions |= asteroidsWorld.THRUST
+            sounds.loop("engine")
         else:
-            scorekeeper.recharge_shield()
-            
-                        
-                    
-        #--------------------Collision Detection--------------------------------
-        #Between the shield and anything dangerous to the player.
-        if pygame.sprite.groupcollide(shieldSprites, dangerSprites, True, True):
-            engine.stop()
-            explosion.play()
-        
-        #Between the asteroids and the rockets
-        for asteroid in pygame.sprite.groupcollide(asteroidSprites, rocketSprites, False, True):
-            scorekeeper.add_score(10*asteroid.get_size())
-            asteroid.collided()
-            engine.stop()
-            explosion.play()
+            sounds.stop("engine")
+        profiler.lap("events")
         
-        #Rocket collision with the UFO, may spawn a powerup
-        if pygame.sprite.groupcollide(rocketSprites, ufoSprites, False, False):
-            engine.stop()
-            explosion.play()
-            scorekeeper.add_score(50)
-            random_number = random.randint(1,5)
-            if (random_number <= 3):
-                powerup = asteroidsSprites.Powerup(random_number, ufo.rect.centerx, \
-                                                   ufo.rect.centery, powerup_images)
-                powerupSprites.add(powerup)
-                allSprites = pygame.sprite.OrderedUpdates(space, powerupSprites, \
-                                                          asteroidSprites, shieldSprites\
-                                                          ,spaceship, ufoSprites, rocketSprites\
-                                              , enemyRocketSprites, scorekeeper)
-            pygame.sprite.groupcollide(rocketSprites, ufoSprites, True, True)
-                
+        #Run the steps of the game that are due and play the sounds they
+        #triggered. Key presses only count once, in the first step; keys
+        #pressed while no step was due wait for the next one.
+        for step in range(steps):
+            if recording is not None:
+                recording.record(actions)
+            for sound in world.step(actions):
+                if sound == "powerup":
+                    sounds.stop("explosion")
+                sounds.play(sound)
+            profiler.lap("sounds")
+            actions &= asteroidsWorld.THRUST
 
-        if pygame.sprite.spritecollide(spaceship, dangerSprites, True):            
-            scorekeeper.lose_life()
-            engine.stop()
-            explosion.play()
-            
-            #Resets the spaceship in its "start position" if there are lives left.
-            if scorekeeper.get_lives():
-                spaceship.reset()
-                
-                for sprite in dangerSprites:
-                    sprite.reset()
-                rocketSprites.empty()
-                enemyRocketSprites.empty()
-            else:
-                spaceship.kill()
-                
-        #Give powerup buff to player
-        for powerup in pygame.sprite.spritecollide(spaceship,powerupSprites,False):
-            if powerup.get_type() == 1:
-                scorekeeper.add_capacity()
-            elif powerup.get_type() == 2:
-                scorekeeper.add_life()
-            else:
-                scorekeeper.add_score(100)
-            engine.stop()
-            explosion.stop()
-            powerup_sound.play()
-        #Destroys the sprite once collided with and activated.    
-        pygame.sprite.spritecollide(spaceship, powerupSprites, True)
-         
-        
-        #Game over when lives = 0.
-        if not scorekeeper.get_lives():
-            keepGoing = False
+            #Game over when lives = 0.
+            if world.is_over():
+                keepGoing = False
+                break
+        if steps:
+            actions = 0
             
-        #Refresh screen
-        allSprites.clear(screen, background)
-        allSprites.update()
-        allSprites.draw(screen)
-        pygame.display.flip()
+        #Refresh screen, only updating the parts that changed
+        rects = world.draw(screen, timestep.get_alpha())
+        overlay = profiler.draw_overlay(screen)
+        if overlay:
+            rects.append(overlay)
+        display.present(rects)
+        profiler.lap("display")
+        profiler.end()
+    
+    if recording is not None:
+        recording.finish(world, 1)
     
     #Display "Game Over!" message
-    screen.blit(game_over, (80,100))
-    pygame.display.flip()
+    position = game_over.get_rect()
+    position.centerx = screen.get_width() // 2
+    position.top = display.from_base(0, 100)[1]
+    screen.blit(game_over, position)
+    display.present()
     
     #Fade music
+    sounds.stop_all()
     pygame.mixer.music.fadeout(2000)    
     pygame.time.delay(2000)
    
-# Call the main function
-main()
+def parse_size(text):
+    '''This function turns a size given as WIDTHxHEIGHT on the command line
+    into a (width, height) tuple, and returns it.'''
+    try:
+        width, height = [int(number) for number in text.lower().split("x")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected WIDTHxHEIGHT, got %r" % text)
+    return (width, height)
+
+# Call the main function when run as a program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pyAsteroids")
+    parser.add_argument("--timings", action="store_true", \
+                        help="print how long each step of starting up took")
+    parser.add_argument("--size", type=parse_size, default=asteroidsDisplay.BASE_SIZE, \
+                        metavar="WxH", help="resolution the game is drawn at")
+    parser.add_argument("--window", type=parse_size, metavar="WxH", \
+                        help="size of the window, if different")
+    parser.add_argument("--fullscreen", action="store_true", help="fill the screen")
+    parser.add_argument("--smooth", action="store_true", \
+                        help="scale to fill the window exactly, not by a whole number")
+    parser.add_argument("--swarm", action="store_true", \
+                        help="asteroids split and multiply, with the frame timings shown")
+    args = parser.parse_args()
+    main(args.timings, asteroidsDisplay.Display(args.size, args.window, not args.smooth, \
+                                                args.fullscreen), args.swarm)
@@ -0,0 +1,270 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: A cache for the images, sounds and fonts used by Asteroids. Each
+file is read and decoded from disk only once, and images are converted to the
+display's pixel format so that blitting them is fast. The cache is shared by
+the menus and every game, and keeps track of how long loading took and how
+much memory the assets use. Rotated and scaled variants of an image are also
+built once and cached, so sprites never transform pixels during the game,
+and so is the collision mask of every image. Surfaces that sprites make while
+the game runs (text, shapes) are made through the cache too, so that they
+can be counted. Files can be preloaded on worker threads while the player is
+still in the menus, leaving only the conversion to the display format for the
+main thread.
+'''
+import concurrent.futures, io, os, time, weakref, pygame
+
+#Extensions of the files preloaded as images and as sounds; other files are
+#read as bytes.
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+SOUND_EXTENSIONS = (".ogg", ".wav")
+
+class AssetCache(object):
+    '''Loads assets on first use and hands out the same object afterwards.
+
+    Instance Variables:
+    self.__assets - dict of (kind, path, ...) keys to the loaded assets
+    self.__unconverted - keys of images loaded before there was a display
+    self.__stats - dict of keys to (seconds taken to load, bytes used)
+    self.__masks - dict of images to their collision masks, which forgets an
+                   image once nothing else uses it
+    self.__allocated - number of surfaces made by new_surface() and
+                       render_text() so far
+    self.__pending - dict of normalized paths to the Futures of files being
+                     preloaded, see preload()
+    self.__executor - ThreadPoolExecutor the files are preloaded on, or None
+    '''
+    def __init__(self):
+        '''Initializer method for the AssetCache.'''
+        self.__assets = {}
+        self.__unconverted = set()
+        self.__stats = {}
+        self.__masks = weakref.WeakKeyDictionary()
+        self.__allocated = 0
+        self.__pending = {}
+        self.__executor = None
+
+    def preload(self, paths, workers=2):
+        '''Starts reading the files at the given paths on worker threads, and
+        returns at once. Images are decoded there too (but not converted,
+        which needs the main thread), and so are sounds if the mixer has been
+        started; other files are read into memory.
+        Loading one of them later waits for its file if it is not ready yet.
+        Files that are loaded or already being preloaded are skipped.'''
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(workers)
+        loaded = set(key[1] for key in self.__assets)
+        for path in paths:
+            path = os.path.normpath(path)
+            if path not in loaded and path not in self.__pending:
+                self.__pending[path] = self.__executor.submit(self.__read, path)
+
+    def __read(self, path):
+        '''Decodes an image or a sound, or reads any other file into bytes.
+        Runs on a worker thread.'''
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            return pygame.image.load(path)
+        if path.lower().endswith(SOUND_EXTENSIONS) and pygame.mixer.get_init():
+            return pygame.mixer.Sound(path)
+        with open(path, "rb") as source:
+            return source.read()
+
+    def __preloaded(self, path):
+        '''Returns what was preloaded for a path, waiting for it if needed, or
+        None if it was not preloaded. Errors are raised here, on the thread
+        that needs the file.'''
+        future = self.__pending.pop(path, None)
+        if future is None:
+            return None
+        return future.result()
+
+    def get_preload_progress(self):
+        '''Returns the number of preloaded files that are ready and the number
+        still being preloaded or waiting to be.'''
+        done = sum(1 for future in self.__pending.values() if future.done())
+        return done, len(self.__pending) - done
+
+    def load_image(self, path, alpha=None):
+        '''Returns the image at the given path, converted to the display
+        format. Images with per-pixel alpha keep it, unless alpha is False,
+        which is faster to blit for images that are fully opaque anyway.'''
+        key = ("image", os.path.normpath(path), alpha)
+        if key in self.__assets and key not in self.__unconverted:
+            return self.__assets[key]
+
+        start = time.perf_counter()
+        image = self.__assets.get(key)
+        if image is None:
+            image = self.__preloaded(key[1])
+        if image is None:
+            image = pygame.image.load(path)
+
+        #Converting needs a display mode, so it waits until there is one.
+        if pygame.display.get_surface():
+            if alpha or (alpha is None and image.get_flags() & pygame.SRCALPHA):
+                image = image.convert_alpha()
+            else:
+                image = image.convert()
+            self.__unconverted.discard(key)
+        else:
+            self.__unconverted.add(key)
+
+        self.__assets[key] = image
+        self.__record(key, start, image.get_width() * image.get_height() * image.get_bytesize())
+        return image
+
+    def load_rotations(self, path, step=90, facing=90):
+        '''Returns a dict of angle to the image at the given path rotated to
+        face that angle, for every multiple of step degrees from 0 to 359. The
+        image on disk faces the given angle (90 is up). Each variant is rotated
+        from the original, so no detail is lost by rotating a rotated image.'''
+        key = ("rotations", os.path.normpath(path), step, facing)
+        if key not in self.__assets:
+            image = self.load_image(path)
+            start = time.perf_counter()
+            rotations = {}
+            size = 0
+            for angle in range(0, 360, step):
+                rotations[angle] = pygame.transform.rotate(image, angle - facing)
+                size += rotations[angle].get_width() * rotations[angle].get_height() * \
+                        rotations[angle].get_bytesize()
+            self.__assets[key] = rotations
+            self.__record(key, start, size)
+        return self.__assets[key]
+
+    def load_scaled(self, path, size, alpha=None):
+        '''Returns the image at the given path scaled to the given (width,
+        height), scaled once from the original. The original is returned if it
+        is that size already. alpha is passed on to load_image().'''
+        image = self.load_image(path, alpha)
+        if image.get_size() == tuple(size):
+            return image
+        key = ("scaled", os.path.normpath(path), tuple(size), alpha)
+        if key not in self.__assets:
+            start = time.perf_counter()
+            if image.get_bitsize() >= 24:
+                scaled = pygame.transform.smoothscale(image, size)
+            else:
+                scaled = pygame.transform.scale(image, size)
+            self.__assets[key] = scaled
+            self.__record(key, start, scaled.get_width() * scaled.get_height() * scaled.get_bytesize())
+        return self.__assets[key]
+
+    def get_mask(self, image):
+        '''Returns the collision mask of an image, made from its transparency
+        or colorkey the first time it is asked for.'''
+        mask = self.__masks.get(image)
+        if mask is None:
+            mask = self.__masks[image] = pygame.mask.from_surface(image)
+        return mask
+
+    def new_surface(self, size, flags=0):
+        '''Returns a new blank surface of the given size and flags, and counts
+        it. Unlike the other assets, it is not cached.'''
+        self.__allocated += 1
+        return pygame.Surface(size, flags)
+
+    def render_text(self, font, text, color):
+        '''Returns the text rendered, anti-aliased, in the given font and color,
+        and counts the new surface. It is not cached.'''
+        self.__allocated += 1
+        return font.render(text, 1, color)
+
+    def get_allocated(self):
+        '''Gets/Returns the number of surfaces made by new_surface() and
+        render_text() so far.'''
+        return self.__allocated
+
+    def load_sound(self, path):
+        '''Returns the sound at the given path, decoded by the mixer.'''
+        key = ("sound", os.path.normpath(path))
+        if key not in self.__assets:
+            start = time.perf_counter()
+            sound = self.__preloaded(key[1])
+            if sound is None:
+                sound = pygame.mixer.Sound(path)
+            elif not isinstance(sound, pygame.mixer.Sound):
+                sound = pygame.mixer.Sound(file=io.BytesIO(sound))
+            frequency, size, channels = pygame.mixer.get_init()
+            self.__assets[key] = sound
+            self.__record(key, start, int(sound.get_length() * frequency) * channels * abs(size) // 8)
+        return self.__assets[key]
+
+    def load_font(self, path, size):
+        '''Returns the font at the given path, in the given size. The font
+        module is initialized the first time a font is loaded.'''
+        key = ("font", os.path.normpath(path), size)
+        if key not in self.__assets:
+            start = time.perf_counter()
+            if not pygame.font.get_init():
+                pygame.font.init()
+            #The font reads its file as it goes, so it is given its own copy
+            #of the preloaded bytes.
+            data = self.__preloaded(key[1])
+            if data is None:
+                self.__assets[key] = pygame.font.Font(path, size)
+            else:
+                self.__assets[key] = pygame.font.Font(io.BytesIO(data), size)
+            self.__record(key, start, os.path.getsize(path))
+        return self.__assets[key]
+
+    def __record(self, key, start, size):
+        '''Adds the time since start to the load time of an asset and stores
+        the number of bytes it uses.'''
+        seconds = self.__stats.get(key, (0, 0))[0]
+        self.__stats[key] = (seconds + time.perf_counter() - start, size)
+
+    def get_stats(self):
+        '''Returns a list of (kind, path, seconds, bytes) for every asset.'''
+        return [(key[0], key[1], seconds, size) for key, (seconds, size) \
+                in sorted(self.__stats.items(), key=lambda item: str(item[0]))]
+
+    def report(self):
+        '''Returns a short text report of the load times and memory used.'''
+        stats = self.get_stats()
+        lines = ["%-9s %-40s %8.2f ms %8d KB" % (kind, path, seconds * 1000, size // 1024) \
+                 for kind, path, seconds, size in stats]
+        lines.append("%d assets, %.2f ms loading, %d KB" % \
+                     (len(stats), sum(stat[2] for stat in stats) * 1000, \
+                      sum(stat[3] for stat in stats) // 1024))
+        return "\n".join(lines)
+
+#The cache shared by the whole game.
+cache = AssetCache()
+
+def load_image(path, alpha=None):
+    '''Returns the image at the given path from the shared cache.'''
+    return cache.load_image(path, alpha)
+
+def load_rotations(path, step=90, facing=90):
+    '''Returns the rotations of the image at the given path from the shared cache.'''
+    return cache.load_rotations(path, step, facing)
+
+def load_scaled(path, size, alpha=None):
+    '''Returns the image at the given path scaled to size from the shared cache.'''
+    return cache.load_scaled(path, size, alpha)
+
+def get_mask(image):
+    '''Returns the collision mask of an image from the shared cache.'''
+    return cache.get_mask(image)
+
+def preload(paths, workers=2):
+    '''Starts preloading the files at the given paths into the shared cache.'''
+    cache.preload(paths, workers)
+
+def new_surface(size, flags=0):
+    '''Returns a new surface, counted by the shared cache.'''
+    return cache.new_surface(size, flags)
+
+def render_text(font, text, color):
+    '''Returns rendered text, counted by the shared cache.'''
+    return cache.render_text(font, text, color)
+
+def load_sound(path):
+    '''Returns the sound at the given path from the shared cache.'''
+    return cache.load_sound(path)
+
+def load_font(path, size):
+    '''Returns the font at the given path and size from the shared cache.'''
+    return cache.load_font(path, size)
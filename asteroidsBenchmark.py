@@ -0,0 +1,335 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Frame-time benchmarks for Asteroids. Each scenario drives a World
+headless through a fixed script of key presses and times every frame, split
+into control (input, spawning, UFO AI and shields), collision, update and
+draw. The p50/p95/p99 times are printed in milliseconds. Drawing uses dirty
+rects unless --full is given, in which case the whole screen is redrawn and
+flipped every frame. With --masks, sprites collide by their visible pixels
+rather than their rects. With --vectorized, asteroids and rockets are moved
+by a NumPy EntityStore. With --entities N, moving N asteroids one sprite at a
+time is timed against moving them with an EntityStore. With --particles, the
+scenarios are run with the particle effects on, and with --particles N alone,
+updating and drawing N particles is timed instead. With --collisions, the
+spatial hash collision check is timed against pygame.sprite.groupcollide()
+instead.
+
+Usage: python asteroidsBenchmark.py [scenario ...] [--frames N] [--full] [--masks]
+                                   [--vectorized] [--particles] [--json]
+       python asteroidsBenchmark.py --collisions
+       python asteroidsBenchmark.py --entities N [--frames N]
+       python asteroidsBenchmark.py --particles N [--frames N] [--full]
+'''
+#Imported first so that the dummy SDL drivers are set before pygame starts.
+import asteroidsHeadless
+
+import argparse, functools, json, random, time, pygame, asteroidsCollision, asteroidsSprites, asteroidsWorld
+
+class Scenario(object):
+    '''A scripted benchmark scenario.
+
+    Instance Variables:
+    self.name - name of the scenario, used on the command line
+    self.description - one line description of the scenario
+    self.options - keyword arguments passed on to the World
+    '''
+    def __init__(self, name, description, **options):
+        '''Initializer method for a Scenario.'''
+        self.name = name
+        self.description = description
+        self.options = options
+
+    def prepare(self, world):
+        '''Called before every frame, to set up the world for the scenario.'''
+        pass
+
+    def actions(self, world, frame):
+        '''Returns the action flags to step the world with. By default the
+        ship thrusts and turns left every 20 frames.'''
+        actions = asteroidsWorld.THRUST
+        if frame % 20 == 0:
+            actions |= asteroidsWorld.ROTATE_LEFT
+        return actions
+
+class RocketScenario(Scenario):
+    '''Fires a rocket every frame, turning every 15 frames.'''
+    def actions(self, world, frame):
+        '''Fires every frame.'''
+        actions = asteroidsWorld.FIRE
+        if frame % 15 == 0:
+            actions |= asteroidsWorld.ROTATE_RIGHT
+        return actions
+
+class UFOScenario(Scenario):
+    '''Keeps a UFO lined up with the ship so that it shoots every frame.'''
+    def prepare(self, world):
+        '''Spawns a UFO if there is none and moves it above the ship.'''
+        world.spawn_ufo()
+        world.get_ufo().rect.centerx = world.get_spaceship().rect.centerx
+
+class ShieldScenario(Scenario):
+    '''Keeps the shield up for the whole run.'''
+    def prepare(self, world):
+        '''Tops up the shield so that it never drains.'''
+        world.get_scorekeeper().refill_shield()
+
+    def actions(self, world, frame):
+        '''Raises the shield again whenever it is down.'''
+        actions = Scenario.actions(self, world, frame)
+        if not world.is_shielded():
+            actions |= asteroidsWorld.SHIELD
+        return actions
+
+class SplitScenario(ShieldScenario):
+    '''Fires a rocket every frame with the shield up, in the swarm mode, so
+    that the asteroids keep splitting and multiplying.'''
+    def actions(self, world, frame):
+        '''Fires every frame, turning every 15 frames.'''
+        actions = ShieldScenario.actions(self, world, frame) | asteroidsWorld.FIRE
+        if frame % 15 == 0:
+            actions |= asteroidsWorld.ROTATE_RIGHT
+        return actions
+
+SCENARIOS = [Scenario("default", "the default 5 asteroids"),
+             Scenario("swarm", "500 asteroids", asteroid_count=500),
+             RocketScenario("rockets", "a rocket fired every frame"),
+             UFOScenario("ufo", "a UFO firing every frame", ufo_fire_period=25),
+             ShieldScenario("shield", "the shield up the whole time"),
+             SplitScenario("split", "swarm mode: hits split asteroids, the score spawns more", \
+                           **asteroidsWorld.SWARM)]
+
+PHASES = ["control", "collide", "update", "draw", "frame"]
+
+#Milliseconds a frame may take at 60 frames per second.
+BUDGET = 1000 / 60.0
+
+def percentile(times, fraction):
+    '''Returns the nearest-rank percentile of a sorted list of times.'''
+    index = min(int(fraction * len(times)), len(times) - 1)
+    return times[index]
+
+def run(screen, scenario, frames, dirty_rects=True, masks=False, vectorized=False, \
+        particles=False):
+    '''Runs a scenario for the given number of frames, starting a new game
+    whenever the ship runs out of lives. Returns a dict with the p50, p95 and
+    p99 time of each phase, in milliseconds, the most sprites in the scene at
+    once and the number of frames over BUDGET.'''
+    images = asteroidsWorld.load_images()
+    options = dict(scenario.options, frame_rate=30, seed=0, dirty_rects=dirty_rects, masks=masks, \
+                   vectorized=vectorized, particles=particles)
+    world = asteroidsWorld.World(screen, images, **options)
+    clock = time.perf_counter
+    times = dict((phase, []) for phase in PHASES)
+    sprites = 0
+
+    for frame in range(frames):
+        scenario.prepare(world)
+        actions = scenario.actions(world, frame)
+
+        start = clock()
+        world.control(actions)
+        controlled = clock()
+        world.collide()
+        collided = clock()
+        world.update()
+        updated = clock()
+        pygame.display.update(world.draw(screen))
+        drawn = clock()
+
+        times["control"].append(controlled - start)
+        times["collide"].append(collided - controlled)
+        times["update"].append(updated - collided)
+        times["draw"].append(drawn - updated)
+        times["frame"].append(drawn - start)
+        sprites = max(sprites, len(world.get_scene()))
+
+        if world.is_over():
+            world = asteroidsWorld.World(screen, images, **options)
+
+    result = {"sprites": sprites,
+              "over_budget": sum(1 for seconds in times["frame"] if seconds * 1000 > BUDGET)}
+    for phase in PHASES:
+        phase_times = sorted(times[phase])
+        result[phase] = dict(("p%d" % round(fraction * 100), percentile(phase_times, fraction) * 1000)
+                             for fraction in (0.5, 0.95, 0.99))
+    return result
+
+def collisions(sizes, repeats=5):
+    '''Times asteroidsCollision.groupcollide() against pygame's groupcollide()
+    for each number of entities in sizes, split evenly between asteroid sized
+    and rocket sized sprites scattered over the playfield. Returns a dict of
+    each size to the best (pygame, spatial hash) times in milliseconds.'''
+    rng = random.Random(0)
+    results = {}
+    for size in sizes:
+        groups = [pygame.sprite.Group(), pygame.sprite.Group()]
+        for number in range(size):
+            sprite = pygame.sprite.Sprite()
+            side = rng.choice((39, 49, 64)) if number % 2 else 10
+            sprite.rect = pygame.Rect(rng.randint(-side // 2, 640 - side // 2), \
+                                      rng.randint(-side // 2, 480 - side // 2), side, side)
+            groups[number % 2].add(sprite)
+
+        times = []
+        spatial = functools.partial(asteroidsCollision.groupcollide, size=(640, 480))
+        for function in (pygame.sprite.groupcollide, spatial):
+            best = None
+            for repeat in range(repeats):
+                start = time.perf_counter()
+                crashed = function(groups[1], groups[0], False, False)
+                elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            times.append(best * 1000)
+            #Both must find exactly the same collisions.
+            if function is pygame.sprite.groupcollide:
+                expected = crashed
+            elif crashed != expected:
+                raise AssertionError("spatial hash disagrees with groupcollide at %d" % size)
+        results[size] = times
+    return results
+
+def entities(screen, count, frames):
+    '''Times moving count asteroids for the given number of frames, first by
+    calling update() on every sprite, then with an EntityStore stepping them
+    all at once and syncing their rects. Returns the average milliseconds per
+    frame for (sprites, store step, store step and sync).'''
+    import asteroidsEntities
+    images = asteroidsWorld.load_images()["asteroid"]
+    store = asteroidsEntities.EntityStore(screen.get_width(), screen.get_height(), count)
+    sprites = pygame.sprite.Group([asteroidsSprites.Asteroid(screen, images) for number in range(count)])
+    stored = [asteroidsSprites.Asteroid(screen, images, store) for number in range(count)]
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        sprites.update()
+    updated = time.perf_counter()
+    for frame in range(frames):
+        store.step()
+    stepped = time.perf_counter()
+    for frame in range(frames):
+        store.step()
+        store.sync()
+    synced = time.perf_counter()
+    return ((updated - start) * 1000 / frames, (stepped - updated) * 1000 / frames, \
+            (synced - stepped) * 1000 / frames)
+
+def particles(screen, count, frames, dirty_rects=True):
+    '''Keeps count particles alive over the background for the given number
+    of frames, emitting new debris as fast as the old dies. Returns a dict
+    with the p50, p95 and p99 time, in milliseconds, of updating the
+    particles, of drawing them (clearing behind them and updating the
+    display too) and of the whole frame.'''
+    import asteroidsParticles
+    width, height = screen.get_size()
+    system = asteroidsParticles.ParticleSystem(width, height, max(count, 1), drag=1.0, seed=0)
+    background = asteroidsSprites.Space(screen.get_size()).image
+    screen.blit(background, (0, 0))
+    rng = random.Random(0)
+    clock = time.perf_counter
+    times = dict((phase, []) for phase in ("update", "draw", "frame"))
+
+    for frame in range(frames):
+        start = clock()
+        system.update()
+        missing = count - len(system)
+        if missing:
+            bursts = max(missing // 200, 1)
+            system.emit([rng.randint(0, width - 1) for burst in range(bursts)], \
+                        [rng.randint(0, height - 1) for burst in range(bursts)], \
+                        asteroidsParticles.DEBRIS, -(-missing // bursts), 2, 60)
+        updated = clock()
+        if dirty_rects:
+            system.clear(screen, background)
+            pygame.display.update(system.draw(screen))
+        else:
+            screen.blit(background, (0, 0))
+            system.draw(screen)
+            pygame.display.flip()
+        drawn = clock()
+
+        times["update"].append(updated - start)
+        times["draw"].append(drawn - updated)
+        times["frame"].append(drawn - start)
+
+    result = {}
+    for phase, phase_times in times.items():
+        phase_times = sorted(phase_times)
+        result[phase] = dict(("p%d" % round(fraction * 100), percentile(phase_times, fraction) * 1000)
+                             for fraction in (0.5, 0.95, 0.99))
+    return result
+
+def report(name, result):
+    '''Returns the result of one scenario as a table of lines.'''
+    lines = ["%s" % name]
+    for phase in PHASES:
+        lines.append("  %-8s p50 %7.3f ms   p95 %7.3f ms   p99 %7.3f ms" % \
+                     (phase, result[phase]["p50"], result[phase]["p95"], result[phase]["p99"]))
+    lines.append("  at most %d sprites, %d frames over %.1f ms" % \
+                 (result["sprites"], result["over_budget"], BUDGET))
+    return "\n".join(lines)
+
+def main():
+    '''Parses the command line, runs the chosen scenarios and prints the results.'''
+    names = [scenario.name for scenario in SCENARIOS]
+    parser = argparse.ArgumentParser(description="Benchmark Asteroids frame times.")
+    parser.add_argument("scenarios", nargs="*", default=names,
+                        help="scenarios to run: %s (default: all of them)" % ", ".join(names))
+    parser.add_argument("--frames", type=int, default=1000, help="frames per scenario")
+    parser.add_argument("--full", action="store_true", help="redraw the whole screen every frame")
+    parser.add_argument("--masks", action="store_true", help="collide by pixels instead of rects")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="move asteroids and rockets with a NumPy EntityStore")
+    parser.add_argument("--particles", type=int, nargs="?", const=0, metavar="N",
+                        help="draw particle effects, or alone with N, time N particles")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--collisions", action="store_true",
+                        help="benchmark the spatial hash against groupcollide instead")
+    parser.add_argument("--entities", type=int, metavar="N",
+                        help="time moving N asteroids as sprites and with an EntityStore")
+    args = parser.parse_args()
+    if args.entities:
+        screen = asteroidsHeadless.init()
+        result = entities(screen, args.entities, args.frames)
+        print("%d asteroids: update() %.3f ms   store step %.3f ms   step and sync %.3f ms" % \
+              ((args.entities,) + result))
+        pygame.quit()
+        return
+    if args.particles:
+        screen = asteroidsHeadless.init()
+        result = particles(screen, args.particles, args.frames, not args.full)
+        print("%d particles" % args.particles)
+        for phase in ("update", "draw", "frame"):
+            print("  %-8s p50 %7.3f ms   p95 %7.3f ms   p99 %7.3f ms" % \
+                  (phase, result[phase]["p50"], result[phase]["p95"], result[phase]["p99"]))
+        pygame.quit()
+        return
+    if args.collisions:
+        asteroidsHeadless.init()
+        for size, (brute, grid) in sorted(collisions([10, 100, 1000, 5000]).items()):
+            print("%5d entities: groupcollide %9.3f ms   spatial hash %9.3f ms" % \
+                  (size, brute, grid))
+        pygame.quit()
+        return
+
+    for name in args.scenarios:
+        if name not in names:
+            parser.error("unknown scenario: %s" % name)
+
+    screen = asteroidsHeadless.init()
+    results = {}
+    for scenario in SCENARIOS:
+        if scenario.name in args.scenarios:
+            results[scenario.name] = run(screen, scenario, args.frames, not args.full, \
+                                         args.masks, args.vectorized, args.particles is not None)
+            if not args.json:
+                print(report("%s - %s" % (scenario.name, scenario.description), \
+                             results[scenario.name]))
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the FixedTimestep class, which decouples the
+rate at which the game logic runs from the rate at which frames are drawn.
+The game logic always steps at the same rate, however long the frames take
+to draw, while frames are drawn as fast as the display allows, up to a cap.
+'''
+import time, pygame
+
+class FixedTimestep(object):
+    '''An accumulator of real time that is spent in fixed steps of game
+    logic. Each drawn frame, tick() returns how many steps are due. The time
+    left over, less than one step, is given by get_alpha() as a fraction of a
+    step, so that drawing can blend between the last two steps.
+
+    Instance Variables:
+    self.__step - seconds of game time per step
+    self.__max_steps - most steps run in one drawn frame; the time for any
+                       more is dropped, so the game slows down on a slow
+                       machine instead of falling further and further behind
+    self.__max_fps - most frames drawn per second, or 0 for no limit
+    self.__timer - function returning the current time in seconds
+    self.__clock - pygame Clock used to wait between drawn frames
+    self.__last - time of the last call to tick(), or None before the first
+    self.__accumulator - seconds of game time waiting to be stepped
+    self.__steps - total number of steps handed out
+    self.__dropped - total number of steps dropped by the limit
+    '''
+    def __init__(self, rate=30, max_steps=5, max_fps=144, timer=time.perf_counter):
+        '''Initializer method for the FixedTimestep. rate is the number of
+        steps of game logic per second.'''
+        self.__step = 1.0 / rate
+        self.__max_steps = max_steps
+        self.__max_fps = max_fps
+        self.__timer = timer
+        self.__clock = pygame.time.Clock()
+        self.__last = None
+        self.__accumulator = 0.0
+        self.__steps = 0
+        self.__dropped = 0
+
+    def tick(self):
+        '''Waits so that no more than max_fps frames are drawn per second,
+        adds the real time since the last call to the accumulator and
+        returns the number of steps of game logic due this frame. The very
+        first call always returns one step.'''
+        if self.__max_fps:
+            self.__clock.tick(self.__max_fps)
+        now = self.__timer()
+        if self.__last is None:
+            self.__accumulator = self.__step
+        else:
+            self.__accumulator += now - self.__last
+        self.__last = now
+
+        steps = int(self.__accumulator / self.__step)
+        if steps > self.__max_steps:
+            self.__dropped += steps - self.__max_steps
+            steps = self.__max_steps
+            self.__accumulator = steps * self.__step + self.__accumulator % self.__step
+        self.__accumulator -= steps * self.__step
+        self.__steps += steps
+        return steps
+
+    def get_alpha(self):
+        '''Gets/Returns how far the game is past the last step, from 0 up to
+        (but not including) 1 step.'''
+        return min(self.__accumulator / self.__step, 1.0)
+
+    def reset(self):
+        '''Forgets the time that has passed, for example after a pause, so
+        that the next tick() does not try to catch up on it.'''
+        self.__last = None
+        self.__accumulator = 0.0
+        self.__clock.tick()
+
+    def get_stats(self):
+        '''Returns a dict of the number of steps run, the number dropped by
+        the frame-skip limit and the current rate of drawn frames.'''
+        return {"steps": self.__steps,
+                "dropped": self.__dropped,
+                "fps": self.__clock.get_fps()}
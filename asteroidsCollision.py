@@ -0,0 +1,143 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Collision checks for Asteroids that give the same results as
+pygame.sprite.groupcollide() and spritecollide(), but only test sprites that
+are near each other. A SpatialHash sorts sprites into a uniform grid of cells
+over the playfield, so each sprite is only tested against the sprites in the
+cells it covers instead of against every sprite in the other group.
+collide_mask() can be passed to either of them to only count pixels that
+actually touch.
+'''
+import pygame, asteroidsAssets
+
+#Below this many pairs of sprites, testing every pair is faster than hashing.
+BRUTE_FORCE_PAIRS = 4096
+
+def collide_mask(spritea, spriteb):
+    '''Returns True if the visible pixels of two sprites overlap. The rects
+    are checked first, and the masks come from the asset cache, so no mask is
+    ever made more than once for the same image. A sprite with a mask
+    attribute of its own uses that instead.'''
+    recta = spritea.rect
+    rectb = spriteb.rect
+    if not recta.colliderect(rectb):
+        return False
+    maska = getattr(spritea, "mask", None) or asteroidsAssets.get_mask(spritea.image)
+    maskb = getattr(spriteb, "mask", None) or asteroidsAssets.get_mask(spriteb.image)
+    return maska.overlap(maskb, (rectb.x - recta.x, rectb.y - recta.y)) is not None
+
+class SpatialHash(object):
+    '''A uniform grid of cells over the playfield. The grid wraps around like
+    the playfield does, so sprites that stick out past an edge (the sprites
+    only wrap once their center leaves the screen) land in the cells on the
+    other side instead of in cells of their own.
+
+    Instance Variables:
+    self.__cell_size - width and height of a cell in pixels
+    self.__columns - number of cells across the playfield
+    self.__rows - number of cells down the playfield
+    self.__sprites - list of the sprites in the grid
+    self.__cells - dict of cell number to a list of rects and a list of the
+                   numbers of their sprites
+    '''
+    def __init__(self, width, height, cell_size=64):
+        '''Initializer method for the SpatialHash.'''
+        self.__cell_size = cell_size
+        self.__columns = max(-(-width // cell_size), 1)
+        self.__rows = max(-(-height // cell_size), 1)
+        self.__sprites = []
+        self.__cells = {}
+
+    def __cells_of(self, rect):
+        '''Returns the numbers of the cells the rect covers.'''
+        size = self.__cell_size
+        columns = self.__columns
+        rows = self.__rows
+        left = rect.left // size
+        right = min((rect.right - 1) // size, left + columns - 1)
+        top = rect.top // size
+        bottom = min((rect.bottom - 1) // size, top + rows - 1)
+        cells = []
+        for row in range(top, bottom + 1):
+            offset = (row % rows) * columns
+            for column in range(left, right + 1):
+                cells.append(offset + column % columns)
+        return cells
+
+    def build(self, sprites):
+        '''Empties the grid, then adds the sprites to it, numbered in order.'''
+        self.__sprites = list(sprites)
+        self.__cells = cells = {}
+        for index, sprite in enumerate(self.__sprites):
+            rect = sprite.rect
+            for cell in self.__cells_of(rect):
+                if cell in cells:
+                    cells[cell][0].append(rect)
+                    cells[cell][1].append(index)
+                else:
+                    cells[cell] = ([rect], [index])
+
+    def query(self, rect):
+        '''Returns the sprites whose rects overlap the rect, in the order they
+        were added. Each cell is tested in one call to Rect.collidelistall().'''
+        cells = self.__cells
+        found = set()
+        for cell in self.__cells_of(rect):
+            if cell in cells:
+                rects, indices = cells[cell]
+                for hit in rect.collidelistall(rects):
+                    found.add(indices[hit])
+        sprites = self.__sprites
+        return [sprites[index] for index in sorted(found)]
+
+def groupcollide(groupa, groupb, dokilla, dokillb, collided=None, cell_size=64, size=None):
+    '''Works like pygame.sprite.groupcollide(): returns a dict of each sprite
+    in groupa to the list of sprites in groupb it collides with, killing them
+    if asked to. A collided function is only called for sprites whose rects
+    overlap, so it must never report a hit for sprites whose rects don't.
+    size is the (width, height) of the playfield the grid covers, by default
+    the size of the display.'''
+    if len(groupa) * len(groupb) <= BRUTE_FORCE_PAIRS:
+        return pygame.sprite.groupcollide(groupa, groupb, dokilla, dokillb, collided)
+
+    #The grid covers the playfield. Callers that don't say how big it is
+    #get the size of the display.
+    if size is None:
+        screen = pygame.display.get_surface()
+        size = screen.get_size() if screen else (640, 480)
+    width, height = size
+    grid = SpatialHash(width, height, cell_size)
+    grid.build(groupb)
+
+    crashed = {}
+    for spritea in groupa.sprites():
+        collision = []
+        for spriteb in grid.query(spritea.rect):
+            #Sprites killed by an earlier check are no longer in groupb.
+            if spriteb in groupb and (not collided or collided(spritea, spriteb)):
+                collision.append(spriteb)
+        if collision:
+            if dokillb:
+                for spriteb in collision:
+                    spriteb.kill()
+            crashed[spritea] = collision
+            if dokilla:
+                spritea.kill()
+    return crashed
+
+def spritecollide(sprite, group, dokill, collided=None):
+    '''Works like pygame.sprite.spritecollide(): returns the list of sprites in
+    the group that collide with the sprite, killing them if asked to. One
+    sprite against a group gains nothing from a grid, so the rects are checked
+    in a single call to Rect.collidelistall(), and a collided function is only
+    called for the sprites whose rects overlap.'''
+    sprites = group.sprites()
+    collision = [sprites[index] for index in \
+                 sprite.rect.collidelistall([other.rect for other in sprites])]
+    if collided:
+        collision = [other for other in collision if collided(sprite, other)]
+    if dokill:
+        for other in collision:
+            other.kill()
+    return collision
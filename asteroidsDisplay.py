@@ -0,0 +1,134 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the Display class, which separates the
+logical resolution the game is drawn at from the size of the window (or full
+screen) it is shown in. When the two differ, the game is drawn onto an
+off-screen surface of the logical size, and only the parts that changed are
+scaled up onto the window. By default they are scaled by a whole number, so
+every logical pixel becomes an exact square of window pixels and the rects
+that changed map exactly onto the window; the rest of the window is left
+black.
+'''
+import pygame
+
+#The resolution the game was made for.
+BASE_SIZE = (640, 480)
+
+class Display(object):
+    '''The window, and the surface the game is drawn on.
+
+    Instance Variables:
+    self.__logical - (width, height) the game is drawn at
+    self.__window - (width, height) of the window, or None for the logical
+                    size (or the desktop size when full screen)
+    self.__integer_scale - bool, if True only scale by whole numbers
+    self.__fullscreen - bool, True to fill the screen
+    self.__display - the display surface, once open
+    self.__surface - the surface the game is drawn on; the display itself
+                     when no scaling is needed
+    self.__scale - how many window pixels each logical pixel covers
+    self.__target - Rect of the window the game is shown in
+    '''
+    def __init__(self, logical=BASE_SIZE, window=None, integer_scale=True, fullscreen=False):
+        '''Initializer method for the Display.'''
+        self.__logical = tuple(logical)
+        self.__window = window and tuple(window)
+        self.__integer_scale = integer_scale
+        self.__fullscreen = fullscreen
+        self.__display = None
+        self.__surface = None
+        self.__scale = 1
+        self.__target = pygame.Rect((0, 0), self.__logical)
+
+    def open(self, caption=None):
+        '''Opens the window (the display module must be initialized) and
+        returns the surface to draw the game on.'''
+        flags = 0
+        window = self.__window or self.__logical
+        if self.__fullscreen:
+            flags = pygame.FULLSCREEN
+            window = self.__window or (0, 0)
+        self.__display = pygame.display.set_mode(window, flags)
+        if caption:
+            pygame.display.set_caption(caption)
+
+        width, height = self.__logical
+        window_width, window_height = self.__display.get_size()
+        if (window_width, window_height) == self.__logical:
+            self.__surface = self.__display
+            self.__scale = 1
+            self.__target = self.__display.get_rect()
+            return self.__surface
+
+        scale = min(window_width / float(width), window_height / float(height))
+        if self.__integer_scale and scale >= 1:
+            scale = int(scale)
+        self.__scale = scale
+        self.__target = pygame.Rect(0, 0, int(width * scale), int(height * scale))
+        self.__target.center = self.__display.get_rect().center
+        self.__surface = pygame.Surface(self.__logical).convert()
+        self.__display.fill((0, 0, 0))
+        return self.__surface
+
+    def get_surface(self):
+        '''Gets/Returns the surface to draw the game on.'''
+        return self.__surface
+
+    def get_scale(self):
+        '''Gets/Returns how many window pixels each logical pixel covers.'''
+        return self.__scale
+
+    def is_scaled(self):
+        '''Returns True if the game is drawn off-screen and scaled to the window.'''
+        return self.__surface is not self.__display
+
+    def present(self, rects=None):
+        '''Shows what has been drawn. If rects is given, only those parts of
+        the game surface changed; otherwise all of it did.'''
+        if not self.is_scaled():
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+
+        scale = self.__scale
+        if rects is None or not isinstance(scale, int):
+            #A fractional scale blurs pixels into their neighbours, so the
+            #whole frame is scaled at once.
+            target = self.__display.subsurface(self.__target)
+            if isinstance(scale, int) or self.__surface.get_bitsize() < 24:
+                pygame.transform.scale(self.__surface, self.__target.size, target)
+            else:
+                pygame.transform.smoothscale(self.__surface, self.__target.size, target)
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(self.__target)
+            return
+
+        bounds = self.__surface.get_rect()
+        left, top = self.__target.topleft
+        updated = []
+        for rect in rects:
+            rect = bounds.clip(rect)
+            if rect.width and rect.height:
+                area = pygame.Rect(left + rect.x * scale, top + rect.y * scale, \
+                                   rect.width * scale, rect.height * scale)
+                pygame.transform.scale(self.__surface.subsurface(rect), area.size, \
+                                       self.__display.subsurface(area))
+                updated.append(area)
+        pygame.display.update(updated)
+
+    def to_logical(self, position):
+        '''Returns a position in the window, like the mouse's, in logical
+        pixels.'''
+        x, y = position
+        return (int((x - self.__target.x) / self.__scale), int((y - self.__target.y) / self.__scale))
+
+    def from_base(self, x, y):
+        '''Returns a position given for the base resolution (640x480) moved
+        to the same place at the logical resolution.'''
+        width, height = self.__logical
+        return (x * width // BASE_SIZE[0], y * height // BASE_SIZE[1])
@@ -0,0 +1,106 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the ExplosionPool class, which plays the
+explosion animation (the frames in Explosion/) wherever something is
+destroyed. Explosions are not sprites: a fixed number of them are kept as
+plain positions and ages, all of them are advanced together once a frame and
+all of them are drawn in a single call to Surface.blits(), so a chain reaction
+of dozens of explosions allocates nothing.
+'''
+import collections, pygame
+
+class ExplosionPool(object):
+    '''A fixed-size pool of explosion animations. Every explosion lasts the
+    same number of frames, so the oldest one is always the first to finish,
+    and when the pool is full a new explosion replaces the oldest.
+
+    Instance Variables:
+    self.__frames - list of the images of the animation, in order
+    self.__hold - number of steps each image is shown for
+    self.__duration - number of steps an explosion lasts
+    self.__x, self.__y - lists of the top left corner of each slot's explosion
+    self.__age - list of the number of steps each slot's explosion has run
+    self.__active - deque of the slots in use, oldest first
+    self.__free - list of the slots not in use
+    self.__drawn - list of the rects drawn by the last call to draw()
+    self.__stats - dict of the number of explosions spawned and the number
+                   that replaced an older one because the pool was full
+    '''
+    def __init__(self, frames, capacity=64, hold=2):
+        '''Initializer method for the ExplosionPool. frames is the list of
+        images of the animation, which must all be the same size.'''
+        self.__frames = frames
+        self.__hold = hold
+        self.__duration = len(frames) * hold
+        self.__x = [0] * capacity
+        self.__y = [0] * capacity
+        self.__age = [0] * capacity
+        self.__active = collections.deque()
+        self.__free = list(range(capacity - 1, -1, -1))
+        self.__drawn = []
+        self.__stats = {"spawned": 0, "replaced": 0}
+
+    def __len__(self):
+        '''Returns the number of explosions playing.'''
+        return len(self.__active)
+
+    def spawn(self, centerx, centery):
+        '''Starts an explosion centered at (centerx, centery).'''
+        if self.__free:
+            slot = self.__free.pop()
+        else:
+            slot = self.__active.popleft()
+            self.__stats["replaced"] += 1
+        width, height = self.__frames[0].get_size()
+        self.__x[slot] = centerx - width // 2
+        self.__y[slot] = centery - height // 2
+        self.__age[slot] = 0
+        self.__active.append(slot)
+        self.__stats["spawned"] += 1
+
+    def update(self):
+        '''Advances every explosion by one step, and frees the ones that have
+        finished.'''
+        age = self.__age
+        active = self.__active
+        for slot in active:
+            age[slot] += 1
+        while active and age[active[0]] >= self.__duration:
+            self.__free.append(active.popleft())
+
+    def reset(self):
+        '''Stops every explosion.'''
+        self.__free.extend(self.__active)
+        self.__active.clear()
+
+    def get_rects(self):
+        '''Returns the rects drawn last time and the rects the explosions
+        playing now will be drawn at.'''
+        width, height = self.__frames[0].get_size()
+        return self.__drawn + [pygame.Rect(self.__x[slot], self.__y[slot], width, height) \
+                               for slot in self.__active]
+
+    def clear(self, screen, background):
+        '''Draws the background over the explosions drawn last time.'''
+        for rect in self.__drawn:
+            screen.blit(background, rect, rect)
+
+    def draw(self, screen):
+        '''Draws every explosion in one batch and returns the rects that
+        changed since the last draw.'''
+        frames = self.__frames
+        hold = self.__hold
+        x = self.__x
+        y = self.__y
+        age = self.__age
+        drawn = screen.blits([(frames[age[slot] // hold], (x[slot], y[slot])) \
+                              for slot in self.__active])
+        changed = self.__drawn + drawn
+        self.__drawn = drawn
+        return changed
+
+    def get_stats(self):
+        '''Returns a dict of the number of explosions spawned, the number that
+        replaced an older one, and the number playing.'''
+        return dict(self.__stats, live=len(self.__active))
@@ -0,0 +1,159 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the EntityStore class, which keeps the
+positions, velocities, sizes and lifetimes of many moving entities (asteroids
+and rockets) in NumPy arrays. All of them are moved and wrapped around the
+screen in one vectorized step per frame, instead of one update() call per
+sprite. Requires NumPy.
+'''
+import numpy
+
+class EntityStore(object):
+    '''Struct-of-arrays storage for moving entities. Each entity has a slot,
+    an index into every array, which is reused once the entity is removed.
+    A sprite can be attached to each slot, so that its rect follows the
+    entity when sync() is called.
+
+    Instance Variables:
+    self.__width - width of the playfield, used for wrapping around
+    self.__height - height of the playfield, used for wrapping around
+    self.x, self.y - arrays of the center of each entity
+    self.dx, self.dy - arrays of the velocity of each entity, per frame
+    self.size - array of the size of each entity
+    self.kind - array of the kind of each entity, one of the kinds below
+    self.age - array of the number of frames each entity has been alive
+    self.lifetime - array of the age at which each entity expires, -1 = never
+    self.wrap_first - array of bools, True for entities that wrap around
+                      before they move rather than after (like Rocket)
+    self.alive - array of bools, True for slots in use
+    self.__sprites - list of the sprite attached to each slot
+    self.__free - list of unused slots
+    self.__expired - array of the slots that expired in the last step
+    '''
+
+    #Kinds of entity, so that the arrays can be read without the sprites.
+    NONE = 0
+    SHIP = 1
+    ASTEROID = 2
+    UFO = 3
+    ROCKET = 4
+    ENEMY_ROCKET = 5
+
+    def __init__(self, width, height, capacity=1024):
+        '''Initializer method for the EntityStore.'''
+        self.__width = width
+        self.__height = height
+        self.x = numpy.zeros(capacity, numpy.int32)
+        self.y = numpy.zeros(capacity, numpy.int32)
+        self.dx = numpy.zeros(capacity, numpy.int32)
+        self.dy = numpy.zeros(capacity, numpy.int32)
+        self.size = numpy.zeros(capacity, numpy.int8)
+        self.kind = numpy.zeros(capacity, numpy.int8)
+        self.age = numpy.zeros(capacity, numpy.int32)
+        self.lifetime = numpy.zeros(capacity, numpy.int32)
+        self.wrap_first = numpy.zeros(capacity, bool)
+        self.alive = numpy.zeros(capacity, bool)
+        self.__sprites = [None] * capacity
+        self.__free = list(range(capacity - 1, -1, -1))
+        self.__expired = numpy.zeros(0, numpy.intp)
+
+    def __grow(self):
+        '''Doubles the number of slots.'''
+        capacity = len(self.alive)
+        for name in ("x", "y", "dx", "dy", "size", "kind", "age", "lifetime", "wrap_first", "alive"):
+            array = getattr(self, name)
+            setattr(self, name, numpy.concatenate((array, numpy.zeros_like(array))))
+        self.__sprites.extend([None] * capacity)
+        self.__free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def __len__(self):
+        '''Returns the number of entities in the store.'''
+        return len(self.alive) - len(self.__free)
+
+    def add(self, sprite, x, y, dx, dy, size=1, lifetime=-1, wrap_first=False, kind=NONE):
+        '''Adds an entity of a kind centered at (x, y) and returns its slot.
+        The sprite, which may be None, is attached to the slot.'''
+        if not self.__free:
+            self.__grow()
+        slot = self.__free.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.size[slot] = size
+        self.kind[slot] = kind
+        self.age[slot] = 0
+        self.lifetime[slot] = lifetime
+        self.wrap_first[slot] = wrap_first
+        self.alive[slot] = True
+        self.__sprites[slot] = sprite
+        return slot
+
+    def remove(self, slot):
+        '''Removes the entity in a slot, freeing the slot for reuse. A free
+        slot is left with no velocity, so step() can move every slot at once.'''
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.kind[slot] = self.NONE
+            self.dx[slot] = 0
+            self.dy[slot] = 0
+            self.wrap_first[slot] = False
+            self.__sprites[slot] = None
+            self.__free.append(slot)
+
+    def set_position(self, slot, x, y):
+        '''Moves the entity in a slot so that it is centered at (x, y).'''
+        self.x[slot] = x
+        self.y[slot] = y
+
+    def set_velocity(self, slot, dx, dy):
+        '''Sets the velocity of the entity in a slot.'''
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+
+    def set_size(self, slot, size):
+        '''Sets the size of the entity in a slot.'''
+        self.size[slot] = size
+
+    def __wrap(self, mask):
+        '''Wraps the entities selected by mask around the screen the same way
+        the sprites' update() methods do: past the left edge comes back at
+        the right edge, then past the right edge comes back at the left.'''
+        x = self.x
+        y = self.y
+        x[mask & (x < 0)] = self.__width
+        x[mask & (x > self.__width)] = 0
+        y[mask & (y < 0)] = self.__height
+        y[mask & (y > self.__height)] = 0
+
+    def step(self):
+        '''Moves every entity by its velocity and wraps it around the screen,
+        all in one go. Entities older than their lifetime are marked as
+        expired, to be removed by sync(). Returns the slots that expired.'''
+        self.__expired = numpy.flatnonzero(self.alive & (self.lifetime >= 0) & \
+                                           (self.age > self.lifetime))
+        self.age += 1
+
+        self.__wrap(self.wrap_first)
+        self.x += self.dx
+        self.y += self.dy
+        self.__wrap(~self.wrap_first)
+        return self.__expired
+
+    def sync(self):
+        '''Moves the rect of every attached sprite to its entity's position,
+        then kills the sprites of the entities that expired in the last step.'''
+        sprites = self.__sprites
+        slots = numpy.flatnonzero(self.alive)
+        for slot, x, y in zip(slots.tolist(), self.x[slots].tolist(), self.y[slots].tolist()):
+            sprite = sprites[slot]
+            if sprite is not None:
+                sprite.rect.center = (x, y)
+
+        for slot in self.__expired.tolist():
+            sprite = sprites[slot]
+            if sprite is not None:
+                sprite.kill()
+            self.remove(slot)
+        self.__expired = self.__expired[:0]
@@ -0,0 +1,396 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: A Gym-style environment for training and evaluating bots against
+Asteroids. AsteroidsEnv wraps one seeded, headless World: reset(seed) starts
+a game and step(action) runs one step of it, returning the observation, the
+reward, whether the game is over and a dict of extra info. Actions are the
+World's action flags (ROTATE_LEFT, ROTATE_RIGHT, THRUST, FIRE and SHIELD)
+combined with |, so every action is a number from 0 to 31. VectorEnv steps
+many independent games across a pool of worker processes; the actions go to
+the workers, and the observations, rewards and done flags come back, through
+shared memory, so a step only sends a few bytes through a pipe. Each env
+draws into an asteroidsObservation.FrameBuffer, so bots that want pixels can
+read the frame without copying it. Requires NumPy.
+
+Usage: python asteroidsEnv.py [--envs N] [--workers N] [--steps N] [--swarm]
+'''
+#Imported first so that the dummy SDL drivers are set before pygame starts.
+import asteroidsHeadless
+
+import argparse, math, multiprocessing, time, numpy, pygame, asteroidsObservation, \
+       asteroidsSprites, asteroidsWorld
+from multiprocessing import shared_memory
+
+#Number of different actions; every combination of the five action flags.
+ACTION_COUNT = 32
+
+#The observation is a vector of floats: the fields of the ship, followed by
+#the fields of each of the NEAREST dangers closest to it, nearest first.
+#Missing dangers are all zeros.
+#Ship: x, y (as fractions of the screen), cos and sin of its angle, shield
+#strength (100 = 1), 1 if the shield is up, lives, 1 if there is a UFO.
+SHIP_FIELDS = 8
+#Danger: x, y relative to the ship (as fractions of the screen), kind, size.
+DANGER_FIELDS = 4
+NEAREST = 8
+OBSERVATION_SIZE = SHIP_FIELDS + NEAREST * DANGER_FIELDS
+
+#Kinds of danger in the observation.
+ASTEROID = 1
+UFO = 2
+ROCKET = 3
+
+#Reward for each life gained; losing one costs as much.
+LIFE_REWARD = 100
+
+class AsteroidsEnv(object):
+    '''One game of Asteroids as an environment. The reward of a step is the
+    points scored during it, plus LIFE_REWARD for each life gained and minus
+    it for each life lost.
+
+    Instance Variables:
+    self.__screen - surface the world is drawn on
+    self.__frames - FrameBuffer whose surface is the screen, or None if the
+                    screen was given
+    self.__entities - EntityObserver of the game, made when first needed
+    self.__images - images shared by every World, see load_images()
+    self.__options - dict of keyword arguments for each World
+    self.__max_steps - steps after which a game is cut short, or None
+    self.__frame_skip - number of world steps each step() repeats its action for
+    self.__world - the World of the current game, or None before reset()
+    self.__seed - seed of the current game
+    self.__steps - steps taken in the current game
+    self.__score - score at the end of the last step
+    self.__lives - lives at the end of the last step
+    self.__drawn - step at which the frame was last drawn, or None
+    self.__refreshed - step at which the entities were last refreshed, or None
+    '''
+    def __init__(self, max_steps=None, frame_skip=1, screen=None, **options):
+        '''Initializer method for the AsteroidsEnv. pygame is started with the
+        dummy drivers if it has not been, and the game is drawn into a
+        FrameBuffer unless a screen is given. Extra keyword arguments, such as
+        asteroid_count, vectorized or those in asteroidsWorld.SWARM, are
+        passed on to every World.'''
+        self.__frames = None
+        if screen is None:
+            size = (pygame.display.get_surface() or asteroidsHeadless.init()).get_size()
+            self.__frames = asteroidsObservation.FrameBuffer(size)
+            screen = self.__frames.get_surface()
+        self.__screen = screen
+        self.__entities = None
+        self.__images = asteroidsWorld.load_images()
+        self.__options = options
+        self.__max_steps = max_steps
+        self.__frame_skip = frame_skip
+        self.__world = None
+        self.__seed = -1
+        self.__steps = 0
+        self.__score = 0
+        self.__lives = 0
+        self.__drawn = None
+        self.__refreshed = None
+
+    def reset(self, seed=None):
+        '''Starts a new game and returns its first observation. The game is
+        played from the given seed, or from the seed of the last game plus 1
+        (0 for the first game), so the same seeds and actions always play the
+        same games.'''
+        if seed is None:
+            seed = self.__seed + 1
+        self.__seed = seed
+        self.__world = asteroidsWorld.World(self.__screen, self.__images, seed=seed, \
+                                            **self.__options)
+        self.__steps = 0
+        self.__score = 0
+        self.__lives = self.__world.get_scorekeeper().get_lives()
+        self.__drawn = None
+        self.__refreshed = None
+        if self.__entities is not None:
+            self.__entities.reset()
+        return self.observe()
+
+    def step(self, action):
+        '''Runs one step of the game with the given action and returns
+        (observation, reward, done, info). info is a dict of the score, the
+        lives, the steps taken and the sounds the step triggered.'''
+        if not 0 <= action < ACTION_COUNT:
+            raise ValueError("action must be from 0 to %d, got %r" % (ACTION_COUNT - 1, action))
+        world = self.__world
+        sounds = []
+        for repeat in range(self.__frame_skip):
+            sounds.extend(world.step(action))
+            if world.is_over():
+                break
+        self.__steps += 1
+
+        scorekeeper = world.get_scorekeeper()
+        score = scorekeeper.get_score()
+        lives = scorekeeper.get_lives()
+        reward = score - self.__score + LIFE_REWARD * (lives - self.__lives)
+        self.__score = score
+        self.__lives = lives
+        done = world.is_over() or \
+               (self.__max_steps is not None and self.__steps >= self.__max_steps)
+        info = {"score": score, "lives": lives, "steps": self.__steps, "sounds": sounds}
+        return self.observe(), reward, done, info
+
+    def observe(self, out=None):
+        '''Returns the observation of the game as it is now, written into out
+        (a float32 array of OBSERVATION_SIZE) if it is given.'''
+        if out is None:
+            out = numpy.zeros(OBSERVATION_SIZE, numpy.float32)
+        world = self.__world
+        scorekeeper = world.get_scorekeeper()
+        spaceship = world.get_spaceship()
+        width, height = self.__screen.get_size()
+        x, y = spaceship.rect.center
+        angle = math.radians(spaceship.get_angle())
+        out[:SHIP_FIELDS] = (x / width, y / height, math.cos(angle), math.sin(angle), \
+                             scorekeeper.get_shield() / 100.0, world.is_shielded(), \
+                             scorekeeper.get_lives(), world.get_ufo() is not None)
+        out[SHIP_FIELDS:] = 0
+
+        dangers = world.get_scene().group("danger").sprites()
+        if dangers:
+            offsets = numpy.array([danger.rect.center for danger in dangers], numpy.float32)
+            offsets -= (x, y)
+            distances = (offsets * offsets).sum(1)
+            if len(dangers) > NEAREST:
+                nearest = numpy.argpartition(distances, NEAREST)[:NEAREST]
+                nearest = nearest[numpy.argsort(distances[nearest])]
+            else:
+                nearest = numpy.argsort(distances)
+            field = SHIP_FIELDS
+            for index in nearest.tolist():
+                danger = dangers[index]
+                if isinstance(danger, asteroidsSprites.Asteroid):
+                    kind, size = ASTEROID, danger.get_size()
+                elif isinstance(danger, asteroidsSprites.UFO):
+                    kind, size = UFO, 0
+                else:
+                    kind, size = ROCKET, 0
+                out[field:field + DANGER_FIELDS] = (offsets[index, 0] / width, \
+                                                    offsets[index, 1] / height, kind, size)
+                field += DANGER_FIELDS
+        return out
+
+    def render(self):
+        '''Draws the game onto its surface, unless it has already been drawn
+        since the last step, and returns the surface.'''
+        if self.__drawn != self.__steps:
+            self.__world.draw(self.__screen)
+            if self.__frames is not None:
+                self.__frames.next_frame()
+            self.__drawn = self.__steps
+        return self.__screen
+
+    def get_frame(self, gray=False, scale=1):
+        '''Draws the game if it has changed and returns the frame as an array,
+        see FrameBuffer.get_frame(). The array is reused, and overwritten by
+        later steps.'''
+        if self.__frames is None:
+            raise ValueError("get_frame() needs an env that draws into its own FrameBuffer")
+        self.render()
+        return self.__frames.get_frame(gray, scale)
+
+    def get_entities(self):
+        '''Returns the structured array of every entity of the game (see
+        asteroidsObservation.EntityObserver), refreshed in place if the game
+        has changed. Rows past the number of entities have kind NONE. The env
+        must be made with vectorized=True.'''
+        if self.__entities is None:
+            self.__entities = asteroidsObservation.EntityObserver()
+        if self.__refreshed != self.__steps:
+            self.__entities.refresh(self.__world)
+            self.__refreshed = self.__steps
+        return self.__entities.entities
+
+    def get_world(self):
+        '''Gets/Returns the World of the current game, or None before reset().'''
+        return self.__world
+
+    def get_seed(self):
+        '''Gets/Returns the seed of the current game.'''
+        return self.__seed
+
+def shared_array(memory, shape, dtype):
+    '''Returns a NumPy array of the given shape and type over a block of
+    shared memory.'''
+    return numpy.ndarray(shape, dtype, buffer=memory.buf)
+
+def worker(connection, names, count, first, number, seed, options):
+    '''Runs in each process of a VectorEnv. Steps envs first to first +
+    number - 1 of the count envs, whose actions, observations, rewards and
+    done flags are the shared memory blocks of the given names, whenever the
+    VectorEnv sends "reset" or "step" through the connection, until it sends
+    "close". Each env plays from seed plus its index, and every game after its
+    first from the seed of its last game plus count.'''
+    blocks = [shared_memory.SharedMemory(name) for name in names]
+    actions = shared_array(blocks[0], (count,), numpy.int32)
+    observations = shared_array(blocks[1], (count, OBSERVATION_SIZE), numpy.float32)
+    rewards = shared_array(blocks[2], (count,), numpy.float32)
+    dones = shared_array(blocks[3], (count,), numpy.bool_)
+    envs = [AsteroidsEnv(**options) for index in range(number)]
+
+    while True:
+        command = connection.recv()
+        if command == "reset":
+            for index, env in enumerate(envs, first):
+                env.reset(seed + index)
+                env.observe(observations[index])
+                rewards[index] = 0
+                dones[index] = False
+            connection.send(None)
+        elif command == "step":
+            finished = []
+            for index, env in enumerate(envs, first):
+                observation, reward, done, info = env.step(int(actions[index]))
+                rewards[index] = reward
+                dones[index] = done
+                if done:
+                    del info["sounds"]
+                    finished.append((index, info))
+                    env.reset(env.get_seed() + count)
+                env.observe(observations[index])
+            connection.send(finished)
+        else:
+            break
+
+    del actions, observations, rewards, dones
+    for block in blocks:
+        block.close()
+    pygame.quit()
+
+class VectorEnv(object):
+    '''Many independent games stepped together by a pool of worker processes.
+    A game that ends is started again at once, so the observation returned
+    for it is the first of its next game.
+
+    Instance Variables:
+    self.__count - number of games
+    self.__blocks - list of the shared memory blocks of the actions,
+                    observations, rewards and done flags
+    self.__actions - int32 array of the action of each game, in shared memory
+    self.__observations - float32 array of the observation of each game, one
+                          row each, in shared memory
+    self.__rewards - float32 array of the reward of each game's last step, in
+                     shared memory
+    self.__dones - bool array, True for each game that ended in the last step
+    self.__connections - list of the pipe to each worker process
+    self.__processes - list of the worker processes
+    '''
+    def __init__(self, count, workers=None, seed=0, **options):
+        '''Initializer method for the VectorEnv. The games are shared out
+        between the given number of processes, by default one per CPU. Extra
+        keyword arguments are passed on to every AsteroidsEnv.'''
+        workers = min(workers or multiprocessing.cpu_count(), count)
+        self.__count = count
+        self.__blocks = [shared_memory.SharedMemory(create=True, size=max(size, 1)) \
+                         for size in (count * 4, count * OBSERVATION_SIZE * 4, count * 4, count)]
+        self.__actions = shared_array(self.__blocks[0], (count,), numpy.int32)
+        self.__observations = shared_array(self.__blocks[1], (count, OBSERVATION_SIZE), \
+                                           numpy.float32)
+        self.__rewards = shared_array(self.__blocks[2], (count,), numpy.float32)
+        self.__dones = shared_array(self.__blocks[3], (count,), numpy.bool_)
+
+        #Spawned rather than forked, so that no process inherits another's SDL state.
+        context = multiprocessing.get_context("spawn")
+        names = [block.name for block in self.__blocks]
+        self.__connections = []
+        self.__processes = []
+        first = 0
+        for number in range(workers):
+            last = count * (number + 1) // workers
+            connection, child = context.Pipe()
+            process = context.Process(target=worker, args=(child, names, count, first, \
+                                                          last - first, seed, options))
+            process.daemon = True
+            process.start()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+            first = last
+
+    def __len__(self):
+        '''Returns the number of games.'''
+        return self.__count
+
+    def reset(self):
+        '''Starts every game from its first seed and returns the array of
+        their observations. The array is shared memory that later calls
+        overwrite, so copy it to keep it.'''
+        for connection in self.__connections:
+            connection.send("reset")
+        for connection in self.__connections:
+            connection.recv()
+        return self.__observations
+
+    def step(self, actions):
+        '''Runs one step of every game, each with its own action from the
+        sequence actions. Returns (observations, rewards, dones, infos), where
+        the first three are arrays in shared memory that later calls
+        overwrite, and infos is a dict of the index of each game that ended to
+        its final info.'''
+        self.__actions[:] = actions
+        for connection in self.__connections:
+            connection.send("step")
+        infos = {}
+        for connection in self.__connections:
+            infos.update(connection.recv())
+        return self.__observations, self.__rewards, self.__dones, infos
+
+    def close(self):
+        '''Stops the worker processes and frees the shared memory.'''
+        for connection in self.__connections:
+            connection.send("close")
+        for process in self.__processes:
+            process.join()
+        self.__connections = []
+        self.__processes = []
+        del self.__actions, self.__observations, self.__rewards, self.__dones
+        for block in self.__blocks:
+            block.close()
+            block.unlink()
+        self.__blocks = []
+
+def main():
+    '''Parses the command line, steps games with random actions in one process
+    and then across a VectorEnv, and prints the steps per second.'''
+    parser = argparse.ArgumentParser(description="Measure Asteroids environment throughput.")
+    parser.add_argument("--envs", type=int, default=8, help="games stepped together")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--steps", type=int, default=2000, help="steps of every game")
+    parser.add_argument("--swarm", action="store_true", help="play in the swarm stress mode")
+    args = parser.parse_args()
+
+    options = {}
+    if args.swarm:
+        options.update(asteroidsWorld.SWARM)
+    rng = numpy.random.default_rng(0)
+    actions = rng.integers(0, ACTION_COUNT, (args.steps, args.envs), dtype=numpy.int32)
+
+    env = AsteroidsEnv(**options)
+    env.reset(0)
+    start = time.perf_counter()
+    for step in range(args.steps):
+        if env.step(int(actions[step, 0]))[2]:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    print("1 env in this process: %.0f steps/s" % (args.steps / elapsed))
+    pygame.quit()
+
+    vector = VectorEnv(args.envs, args.workers, **options)
+    vector.reset()
+    games = 0
+    start = time.perf_counter()
+    for step in range(args.steps):
+        games += len(vector.step(actions[step])[3])
+    elapsed = time.perf_counter() - start
+    vector.close()
+    workers = min(args.workers or multiprocessing.cpu_count(), args.envs)
+    total = args.steps * args.envs / elapsed
+    print("%d envs in %d workers: %.0f steps/s, %.0f steps/s per core, %d games ended" % \
+          (args.envs, workers, total, total / min(workers, multiprocessing.cpu_count()), games))
+
+if __name__ == "__main__":
+    main()
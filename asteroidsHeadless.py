@@ -0,0 +1,142 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Runs the Asteroids game logic without a display or a sound card,
+as fast as it can, and reports how many frames per second were simulated. The
+SDL dummy video and audio drivers are used, so this works on machines with no
+screen. The player is replaced by a bot that presses random keys. The games
+are seeded, so the same seed always plays the same games, and the bot's
+session can be recorded for asteroidsReplay.py.
+
+Usage: python asteroidsHeadless.py [--frames N] [--seed N] [--draw] [--assets]
+                                   [--record FILE] [--profile FILE] [--swarm]
+'''
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, random, time, pygame, asteroidsAssets, asteroidsProfiler, asteroidsReplay, \
+       asteroidsWorld
+
+def init(size=(640, 480)):
+    '''Initializes pygame with the dummy drivers and returns an off-screen
+    display surface of the given size. A display mode is still needed so that
+    images can be converted to the display's pixel format.'''
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode(size)
+
+def random_actions(bot):
+    '''Returns the action flags for one frame of a bot that holds thrust most
+    of the time and randomly turns, fires and raises its shield.'''
+    actions = 0
+    if bot.random() < 0.8:
+        actions |= asteroidsWorld.THRUST
+    if bot.random() < 0.1:
+        actions |= asteroidsWorld.ROTATE_LEFT
+    if bot.random() < 0.1:
+        actions |= asteroidsWorld.ROTATE_RIGHT
+    if bot.random() < 0.2:
+        actions |= asteroidsWorld.FIRE
+    if bot.random() < 0.02:
+        actions |= asteroidsWorld.SHIELD
+    return actions
+
+def run(screen, frames, seed=0, draw=False, recording=None, profiler=None, options=None):
+    '''Steps games back to back for the given number of frames, starting a new
+    game whenever the bot runs out of lives. Drawing onto the off-screen
+    surface is skipped unless draw is True. The bot and the games are seeded
+    from seed. If a Recording is given, the bot's actions are recorded into it
+    (its seed and options are used for the games); otherwise the games are
+    made with the given World options, by default just a frame rate of 30. If
+    a FrameProfiler is given, every frame is timed with it. Returns a dict with the
+    number of frames, games, the most asteroids on the field at once, the
+    elapsed seconds and the simulated frames per second.'''
+    bot = random.Random(seed)
+    if recording is None:
+        recording = asteroidsReplay.Recording(seed, options or {"frame_rate": 30})
+        record = None
+    else:
+        record = recording.record
+    images = asteroidsWorld.load_images()
+    world = recording.new_world(screen, images)
+    world.set_profiler(profiler)
+    asteroids = world.get_scene().group("asteroid")
+    peak = 0
+    games = 1
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        if profiler is not None:
+            profiler.begin()
+        actions = random_actions(bot)
+        if record:
+            record(actions)
+        world.step(actions)
+        peak = max(peak, len(asteroids))
+        if draw:
+            world.draw(screen)
+        if profiler is not None:
+            profiler.end()
+        if world.is_over():
+            world = recording.new_world(screen, images, games)
+            world.set_profiler(profiler)
+            asteroids = world.get_scene().group("asteroid")
+            games += 1
+    elapsed = time.perf_counter() - start
+    if record:
+        recording.finish(world, games)
+
+    return {"frames": frames,
+            "games": games,
+            "asteroids": peak,
+            "rockets": world.get_rocket_pool().get_stats(),
+            "explosions": world.get_explosions().get_stats(),
+            "seconds": elapsed,
+            "fps": frames / elapsed if elapsed else float("inf")}
+
+def main():
+    '''Parses the command line, runs the simulation and prints the results.'''
+    parser = argparse.ArgumentParser(description="Run Asteroids headless at full speed.")
+    parser.add_argument("--frames", type=int, default=10000, help="frames to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the bot's key presses")
+    parser.add_argument("--draw", action="store_true", help="also draw every frame off-screen")
+    parser.add_argument("--assets", action="store_true", help="report asset load times and sizes")
+    parser.add_argument("--record", metavar="FILE", help="record the bot's session to a file")
+    parser.add_argument("--profile", metavar="FILE", \
+                        help="save the time of each phase of the last frames (.json or .csv)")
+    parser.add_argument("--swarm", action="store_true", \
+                        help="play in the swarm stress mode, where asteroids split and multiply")
+    args = parser.parse_args()
+
+    options = {"frame_rate": 30}
+    if args.swarm:
+        options.update(asteroidsWorld.SWARM)
+    recording = None
+    if args.record:
+        recording = asteroidsReplay.Recording(args.seed, options)
+    profiler = None
+    if args.profile:
+        profiler = asteroidsProfiler.FrameProfiler(window=min(args.frames, 10000))
+    screen = init()
+    result = run(screen, args.frames, args.seed, args.draw, recording, profiler, options)
+    pygame.quit()
+    if recording:
+        recording.save(args.record)
+    if profiler is not None:
+        profiler.save(args.profile)
+
+    print("%(frames)d frames, %(games)d games in %(seconds).2f s: %(fps).0f frames/s" % result)
+    print("rocket pool of the last game: %(hits)d hits, %(misses)d misses, peak %(peak)d" % \
+          result["rockets"])
+    print("explosions of the last game: %(spawned)d spawned, %(replaced)d replaced" % \
+          result["explosions"])
+    print("most asteroids on the field: %(asteroids)d" % result)
+    if profiler is not None:
+        budget = profiler.get_summary()["budget"]
+        print("frames over the %(ms).1f ms budget: %(over_total)d" % budget)
+    if args.assets:
+        print(asteroidsAssets.cache.report())
+
+if __name__ == "__main__":
+    main()
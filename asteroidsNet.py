@@ -0,0 +1,712 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Local network multiplayer for Asteroids. A Server runs the one
+authoritative World, in which every client flies its own ship through the
+same asteroids and UFOs, and talks to its Clients over UDP. Each tick the
+server takes one input from every client, steps the world and sends each
+client a snapshot. A snapshot is a delta: it only holds the entities whose
+position, velocity or state changed since the last tick the client
+acknowledged, and the ids of the ones removed since, so a client whose
+acknowledgement was lost simply gets a larger delta next tick. Both sides
+move an entity that is not sent along by its velocity, so one that keeps
+flying straight at the same speed, like most asteroids and rockets, counts as
+unchanged. A client that has acknowledged nothing, or only a tick too old to
+remember, gets every entity. Clients predict their own ship from each input
+as they send it, and correct the prediction from every snapshot by replaying
+the inputs the server has not processed yet. A client that goes quiet is
+dropped after a few seconds, and told so if it is heard from again.
+
+Usage: python asteroidsNet.py [--clients N [N ...]] [--ticks N] [--swarm]
+       python asteroidsNet.py --serve [PORT] [--host HOST] [--swarm]
+       python asteroidsNet.py --connect HOST:PORT [--ticks N]
+'''
+#Imported first so that the dummy SDL drivers are set before pygame starts.
+import asteroidsHeadless
+
+import argparse, collections, random, socket, struct, time, weakref, pygame, asteroidsProfiler, \
+       asteroidsScene, asteroidsSprites, asteroidsWorld
+
+#Ticks per second. A seeded World's clock also runs at 30 steps per second.
+TICK_RATE = 30
+
+#Types of packet, the first byte of every packet.
+JOIN = 1
+WELCOME = 2
+INPUT = 3
+SNAPSHOT = 4
+DROPPED = 5
+
+#Welcome: type, player number, width and height of the field, current tick.
+WELCOME_PACKET = struct.Struct("<BHHHI")
+#Input: type, sequence number, last tick the client has in full, action flags.
+INPUT_PACKET = struct.Struct("<BIIB")
+#Snapshot: type, tick, baseline tick (0 if every entity is sent), sequence
+#number of the player's last input processed, 1 if some changed entities did
+#not fit, the player's score, lives and shield, the x, y, angle // 90 and
+#speed * 4 of their ship, and the numbers of changed and removed entities.
+#The records of the changed entities follow, then the ids of the removed ones.
+SNAPSHOT_HEADER = struct.Struct("<BIIIBIHhhhBBHH")
+#Dropped is just its type: the client no longer has a ship and must join again.
+#Changed entity: id, kind, x and y of its center, how far it moved since the
+#last tick (clamped to a byte), and its state.
+ENTITY = struct.Struct("<IBhhbbH")
+REMOVED = struct.Struct("<I")
+
+#Kinds of entity. The state of an asteroid is its size, of a powerup its
+#type, and of a ship its player number * 4 + its angle // 90.
+SHIP = 1
+ASTEROID = 2
+UFO = 3
+ROCKET = 4
+ENEMY_ROCKET = 5
+POWERUP = 6
+SHIELD = 7
+
+#The kind of the sprites on each draw layer of the Scene.
+LAYER_KINDS = ((asteroidsScene.POWERUP_LAYER, POWERUP), (asteroidsScene.ASTEROID_LAYER, ASTEROID),
+               (asteroidsScene.SHIELD_LAYER, SHIELD), (asteroidsScene.SHIP_LAYER, SHIP),
+               (asteroidsScene.UFO_LAYER, UFO), (asteroidsScene.ROCKET_LAYER, ROCKET),
+               (asteroidsScene.ENEMY_ROCKET_LAYER, ENEMY_ROCKET))
+
+#Largest UDP payload. A snapshot with more changed entities than fit (about
+#5000) is cut short and marked partial; clients show it but do not
+#acknowledge it, so the rest comes in the next snapshot.
+MAX_DATAGRAM = 65507
+
+#Ticks of states kept by the server and by each client as baselines.
+HISTORY = 64
+
+#Inputs the server queues for a client that gets ahead; older ones are dropped.
+MAX_QUEUE = 8
+
+#Ticks without a packet from a client after which the server drops it and
+#takes its ship off the field.
+TIMEOUT = 5 * TICK_RATE
+
+def clamp(value):
+    '''Returns value clamped to the range of a signed byte.'''
+    return -128 if value < -128 else 127 if value > 127 else value
+
+class Connection(object):
+    '''The server's record of one client.
+
+    Instance Variables:
+    self.address - (host, port) the client sends from
+    self.player - the client's player number in the World
+    self.inputs - deque of the (sequence number, actions) not yet processed
+    self.received - sequence number of the last input received
+    self.processed - sequence number of the last input processed
+    self.actions - action flags of the last input processed
+    self.ack - last tick the client has acknowledged, 0 for none
+    self.sent - bytes of snapshots sent to the client
+    self.heard - tick at which the client last sent a packet
+    '''
+    def __init__(self, address, player, tick):
+        '''Initializer method for a Connection, for a client that joined at
+        the given tick.'''
+        self.address = address
+        self.player = player
+        self.heard = tick
+        self.inputs = collections.deque(maxlen=MAX_QUEUE)
+        self.received = 0
+        self.processed = 0
+        self.actions = 0
+        self.ack = 0
+        self.sent = 0
+
+class Server(object):
+    '''Runs a World shared by every client that joins, one tick per call to
+    tick(). The first client to join flies the World's first ship; each one
+    after it gets a ship of its own. A client that sends nothing for TIMEOUT
+    ticks is dropped, and its ship taken off the field; the next client to
+    join takes its place with a new ship. A dropped client is sent DROPPED,
+    and again in answer to any input it sends after.
+
+    Instance Variables:
+    self.__socket - non-blocking UDP socket the server listens on
+    self.__world - the World every client plays in
+    self.__size - width and height of the field
+    self.__connections - dict of address to the Connection of each client
+    self.__free - list of the player numbers no client is playing
+    self.__dropped - number of clients dropped for sending nothing
+    self.__tick - number of ticks run
+    self.__ids - WeakKeyDictionary of each sprite to its entity id
+    self.__next_id - id of the next new entity
+    self.__centers - dict of entity id to its center at the last tick
+    self.__history - dict of tick to the state of the world at that tick, a
+                     dict of entity id to (kind, x, y, dx, dy, state)
+    self.__deltas - dict of baseline tick to the delta of this tick from it,
+                    so that clients with the same baseline share one delta
+    self.__profiler - FrameProfiler timing each phase of every tick
+    self.__full - bytes the snapshots would have taken with every entity
+    '''
+    def __init__(self, screen, images, port=0, host="127.0.0.1", seed=0, window=1000, \
+                 **options):
+        '''Initializer method for the Server. It listens on the given port,
+        or any free one if port is 0 (see get_address()). The World is played
+        from seed; extra keyword arguments, such as those in
+        asteroidsWorld.SWARM, are passed on to it. The last window ticks are
+        profiled.'''
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.bind((host, port))
+        self.__socket.setblocking(False)
+        self.__world = asteroidsWorld.World(screen, images, frame_rate=TICK_RATE, seed=seed, \
+                                            **options)
+        self.__size = screen.get_size()
+        self.__connections = {}
+        self.__free = [0]
+        self.__dropped = 0
+        self.__tick = 0
+        self.__ids = weakref.WeakKeyDictionary()
+        self.__next_id = 1
+        self.__centers = {}
+        self.__history = {}
+        self.__deltas = {}
+        self.__profiler = asteroidsProfiler.FrameProfiler(window, 1000.0 / TICK_RATE)
+        self.__full = 0
+
+    def get_address(self):
+        '''Gets/Returns the (host, port) the server listens on.'''
+        return self.__socket.getsockname()
+
+    def get_world(self):
+        '''Gets/Returns the World the clients play in.'''
+        return self.__world
+
+    def get_profiler(self):
+        '''Gets/Returns the FrameProfiler timing the server's ticks.'''
+        return self.__profiler
+
+    def get_stats(self):
+        '''Returns a dict of the ticks run, the clients connected and dropped,
+        the bytes of snapshots sent to the clients connected and the bytes
+        they would have taken with every entity.'''
+        return {"ticks": self.__tick, "clients": len(self.__connections),
+                "dropped": self.__dropped,
+                "bytes": sum(connection.sent for connection in self.__connections.values()),
+                "full_bytes": self.__full}
+
+    def close(self):
+        '''Stops listening.'''
+        self.__socket.close()
+
+    def tick(self):
+        '''Reads every packet that has arrived, steps the World with one input
+        of each client and sends each client its snapshot.'''
+        profiler = self.__profiler
+        profiler.begin()
+        self.__receive()
+        self.__drop_silent()
+        profiler.lap("receive")
+        actions = self.__take_inputs()
+        profiler.lap("input")
+        self.__world.step(actions)
+        self.__tick += 1
+        profiler.lap("step")
+        state = self.__record()
+        profiler.lap("snapshot")
+        sent = self.__send(state)
+        profiler.lap("send")
+        profiler.count("clients", len(self.__connections))
+        profiler.count("entities", len(state))
+        profiler.count("bytes", sent)
+        profiler.end()
+
+    def __receive(self):
+        '''Handles every packet waiting on the socket.'''
+        while True:
+            try:
+                data, address = self.__socket.recvfrom(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            except ConnectionResetError:
+                #Some systems report a client that has gone away this way.
+                continue
+            if data[:1] == bytes((JOIN,)):
+                self.__join(address)
+            elif data[:1] == bytes((INPUT,)) and len(data) == INPUT_PACKET.size:
+                connection = self.__connections.get(address)
+                if connection is None:
+                    self.__tell_dropped(address)
+                    continue
+                connection.heard = self.__tick
+                kind, sequence, ack, actions = INPUT_PACKET.unpack(data)
+                #Inputs that arrive late or twice are dropped.
+                if sequence > connection.received:
+                    connection.received = sequence
+                    connection.inputs.append((sequence, actions))
+                if connection.ack < ack <= self.__tick:
+                    connection.ack = ack
+
+    def __join(self, address):
+        '''Gives a client that joins a ship, unless it already has one, and
+        welcomes it.'''
+        world = self.__world
+        connection = self.__connections.get(address)
+        if connection is None:
+            if self.__free:
+                player = min(self.__free)
+                self.__free.remove(player)
+                if not world.get_player(player).spaceship.alive():
+                    world.respawn_player(player)
+            else:
+                player = world.add_player()
+            connection = self.__connections[address] = Connection(address, player, self.__tick)
+        connection.heard = self.__tick
+        width, height = self.__size
+        self.__socket.sendto(WELCOME_PACKET.pack(WELCOME, connection.player, width, height, \
+                                                 self.__tick), address)
+
+    def __drop_silent(self):
+        '''Drops the clients that have sent nothing for TIMEOUT ticks, and
+        takes their ships off the field.'''
+        for address, connection in list(self.__connections.items()):
+            if self.__tick - connection.heard >= TIMEOUT:
+                del self.__connections[address]
+                self.__world.remove_player(connection.player)
+                self.__free.append(connection.player)
+                self.__dropped += 1
+                self.__tell_dropped(address)
+
+    def __tell_dropped(self, address):
+        '''Tells a client that it has no ship any more.'''
+        try:
+            self.__socket.sendto(bytes((DROPPED,)), address)
+        except BlockingIOError:
+            #It is told again when its next input arrives.
+            pass
+
+    def __take_inputs(self):
+        '''Returns the list of the action flags of every player for this
+        tick, taking the next input of each client.'''
+        actions = [0] * len(self.__world.get_players())
+        for connection in self.__connections.values():
+            if connection.inputs:
+                connection.processed, connection.actions = connection.inputs.popleft()
+                actions[connection.player] = connection.actions
+            else:
+                #Until its next input arrives, a ship keeps thrusting if it
+                #was. It does not turn, since a turn is a whole 90 degrees
+                #that the client never predicted.
+                actions[connection.player] = connection.actions & asteroidsWorld.THRUST
+        return actions
+
+    def __record(self):
+        '''Returns the state of the world at this tick, a dict of entity id
+        to (kind, x, y, dx, dy, state), and keeps it as a baseline.'''
+        ids = self.__ids
+        centers = self.__centers
+        ships = {player.spaceship: number \
+                 for number, player in enumerate(self.__world.get_players())}
+        scene = self.__world.get_scene()
+        state = {}
+        moved = {}
+        for layer, kind in LAYER_KINDS:
+            for sprite in scene.layer(layer):
+                entity = ids.get(sprite)
+                if entity is None:
+                    entity = ids[sprite] = self.__next_id
+                    self.__next_id += 1
+                x, y = sprite.rect.center
+                last_x, last_y = centers.get(entity, (x, y))
+                if kind == ASTEROID:
+                    value = sprite.get_size()
+                elif kind == SHIP:
+                    value = ships[sprite] * 4 + sprite.get_angle() // 90
+                elif kind == POWERUP:
+                    value = sprite.get_type()
+                else:
+                    value = 0
+                state[entity] = (kind, x, y, clamp(x - last_x), clamp(y - last_y), value)
+                moved[entity] = (x, y)
+        self.__centers = moved
+
+        history = self.__history
+        history[self.__tick] = state
+        history.pop(self.__tick - HISTORY, None)
+        self.__deltas = {}
+        return state
+
+    def __delta(self, ack, state):
+        '''Returns (baseline tick, number of changed entities, number of
+        removed entities, the records of both, True if it was cut short) of
+        the delta of state from the tick ack.'''
+        delta = self.__deltas.get(ack)
+        if delta is None:
+            pack = ENTITY.pack
+            baseline = self.__history.get(ack) if ack else None
+            if baseline is None:
+                base = 0
+                changed = [pack(entity, *fields) for entity, fields in state.items()]
+                removed = []
+            else:
+                base = ack
+                ticks = self.__tick - ack
+                changed = []
+                for entity, fields in state.items():
+                    old = baseline.get(entity)
+                    #Unchanged if it is where its old velocity would have taken it.
+                    if old is None or old[3:] != fields[3:] or old[0] != fields[0] or \
+                       old[1] + old[3] * ticks != fields[1] or old[2] + old[4] * ticks != fields[2]:
+                        changed.append(pack(entity, *fields))
+                removed = [REMOVED.pack(entity) for entity in baseline if entity not in state]
+            room = (MAX_DATAGRAM - SNAPSHOT_HEADER.size - len(removed) * REMOVED.size) // \
+                   ENTITY.size
+            partial = len(changed) > room
+            if partial:
+                changed = changed[:max(room, 0)]
+            delta = self.__deltas[ack] = (base, len(changed), len(removed), \
+                                          b"".join(changed) + b"".join(removed), partial)
+        return delta
+
+    def __send(self, state):
+        '''Sends each client its snapshot and returns the bytes sent.'''
+        world = self.__world
+        sent = 0
+        for connection in self.__connections.values():
+            base, changed, removed, records, partial = self.__delta(connection.ack, state)
+            player = world.get_player(connection.player)
+            spaceship = player.spaceship
+            scorekeeper = player.scorekeeper
+            packet = SNAPSHOT_HEADER.pack(SNAPSHOT, self.__tick, base, connection.processed, \
+                                          partial, scorekeeper.get_score(), \
+                                          scorekeeper.get_lives(), int(scorekeeper.get_shield()), \
+                                          spaceship.rect.centerx, spaceship.rect.centery, \
+                                          spaceship.get_angle() // 90, \
+                                          int(spaceship.get_speed() * 4), changed, removed) + \
+                     records
+            try:
+                self.__socket.sendto(packet, connection.address)
+            except BlockingIOError:
+                #Dropped like any lost datagram; the next delta covers it.
+                continue
+            connection.sent += len(packet)
+            sent += len(packet)
+        self.__full += len(self.__connections) * (SNAPSHOT_HEADER.size + len(state) * ENTITY.size)
+        return sent
+
+class Client(object):
+    '''One player's connection to a Server. Inputs are sent with
+    send_input(), and snapshots read with receive(). A client the server
+    drops is no longer joined, and has to join() again.
+
+    Instance Variables:
+    self.__socket - non-blocking UDP socket connected to the server
+    self.__player - the client's player number, or None until welcomed
+    self.__spaceship - the client's ship, predicted from its inputs, or None
+                       until welcomed
+    self.__sequence - sequence number of the last input sent
+    self.__pending - list of the (sequence number, actions) sent but not yet
+                     processed by the server
+    self.__states - dict of tick to the entities at that tick, for each tick
+                    that can still be a baseline
+    self.__tick - last tick received in full, 0 before the first
+    self.__latest - last tick received, in full or not
+    self.__entities - dict of entity id to (kind, x, y, dx, dy, state) of
+                      every entity in the last snapshot
+    self.__status - dict of the player's score, lives and shield
+    self.__received - bytes of snapshots received
+    self.__snapshots - number of snapshots received
+    self.__corrections - number of snapshots that moved the predicted ship
+    '''
+    def __init__(self, address):
+        '''Initializer method for the Client, for the server at (host, port).'''
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__socket.connect(address)
+        self.__socket.setblocking(False)
+        self.__player = None
+        self.__spaceship = None
+        self.__sequence = 0
+        self.__pending = []
+        self.__states = {}
+        self.__tick = 0
+        self.__latest = 0
+        self.__entities = {}
+        self.__status = {"score": 0, "lives": 0, "shield": 0}
+        self.__received = 0
+        self.__snapshots = 0
+        self.__corrections = 0
+
+    def join(self):
+        '''Asks the server for a ship. The answer is read by receive(); send
+        again until is_joined() is True, since the request can be lost.'''
+        self.__socket.send(bytes((JOIN,)))
+
+    def is_joined(self):
+        '''Returns True once the server has given the client a ship.'''
+        return self.__player is not None
+
+    def get_player(self):
+        '''Gets/Returns the client's player number, or None until it joins.'''
+        return self.__player
+
+    def get_spaceship(self):
+        '''Gets/Returns the client's predicted Spaceship, or None until it joins.'''
+        return self.__spaceship
+
+    def get_entities(self):
+        '''Gets/Returns the dict of entity id to (kind, x, y, dx, dy, state)
+        of every entity in the last snapshot.'''
+        return self.__entities
+
+    def get_status(self):
+        '''Gets/Returns the dict of the player's score, lives and shield.'''
+        return self.__status
+
+    def get_stats(self):
+        '''Returns a dict of the bytes and number of snapshots received and
+        how many of them corrected the predicted ship.'''
+        return {"bytes": self.__received, "snapshots": self.__snapshots,
+                "corrections": self.__corrections}
+
+    def close(self):
+        '''Closes the connection.'''
+        self.__socket.close()
+
+    def send_input(self, actions):
+        '''Sends the server the action flags for the next tick, and moves the
+        predicted ship with them straight away.'''
+        if self.__player is None:
+            raise ValueError("the client has not joined a server")
+        self.__sequence += 1
+        self.__pending.append((self.__sequence, actions))
+        self.__socket.send(INPUT_PACKET.pack(INPUT, self.__sequence, self.__tick, actions))
+        if self.__status["lives"]:
+            self.__predict(actions)
+
+    def receive(self):
+        '''Reads every packet that has arrived and returns the number of
+        snapshots among them. Snapshots older than one already read are
+        dropped, as are deltas from a baseline the client no longer has.'''
+        snapshots = 0
+        while True:
+            try:
+                data = self.__socket.recv(MAX_DATAGRAM)
+            except BlockingIOError:
+                return snapshots
+            except ConnectionRefusedError:
+                #The server is not listening (yet, or any more).
+                continue
+            if data[:1] == bytes((WELCOME,)) and len(data) == WELCOME_PACKET.size:
+                self.__welcome(data)
+            elif data[:1] == bytes((DROPPED,)):
+                self.__leave()
+            elif data[:1] == bytes((SNAPSHOT,)) and self.__player is not None and \
+                 self.__apply(data):
+                snapshots += 1
+
+    def __welcome(self, data):
+        '''Takes the ship the server gave the client.'''
+        kind, player, width, height, tick = WELCOME_PACKET.unpack(data)
+        if self.__player is None:
+            self.__player = player
+            self.__spaceship = asteroidsSprites.Spaceship(pygame.Surface((width, height)))
+
+    def __leave(self):
+        '''Forgets the ship and every snapshot, once the server has dropped
+        the client.'''
+        self.__player = None
+        self.__spaceship = None
+        self.__pending = []
+        self.__states = {}
+        self.__tick = 0
+        self.__latest = 0
+        self.__entities = {}
+        self.__status = {"score": 0, "lives": 0, "shield": 0}
+
+    def __apply(self, data):
+        '''Applies a snapshot on top of its baseline, and returns False if it
+        could not be.'''
+        (packet, tick, base, processed, partial, score, lives, shield, x, y, angle, speed, \
+         changed, removed) = SNAPSHOT_HEADER.unpack_from(data)
+        if tick <= self.__latest:
+            return False
+        if base:
+            baseline = self.__states.get(base)
+            if baseline is None:
+                return False
+        else:
+            baseline = {}
+
+        #Everything not in the snapshot has flown on at its old velocity.
+        ticks = tick - base
+        entities = {entity: (kind, x + dx * ticks, y + dy * ticks, dx, dy, state) \
+                    for entity, (kind, x, y, dx, dy, state) in baseline.items()}
+        start = SNAPSHOT_HEADER.size
+        end = start + changed * ENTITY.size
+        for record in ENTITY.iter_unpack(data[start:end]):
+            entities[record[0]] = record[1:]
+        for entity, in REMOVED.iter_unpack(data[end:end + removed * REMOVED.size]):
+            entities.pop(entity, None)
+        self.__entities = entities
+        self.__latest = tick
+        self.__received += len(data)
+        self.__snapshots += 1
+
+        #Only whole snapshots are acknowledged and kept as baselines.
+        if not partial:
+            self.__tick = tick
+            states = self.__states
+            states[tick] = entities
+            for old in [old for old in states if old <= tick - HISTORY]:
+                del states[old]
+
+        self.__status = {"score": score, "lives": lives, "shield": shield}
+        self.__reconcile(x, y, angle * 90, speed / 4.0, processed)
+        return True
+
+    def __predict(self, actions):
+        '''Moves the predicted ship the way the World moves a ship with the
+        given action flags in one step.'''
+        spaceship = self.__spaceship
+        if actions & asteroidsWorld.ROTATE_RIGHT:
+            spaceship.rotate_right()
+        if actions & asteroidsWorld.ROTATE_LEFT:
+            spaceship.rotate_left()
+        if actions & asteroidsWorld.THRUST:
+            spaceship.move_forwards()
+        spaceship.update()
+
+    def __reconcile(self, x, y, angle, speed, processed):
+        '''Puts the predicted ship where the server has it after the input
+        processed, then replays the inputs sent since.'''
+        self.__pending = [(sequence, actions) for sequence, actions in self.__pending \
+                          if sequence > processed]
+        spaceship = self.__spaceship
+        predicted = (spaceship.rect.center, spaceship.get_angle(), spaceship.get_speed())
+        spaceship.set_state(x, y, angle, speed)
+        if self.__status["lives"]:
+            for sequence, actions in self.__pending:
+                self.__predict(actions)
+        if (spaceship.rect.center, spaceship.get_angle(), spaceship.get_speed()) != predicted:
+            self.__corrections += 1
+
+def benchmark(screen, images, clients, ticks, seed=0, options=None):
+    '''Runs a Server with the given number of bot clients in this process
+    for a number of ticks, each client sending an input and reading its
+    snapshot every tick. Returns a dict of the p50 and p95 time of a server
+    tick and the p50 time of building and of sending the snapshots, in
+    milliseconds, the mean
+    entities, the bytes per second each client received and would have with
+    every entity in every snapshot, and the mean corrections per client.'''
+    server = Server(screen, images, seed=seed, window=ticks, **(options or {}))
+    bots = [random.Random(seed + index) for index in range(clients)]
+    players = [Client(server.get_address()) for index in range(clients)]
+    for client in players:
+        client.join()
+    server.tick()
+    for client in players:
+        client.receive()
+
+    for tick in range(ticks):
+        for client, bot in zip(players, bots):
+            client.send_input(asteroidsHeadless.random_actions(bot))
+        server.tick()
+        for client in players:
+            client.receive()
+
+    summary = server.get_profiler().get_summary()
+    phases = summary["phases"]
+    stats = server.get_stats()
+    seconds = (ticks + 1) / float(TICK_RATE)
+    received = sum(client.get_stats()["bytes"] for client in players)
+    corrections = sum(client.get_stats()["corrections"] for client in players)
+    for client in players:
+        client.close()
+    server.close()
+    return {"clients": clients,
+            "tick_p50": phases["frame"]["p50"], "tick_p95": phases["frame"]["p95"],
+            "snapshot_p50": phases["snapshot"]["p50"], "send_p50": phases["send"]["p50"],
+            "entities": summary["counts"]["entities"]["mean"],
+            "bytes_per_second": received / float(clients) / seconds,
+            "full_bytes_per_second": stats["full_bytes"] / float(clients) / seconds,
+            "corrections": corrections / float(clients)}
+
+def serve(screen, images, port, options, host="127.0.0.1"):
+    '''Runs a Server on a port of host (only this machine by default) in
+    real time, printing its traffic every five seconds, until interrupted.'''
+    server = Server(screen, images, port, host, **options)
+    print("Serving on port %d" % server.get_address()[1])
+    start = time.perf_counter()
+    try:
+        while True:
+            server.tick()
+            stats = server.get_stats()
+            if stats["ticks"] % (TICK_RATE * 5) == 0:
+                print("tick %d: %d clients, %d dropped, %d bytes sent" % \
+                      (stats["ticks"], stats["clients"], stats["dropped"], stats["bytes"]))
+            delay = start + stats["ticks"] / float(TICK_RATE) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    server.close()
+
+def connect(address, ticks, seed=0):
+    '''Plays a bot on the server at address in real time for a number of
+    ticks, joining again if it is dropped, and prints what it received.'''
+    client = Client(address)
+    bot = random.Random(seed)
+    deadline = time.perf_counter() + 5
+    while not client.is_joined():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("no answer from %s:%d" % address)
+        client.join()
+        time.sleep(0.1)
+        client.receive()
+    for tick in range(ticks):
+        if client.is_joined():
+            client.send_input(asteroidsHeadless.random_actions(bot))
+        else:
+            client.join()
+        time.sleep(1.0 / TICK_RATE)
+        client.receive()
+    stats = client.get_stats()
+    if client.is_joined():
+        print("player %d: %d snapshots, %.0f bytes/s, %d corrections, score %d" % \
+              (client.get_player(), stats["snapshots"], stats["bytes"] * TICK_RATE / float(ticks), \
+               stats["corrections"], client.get_status()["score"]))
+    else:
+        print("dropped by the server after %d snapshots" % stats["snapshots"])
+    client.close()
+
+def main():
+    '''Parses the command line, and benchmarks a server with each number of
+    clients, serves, or connects a bot to a server.'''
+    parser = argparse.ArgumentParser(description="Benchmark or play Asteroids over UDP.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[2, 8, 32],
+                        help="numbers of clients to benchmark the server with")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks to run")
+    parser.add_argument("--swarm", action="store_true", help="play in the swarm stress mode")
+    parser.add_argument("--serve", type=int, nargs="?", const=5555, metavar="PORT",
+                        help="run a server in real time instead")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address the server listens on (default: this machine only)")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="connect a bot to a server instead")
+    args = parser.parse_args()
+
+    options = {}
+    if args.swarm:
+        options.update(asteroidsWorld.SWARM)
+    screen = asteroidsHeadless.init()
+    images = asteroidsWorld.load_images()
+    if args.serve is not None:
+        serve(screen, images, args.serve, options, args.host)
+    elif args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        connect((host, int(port)), args.ticks)
+    else:
+        for clients in args.clients:
+            result = benchmark(screen, images, clients, args.ticks, options=options)
+            print("%2d clients: tick %.2f ms p50, %.2f ms p95 (snapshots %.2f ms, sending %.2f ms), "
+                  "%.0f entities, %.0f bytes/s per client (%.0f with full snapshots), "
+                  "%.1f corrections per client" % \
+                  (clients, result["tick_p50"], result["tick_p95"], result["snapshot_p50"], \
+                   result["send_p50"], result["entities"], result["bytes_per_second"], \
+                   result["full_bytes_per_second"], result["corrections"]))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the FrameBuffer and EntityObserver classes,
+which let bots and recorders read each step of a game without copying it out.
+A FrameBuffer is a surface whose pixels live in a NumPy array, so the game is
+drawn straight into the array and the frame is always there to read; smaller
+and grayscale versions of the frame are made into arrays of their own, at
+most once a frame. An EntityObserver refreshes a preallocated structured array
+of every entity's kind, size, position and velocity in place, straight from
+the arrays of a vectorized World's EntityStore. Neither allocates per step.
+Requires NumPy.
+'''
+import numpy, pygame
+
+#Fields of each row of an EntityObserver's array. kind is one of the kinds of
+#asteroidsEntities.EntityStore, NONE for unused rows.
+ENTITY_DTYPE = numpy.dtype([("kind", numpy.int8), ("size", numpy.int8), \
+                            ("x", numpy.int32), ("y", numpy.int32), \
+                            ("dx", numpy.int32), ("dy", numpy.int32)])
+
+#Weights of red, green and blue in gray, out of 256.
+GRAY_WEIGHTS = (77, 150, 29)
+
+class FrameBuffer(object):
+    '''A surface to draw the game on, sharing its pixels with a NumPy array.
+    The array's channels are in the same order as the display's, so that
+    sprites are blitted onto it as fast as onto the display.
+
+    Instance Variables:
+    self.pixels - (height, width, 4) uint8 array of the surface's pixels
+    self.__surface - Surface drawing into self.pixels
+    self.__rgb - (height, width, 3) view of self.pixels, red first
+    self.__frame - number of frames finished, see next_frame()
+    self.__variants - dict of (gray, scale) to a list of the variant's array,
+                      the frame it was made from and the arrays used to make it
+    '''
+    def __init__(self, size):
+        '''Initializer method for the FrameBuffer. The display module must be
+        initialized with a mode set.'''
+        width, height = size
+        self.pixels = numpy.zeros((height, width, 4), numpy.uint8)
+        if pygame.display.get_surface().get_masks()[0] == 0xFF:
+            self.__surface = pygame.image.frombuffer(self.pixels, size, "RGBA")
+            self.__rgb = self.pixels[:, :, :3]
+        else:
+            self.__surface = pygame.image.frombuffer(self.pixels, size, "BGRA")
+            self.__rgb = self.pixels[:, :, 2::-1]
+        self.__frame = 0
+        self.__variants = {}
+
+    def get_surface(self):
+        '''Gets/Returns the surface to draw the game on.'''
+        return self.__surface
+
+    def next_frame(self):
+        '''Marks the frame as finished, after something was drawn, so that
+        the variants are made again when next asked for.'''
+        self.__frame += 1
+
+    def get_frame(self, gray=False, scale=1):
+        '''Returns the frame as a (height, width, 3) array, red first, or
+        (height, width) if gray. With scale more than 1, only every scale-th
+        pixel of every scale-th row is kept. The full color frame is a view of
+        the surface's own pixels, so it changes as the game is drawn; the
+        others are arrays of their own, made the first time they are asked
+        for and refreshed in place at most once a frame.'''
+        if not gray and scale == 1:
+            return self.__rgb
+        variant = self.__variants.get((gray, scale))
+        if variant is None:
+            variant = self.__variants[(gray, scale)] = self.__new_variant(gray, scale)
+        output, frame, source, scratch = variant
+        if frame != self.__frame:
+            if gray:
+                total, part = scratch
+                red, green, blue = GRAY_WEIGHTS
+                numpy.multiply(source[:, :, 0], red, out=total, dtype=numpy.uint16)
+                numpy.multiply(source[:, :, 1], green, out=part, dtype=numpy.uint16)
+                numpy.add(total, part, out=total)
+                numpy.multiply(source[:, :, 2], blue, out=part, dtype=numpy.uint16)
+                numpy.add(total, part, out=total)
+                numpy.right_shift(total, 8, out=total)
+                numpy.copyto(output, total, casting="unsafe")
+            else:
+                numpy.copyto(output, source)
+            variant[1] = self.__frame
+        return output
+
+    def __new_variant(self, gray, scale):
+        '''Returns the list of a new variant's array, the frame it was made
+        from (none yet), the view of the frame it is made from and the arrays
+        used to turn that gray.'''
+        source = self.__rgb[::scale, ::scale]
+        height, width = source.shape[:2]
+        if gray:
+            scratch = (numpy.zeros((height, width), numpy.uint16), \
+                       numpy.zeros((height, width), numpy.uint16))
+            return [numpy.zeros((height, width), numpy.uint8), -1, source, scratch]
+        return [numpy.zeros((height, width, 3), numpy.uint8), -1, source, None]
+
+class EntityObserver(object):
+    '''Keeps the kind, size, position and velocity of every entity of a
+    vectorized World in a structured array. The asteroids and rockets come
+    straight from the World's EntityStore; the ship and the UFO, which are
+    not in the store, are added after them, with their velocity taken as how
+    far they moved since the last refresh.
+
+    Instance Variables:
+    self.entities - structured array of ENTITY_DTYPE; the first rows are the
+                    entities, the rest have kind NONE
+    self.__count - number of rows in use
+    self.__previous - dict of kind to where the ship or the UFO was at the
+                      last refresh
+    '''
+    def __init__(self, capacity=1024):
+        '''Initializer method for the EntityObserver. The array grows if a
+        world ever has more entities than capacity.'''
+        self.entities = numpy.zeros(capacity, ENTITY_DTYPE)
+        self.__count = 0
+        self.__previous = {}
+
+    def __len__(self):
+        '''Returns the number of entities in the array.'''
+        return self.__count
+
+    def refresh(self, world):
+        '''Writes the entities of a vectorized World into the array, in place,
+        and returns how many there are.'''
+        store = world.get_store()
+        if store is None:
+            raise ValueError("EntityObserver needs a World made with vectorized=True")
+        alive = store.alive
+        count = int(numpy.count_nonzero(alive))
+        if count + 2 > len(self.entities):
+            self.entities = numpy.zeros(2 * (count + 2), ENTITY_DTYPE)
+        entities = self.entities
+        for name in ("kind", "size", "x", "y", "dx", "dy"):
+            numpy.compress(alive, getattr(store, name), out=entities[name][:count])
+
+        #The ship (unless it has been destroyed) and the UFO (if there is one).
+        for sprite, kind in ((world.get_spaceship(), store.SHIP), (world.get_ufo(), store.UFO)):
+            if sprite is None or not sprite.alive():
+                continue
+            x, y = sprite.rect.center
+            last_x, last_y = self.__previous.get(kind, (x, y))
+            entities[count] = (kind, 1, x, y, x - last_x, y - last_y)
+            self.__previous[kind] = (x, y)
+            count += 1
+
+        if count < self.__count:
+            entities["kind"][count:self.__count] = store.NONE
+        self.__count = count
+        return count
+
+    def reset(self):
+        '''Forgets where the ship and UFO were, for a new game.'''
+        self.__previous.clear()
+        self.__count = 0
+        self.entities["kind"] = 0
@@ -0,0 +1,239 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the ParticleSystem class, which draws the
+exhaust of the ship's engine, the debris of asteroids that are hit and the
+trails of rockets. Particles are single pixels kept in NumPy arrays; all of
+them are moved, aged and culled in one vectorized pass per frame and plotted
+straight into the surface's pixels through pygame.surfarray, so tens of
+thousands of them fit in a frame. Requires NumPy.
+'''
+import math, numpy, pygame
+
+#Kinds of particle, each with its own colors.
+THRUST = 0
+DEBRIS = 1
+TRAIL = 2
+ENEMY_TRAIL = 3
+
+#The color of each kind of particle when it is born and when it dies.
+COLORS = (((255, 230, 120), (160, 30, 0)),
+          ((200, 200, 200), (60, 60, 60)),
+          ((120, 255, 120), (0, 90, 0)),
+          ((255, 120, 120), (90, 0, 0)))
+
+#Number of shades each kind of particle fades through as it ages.
+SHADES = 8
+
+#Width and height of the squares of screen that are cleared and updated
+#together; a rect per particle would be far too many.
+CELL = 32
+
+class ParticleSystem(object):
+    '''Stores up to capacity particles in parallel arrays. The live particles
+    are always the first count entries, so every operation works on one
+    contiguous slice.
+
+    Instance Variables:
+    self.__width - width of the playfield; particles that leave it die
+    self.__height - height of the playfield
+    self.__capacity - most particles alive at once; more are not emitted
+    self.__count - number of particles alive
+    self.__x, self.__y - arrays of the position of each particle
+    self.__dx, self.__dy - arrays of the velocity of each particle, per step
+    self.__age - array of the number of steps each particle has lived
+    self.__lifetime - array of the number of steps each particle lives for
+    self.__kind - array of the kind of each particle
+    self.__drag - fraction of its velocity each particle keeps every step
+    self.__random - numpy Generator the particles are scattered with
+    self.__palette - array of the mapped color of each shade of each kind
+    self.__palette_format - pixel format the palette was mapped for
+    self.__columns - number of cells across the playfield
+    self.__cells - list of the rects of the cells the particles are in now,
+                   or None if they have moved since it was made
+    self.__drawn - list of the rects of the cells drawn last time
+    self.__dropped - number of particles not emitted because the arrays
+                     were full
+    '''
+    def __init__(self, width, height, capacity=32768, drag=0.92, seed=None):
+        '''Initializer method for the ParticleSystem.'''
+        self.__width = width
+        self.__height = height
+        self.__capacity = capacity
+        self.__count = 0
+        self.__x = numpy.zeros(capacity, numpy.float32)
+        self.__y = numpy.zeros(capacity, numpy.float32)
+        self.__dx = numpy.zeros(capacity, numpy.float32)
+        self.__dy = numpy.zeros(capacity, numpy.float32)
+        self.__age = numpy.zeros(capacity, numpy.int32)
+        self.__lifetime = numpy.ones(capacity, numpy.int32)
+        self.__kind = numpy.zeros(capacity, numpy.int32)
+        self.__drag = numpy.float32(drag)
+        self.__random = numpy.random.default_rng(seed)
+        self.__palette = None
+        self.__palette_format = None
+        self.__columns = -(-width // CELL)
+        self.__cells = []
+        self.__drawn = []
+        self.__dropped = 0
+
+    def __len__(self):
+        '''Returns the number of particles alive.'''
+        return self.__count
+
+    def emit(self, x, y, kind, count, speed, lifetime, angle=None, spread=2 * math.pi):
+        '''Emits count particles of a kind from (x, y), or from each of the
+        points if x and y are sequences. Each flies off at up to speed pixels
+        per step, in a direction within spread radians around angle (in
+        degrees, 90 is up), or in any direction if angle is None, and lives
+        for between half of lifetime and lifetime steps.'''
+        origins_x = numpy.asarray(x, numpy.float32).reshape(-1)
+        origins_y = numpy.asarray(y, numpy.float32).reshape(-1)
+        #Particles are only ever born, and kept, on the playfield.
+        inside = (origins_x >= 0) & (origins_x < self.__width) & \
+                 (origins_y >= 0) & (origins_y < self.__height)
+        origins_x = numpy.repeat(origins_x[inside], count)
+        origins_y = numpy.repeat(origins_y[inside], count)
+        total = len(origins_x)
+        start = self.__count
+        room = self.__capacity - start
+        if total > room:
+            self.__dropped += total - room
+            total = room
+        if total <= 0:
+            return
+        end = start + total
+
+        rng = self.__random
+        if angle is None:
+            directions = rng.random(total, numpy.float32) * numpy.float32(2 * math.pi)
+        else:
+            directions = (rng.random(total, numpy.float32) - numpy.float32(0.5)) * \
+                         numpy.float32(spread) + numpy.float32(math.radians(angle))
+        speeds = rng.random(total, numpy.float32) * numpy.float32(speed)
+        self.__x[start:end] = origins_x[:total]
+        self.__y[start:end] = origins_y[:total]
+        self.__dx[start:end] = numpy.cos(directions) * speeds
+        self.__dy[start:end] = -numpy.sin(directions) * speeds
+        self.__age[start:end] = 0
+        self.__lifetime[start:end] = rng.integers(max(lifetime // 2, 1), lifetime + 1, total)
+        self.__kind[start:end] = kind
+        self.__count = end
+        self.__cells = None
+
+    def emit_exhaust(self, centerx, centery, angle):
+        '''Emits a puff of exhaust out of the back of a ship centered at
+        (centerx, centery) and facing angle degrees.'''
+        radians = math.radians(angle)
+        self.emit(centerx - 18 * math.cos(radians), centery + 18 * math.sin(radians), \
+                  THRUST, 24, 5, 14, angle + 180, 0.8)
+
+    def emit_debris(self, centerx, centery, size):
+        '''Emits the debris of an asteroid of a size (1 is the largest) hit at
+        (centerx, centery).'''
+        self.emit(centerx, centery, DEBRIS, 60 // size, 6, 24)
+
+    def emit_trails(self, rockets, enemy=False):
+        '''Emits a short trail behind each of a group of rockets.'''
+        rockets = rockets.sprites()
+        if rockets:
+            self.emit([rocket.rect.centerx for rocket in rockets], \
+                      [rocket.rect.centery for rocket in rockets], \
+                      ENEMY_TRAIL if enemy else TRAIL, 3, 1, 10)
+
+    def update(self):
+        '''Moves and ages every particle, slows them down, and removes the
+        ones that are too old or have left the playfield.'''
+        count = self.__count
+        if not count:
+            return
+        x = self.__x[:count]
+        y = self.__y[:count]
+        dx = self.__dx[:count]
+        dy = self.__dy[:count]
+        age = self.__age[:count]
+        x += dx
+        y += dy
+        dx *= self.__drag
+        dy *= self.__drag
+        age += 1
+
+        alive = (age < self.__lifetime[:count]) & (x >= 0) & (x < self.__width) & \
+                (y >= 0) & (y < self.__height)
+        living = int(numpy.count_nonzero(alive))
+        if living < count:
+            for array in (self.__x, self.__y, self.__dx, self.__dy, self.__age, \
+                          self.__lifetime, self.__kind):
+                array[:living] = array[:count][alive]
+            self.__count = living
+        self.__cells = None
+
+    def reset(self):
+        '''Removes every particle.'''
+        self.__count = 0
+        self.__cells = None
+
+    def __get_cells(self):
+        '''Returns the rects of the cells the particles are in now.'''
+        if self.__cells is None:
+            count = self.__count
+            cells = (self.__y[:count].astype(numpy.intp) // CELL) * self.__columns + \
+                    self.__x[:count].astype(numpy.intp) // CELL
+            columns = self.__columns
+            self.__cells = [pygame.Rect(cell % columns * CELL, cell // columns * CELL, CELL, CELL) \
+                            for cell in numpy.flatnonzero(numpy.bincount(cells)).tolist()]
+        return self.__cells
+
+    def get_rects(self):
+        '''Returns the rects drawn last time and the rects the particles will
+        be drawn in.'''
+        return self.__drawn + self.__get_cells()
+
+    def clear(self, screen, background):
+        '''Draws the background over the cells drawn last time.'''
+        for rect in self.__drawn:
+            screen.blit(background, rect, rect)
+
+    def __get_palette(self, screen):
+        '''Returns the shades of every kind of particle, mapped to the pixel
+        format of the screen.'''
+        pixel_format = (screen.get_bitsize(), screen.get_masks())
+        if self.__palette_format != pixel_format:
+            shades = []
+            for first, last in COLORS:
+                for shade in range(SHADES):
+                    color = [first[part] + (last[part] - first[part]) * shade // (SHADES - 1) \
+                             for part in range(3)]
+                    #map_rgb() is signed when the top byte is alpha.
+                    shades.append(screen.map_rgb(color) & 0xFFFFFFFF)
+            self.__palette = numpy.array(shades, numpy.uint32)
+            self.__palette_format = pixel_format
+        return self.__palette
+
+    def draw(self, screen):
+        '''Plots every particle onto the screen, in a shade that darkens with
+        age, and returns the rects that changed since the last draw.'''
+        count = self.__count
+        cells = self.__get_cells()
+        if count:
+            x = self.__x[:count].astype(numpy.intp)
+            y = self.__y[:count].astype(numpy.intp)
+            shades = self.__kind[:count] * SHADES + \
+                     self.__age[:count] * SHADES // self.__lifetime[:count]
+            colors = self.__get_palette(screen)[shades]
+            if screen.get_bytesize() == 4:
+                pixels = pygame.surfarray.pixels2d(screen)
+                pixels[x, y] = colors
+                del pixels
+            else:
+                #surfarray can only write 32 bit pixels directly.
+                for px, py, color in zip(x.tolist(), y.tolist(), colors.tolist()):
+                    screen.set_at((px, py), screen.unmap_rgb(color))
+        changed = self.__drawn + cells
+        self.__drawn = cells
+        return changed
+
+    def get_stats(self):
+        '''Returns a dict of the number of particles alive and the number not
+        emitted because there was no room.'''
+        return {"live": self.__count, "dropped": self.__dropped}
@@ -0,0 +1,274 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the FrameProfiler class, which times each
+phase of a frame of Asteroids (the event pump, each part of the game logic,
+each collision check, clearing, drawing and updating the display), and counts
+the sprites in each group and the surfaces made during the frame. The last
+few hundred frames are kept, and can be shown in an overlay on top of the
+game or saved as JSON (summaries and histograms) or CSV (one row per frame).
+Every frame is also checked against a frame budget, such as the 16.7 ms of a
+60 Hz display, so a stress run shows how much headroom is left.
+The PhaseTimer class times a sequence of steps that only happens once, like
+starting the game up.
+'''
+import collections, csv, json, time, pygame, asteroidsAssets
+
+#Upper edges, in milliseconds, of the buckets of the histograms.
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, float("inf"))
+
+#Lines of text the overlay has room for.
+ROWS = 24
+
+def percentile(times, fraction):
+    '''Returns the nearest-rank percentile of a sorted list of times.'''
+    index = min(int(fraction * len(times)), len(times) - 1)
+    return times[index]
+
+class PhaseTimer(object):
+    '''Times the steps of something that happens once. Each step ends with a
+    call to lap() with its name, until finish() is called.
+
+    Instance Variables:
+    self.__timer - function returning the current time in seconds
+    self.__start - time the first step started
+    self.__last - time of the last lap
+    self.__phases - list of (name, seconds) of every step, in order
+    self.__finished - bool, True once finish() has been called
+    '''
+    def __init__(self, start=None, timer=time.perf_counter):
+        '''Initializer method for the PhaseTimer. start is when the first step
+        started, by default now.'''
+        self.__timer = timer
+        if start is None:
+            start = timer()
+        self.__start = start
+        self.__last = start
+        self.__phases = []
+        self.__finished = False
+
+    def lap(self, phase):
+        '''Ends a step. Does nothing once finished.'''
+        if not self.__finished:
+            now = self.__timer()
+            self.__phases.append((phase, now - self.__last))
+            self.__last = now
+
+    def finish(self):
+        '''Stops timing, so that later laps are ignored.'''
+        self.__finished = True
+
+    def get_phases(self):
+        '''Gets/Returns the list of (name, seconds) of every step.'''
+        return list(self.__phases)
+
+    def report(self):
+        '''Returns a short text report of how long each step took.'''
+        lines = ["%-16s %8.2f ms" % (phase, seconds * 1000) for phase, seconds in self.__phases]
+        lines.append("%-16s %8.2f ms" % ("total", (self.__last - self.__start) * 1000))
+        return "\n".join(lines)
+
+class FrameProfiler(object):
+    '''Collects the time of each phase of every frame. A frame starts with
+    begin(), each phase ends with a call to lap() with its name (the time
+    since the last lap is added to that phase, so a phase can be lapped more
+    than once a frame), and the frame ends with end().
+
+    Instance Variables:
+    self.__timer - function returning the current time in seconds
+    self.__window - number of frames kept
+    self.__phases - list of phase names, in the order they were first lapped
+    self.__names - list of count names, in the order they were first counted
+    self.__frames - deque of the last window frames, each a (dict of phase to
+                    seconds, dict of count name to value) tuple
+    self.__total - number of frames profiled so far
+    self.__budget - milliseconds a frame should take at most
+    self.__over - number of frames profiled so far that took longer than
+                  the budget
+    self.__current - dict of phase to seconds of the frame being profiled
+    self.__counts - dict of count name to value of the frame being profiled
+    self.__last - time of the last lap
+    self.__allocated - surfaces made before the frame began
+    self.__visible - bool, True while the overlay is shown
+    self.__font - font of the overlay, loaded when it is first shown
+    self.__panel - the overlay as last drawn, or None
+    self.__panel_frame - total at which the panel was last drawn
+    '''
+    def __init__(self, window=300, budget=1000 / 60.0, timer=time.perf_counter):
+        '''Initializer method for the FrameProfiler. budget is in milliseconds.'''
+        self.__timer = timer
+        self.__window = window
+        self.__phases = []
+        self.__names = []
+        self.__frames = collections.deque(maxlen=window)
+        self.__total = 0
+        self.__budget = budget
+        self.__over = 0
+        self.__current = {}
+        self.__counts = {}
+        self.__last = timer()
+        self.__allocated = 0
+        self.__visible = False
+        self.__font = None
+        self.__panel = None
+        self.__panel_frame = None
+
+    def begin(self):
+        '''Starts a frame. Counts carry over from the last frame until they
+        are set again, since frames with no step of game logic set none.'''
+        self.__current = {}
+        self.__counts = dict(self.__counts)
+        self.__allocated = asteroidsAssets.cache.get_allocated()
+        self.__last = self.__timer()
+
+    def lap(self, phase):
+        '''Adds the time since the last lap (or since begin()) to a phase.'''
+        now = self.__timer()
+        current = self.__current
+        if phase in current:
+            current[phase] += now - self.__last
+        else:
+            current[phase] = now - self.__last
+            if phase not in self.__phases:
+                self.__phases.append(phase)
+        self.__last = now
+
+    def count(self, name, value):
+        '''Sets a count, such as the number of sprites in a group, for the frame.'''
+        if name not in self.__names:
+            self.__names.append(name)
+        self.__counts[name] = value
+
+    def end(self):
+        '''Ends the frame, adding the number of surfaces made during it to its
+        counts, and keeps it.'''
+        self.count("surfaces", asteroidsAssets.cache.get_allocated() - self.__allocated)
+        self.__frames.append((self.__current, self.__counts))
+        self.__total += 1
+        if sum(self.__current.values()) * 1000 > self.__budget:
+            self.__over += 1
+
+    def __len__(self):
+        '''Returns the number of frames kept.'''
+        return len(self.__frames)
+
+    def get_summary(self):
+        '''Returns a dict with the number of frames profiled, and for each
+        phase and the whole frame, the mean, p50, p95, p99 and max time in
+        milliseconds over the frames kept and a histogram of how many frames
+        fell in each bucket; the mean and max of each count; and the frame
+        budget, how many frames went over it (of the frames kept and of all
+        of them) and how much of it is left at p95.'''
+        phases = {}
+        for phase in self.__phases + ["frame"]:
+            if phase == "frame":
+                times = sorted(sum(frame.values()) * 1000 for frame, counts in self.__frames)
+            else:
+                times = sorted(frame.get(phase, 0) * 1000 for frame, counts in self.__frames)
+            if not times:
+                continue
+            histogram = collections.OrderedDict((str(edge), 0) for edge in BUCKETS)
+            bucket = 0
+            for value in times:
+                while value > BUCKETS[bucket]:
+                    bucket += 1
+                histogram[str(BUCKETS[bucket])] += 1
+            phases[phase] = {"mean": sum(times) / len(times),
+                             "p50": percentile(times, 0.5),
+                             "p95": percentile(times, 0.95),
+                             "p99": percentile(times, 0.99),
+                             "max": times[-1],
+                             "histogram": histogram}
+        counts = {}
+        for name in self.__names:
+            values = [frame_counts.get(name, 0) for frame, frame_counts in self.__frames]
+            if values:
+                counts[name] = {"mean": sum(values) / float(len(values)), "max": max(values)}
+        budget = {"ms": self.__budget, "over_total": self.__over,
+                  "over": sum(1 for frame, frame_counts in self.__frames \
+                              if sum(frame.values()) * 1000 > self.__budget)}
+        if "frame" in phases:
+            budget["headroom"] = self.__budget - phases["frame"]["p95"]
+        return {"frames": self.__total, "window": len(self.__frames),
+                "phases": phases, "counts": counts, "budget": budget}
+
+    def save_json(self, path):
+        '''Writes the summary of the frames kept to a JSON file.'''
+        with open(path, "w") as output:
+            json.dump(self.get_summary(), output, indent=2)
+
+    def save_csv(self, path):
+        '''Writes the frames kept to a CSV file, one row per frame, with the
+        time of each phase in milliseconds followed by the counts.'''
+        first = self.__total - len(self.__frames)
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(["frame"] + ["%s ms" % phase for phase in self.__phases] + \
+                            ["frame ms"] + self.__names)
+            for number, (frame, counts) in enumerate(self.__frames):
+                writer.writerow([first + number] + \
+                                ["%.4f" % (frame.get(phase, 0) * 1000) for phase in self.__phases] + \
+                                ["%.4f" % (sum(frame.values()) * 1000)] + \
+                                [counts.get(name, 0) for name in self.__names])
+
+    def save(self, path):
+        '''Writes the frames kept to a CSV file if the path ends with .csv,
+        otherwise writes their summary to a JSON file.'''
+        if path.lower().endswith(".csv"):
+            self.save_csv(path)
+        else:
+            self.save_json(path)
+
+    def toggle_overlay(self):
+        '''Shows the overlay if it is hidden, or hides it if it is shown.'''
+        self.__visible = not self.__visible
+        self.__panel = None
+
+    def is_visible(self):
+        '''Returns True while the overlay is shown.'''
+        return self.__visible
+
+    def draw_overlay(self, screen, position=(5, 40), every=15):
+        '''Draws the overlay onto the screen and returns its rect, or None if
+        it is hidden. The panel is only put together again every so many
+        frames, so that showing it costs little. Its size never changes, so
+        it always covers the panel drawn before it.'''
+        if not self.__visible:
+            return None
+        if self.__panel is None or self.__total - self.__panel_frame >= every:
+            self.__panel = self.__render()
+            self.__panel_frame = self.__total
+        return screen.blit(self.__panel, position)
+
+    def __render(self):
+        '''Returns a new panel showing the p50 and p95 time of each phase and
+        the latest counts.'''
+        if self.__font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.__font = pygame.font.Font(None, 18)
+        font = self.__font
+        summary = self.get_summary()
+        lines = ["%-16s %6s %6s" % ("phase (ms)", "p50", "p95")]
+        for phase in self.__phases + ["frame"]:
+            if phase in summary["phases"]:
+                stats = summary["phases"][phase]
+                lines.append("%-16s %6.2f %6.2f" % (phase, stats["p50"], stats["p95"]))
+        budget = summary["budget"]
+        if "headroom" in budget:
+            lines.append("budget %.1f ms: headroom %.2f, over %d of %d" % \
+                         (budget["ms"], budget["headroom"], budget["over"], len(self.__frames)))
+        if self.__frames:
+            counts = self.__frames[-1][1]
+            names = self.__names
+            for first in range(0, len(names), 3):
+                lines.append(", ".join("%s %d" % (name, counts.get(name, 0)) \
+                                       for name in names[first:first + 3]))
+
+        #The overlay's own surfaces are made directly, so they are not counted.
+        height = font.get_linesize()
+        panel = pygame.Surface((300, height * ROWS + 8))
+        panel.fill((0, 0, 0))
+        for row, line in enumerate(lines[:ROWS]):
+            panel.blit(font.render(line, 1, (255, 255, 0)), (4, 4 + row * height))
+        return panel
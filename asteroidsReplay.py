@@ -0,0 +1,175 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Records the actions of a deterministic (seeded) session of
+Asteroids and replays them headless at full speed. A recording is the seed,
+the World options and the action flags of every frame, run-length encoded, so
+an hour of play fits in a few kilobytes. Replaying it plays exactly the same
+games again, which makes it possible to compare frame costs across builds and
+to bisect a slowdown.
+
+Usage: python asteroidsReplay.py FILE [--draw]
+'''
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, json, struct, time, pygame, asteroidsWorld
+
+#First line of every recording file.
+MAGIC = b"pyAsteroids recording 1\n"
+
+#Each run of identical frames is stored as its action flags and its length.
+RUN = struct.Struct("<BH")
+MAX_RUN = 0xFFFF
+
+class Recording(object):
+    '''The input of a recorded session: the seed and World options it was
+    played with, and the actions of every frame. Each game of the session is
+    seeded with the seed plus the number of games played before it.
+
+    Instance Variables:
+    self.__seed - seed of the first game
+    self.__options - dict of keyword arguments for World, apart from the seed
+    self.__runs - list of [actions, frames] runs of identical frames
+    self.__frames - total number of frames recorded
+    self.__result - dict describing how the session ended, see finish()
+    '''
+    def __init__(self, seed=0, options=None):
+        '''Initializer method for the Recording.'''
+        self.__seed = seed
+        self.__options = dict(options or {})
+        self.__runs = []
+        self.__frames = 0
+        self.__result = None
+
+    def get_seed(self):
+        '''Gets/Returns the seed of the first game.'''
+        return self.__seed
+
+    def get_options(self):
+        '''Gets/Returns the World options the session was played with.'''
+        return dict(self.__options)
+
+    def get_result(self):
+        '''Gets/Returns the dict stored by finish(), or None.'''
+        return self.__result
+
+    def __len__(self):
+        '''Returns the number of frames recorded.'''
+        return self.__frames
+
+    def new_world(self, screen, images, game=0, **extra):
+        '''Returns a new World for the given game (counting from 0) of the
+        session. Extra keyword arguments that do not change the game, like
+        interpolate, are passed on to World.'''
+        options = dict(self.__options, **extra)
+        return asteroidsWorld.World(screen, images, seed=self.__seed + game, **options)
+
+    def record(self, actions):
+        '''Adds the action flags of one frame.'''
+        runs = self.__runs
+        if runs and runs[-1][0] == actions and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([actions, 1])
+        self.__frames += 1
+
+    def actions(self):
+        '''Yields the action flags of every frame, in order.'''
+        for actions, frames in self.__runs:
+            for frame in range(frames):
+                yield actions
+
+    def finish(self, world, games):
+        '''Stores how the session ended, so that a replay can check that it
+        ended the same way.'''
+        self.__result = {"games": games,
+                         "frame": world.get_frame(),
+                         "score": world.get_scorekeeper().get_score(),
+                         "lives": world.get_scorekeeper().get_lives()}
+
+    def save(self, path):
+        '''Writes the recording to a file.'''
+        header = {"seed": self.__seed,
+                  "options": self.__options,
+                  "frames": self.__frames,
+                  "result": self.__result}
+        with open(path, "wb") as output:
+            output.write(MAGIC)
+            output.write(json.dumps(header).encode("utf-8") + b"\n")
+            output.write(b"".join(RUN.pack(actions, frames) for actions, frames in self.__runs))
+
+    @classmethod
+    def load(cls, path):
+        '''Reads a recording from a file and returns it.'''
+        with open(path, "rb") as source:
+            if source.readline() != MAGIC:
+                raise ValueError("%s is not a pyAsteroids recording" % path)
+            header = json.loads(source.readline().decode("utf-8"))
+            data = source.read()
+
+        recording = cls(header["seed"], header["options"])
+        recording.__runs = [list(run) for run in RUN.iter_unpack(data)]
+        recording.__frames = sum(frames for actions, frames in recording.__runs)
+        recording.__result = header["result"]
+        if recording.__frames != header["frames"]:
+            raise ValueError("%s is truncated" % path)
+        return recording
+
+def replay(screen, recording, draw=False):
+    '''Plays a recording back as fast as possible, starting a new game
+    whenever the ship runs out of lives, the same way it was recorded.
+    Drawing onto the off-screen surface is skipped unless draw is True.
+    Returns a dict with the number of frames and games, the score and lives
+    at the end, the elapsed seconds, the frames per second and whether the
+    session ended the same way it did when it was recorded.'''
+    images = asteroidsWorld.load_images()
+    games = 1
+    world = recording.new_world(screen, images)
+
+    start = time.perf_counter()
+    for actions in recording.actions():
+        world.step(actions)
+        if draw:
+            world.draw(screen)
+        if world.is_over():
+            world = recording.new_world(screen, images, games)
+            games += 1
+    elapsed = time.perf_counter() - start
+
+    result = {"games": games,
+              "frame": world.get_frame(),
+              "score": world.get_scorekeeper().get_score(),
+              "lives": world.get_scorekeeper().get_lives()}
+    expected = recording.get_result()
+    result.update(frames=len(recording),
+                  seconds=elapsed,
+                  fps=len(recording) / elapsed if elapsed else float("inf"),
+                  matched=None if expected is None else expected == dict(
+                      (key, result[key]) for key in expected))
+    return result
+
+def main():
+    '''Parses the command line, replays the recording and prints the results.'''
+    parser = argparse.ArgumentParser(description="Replay a recorded Asteroids session headless.")
+    parser.add_argument("file", help="recording to replay")
+    parser.add_argument("--draw", action="store_true", help="also draw every frame off-screen")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.file)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((640, 480))
+    result = replay(screen, recording, args.draw)
+    pygame.quit()
+
+    print("%(frames)d frames, %(games)d games in %(seconds).2f s: %(fps).0f frames/s" % result)
+    print("ended at frame %(frame)d with score %(score)d and %(lives)d lives" % result)
+    if result["matched"] is not None:
+        print("matches the recording" if result["matched"] else "DOES NOT match the recording")
+        if not result["matched"]:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the Scene class, a persistent registry of
+every sprite in a game. Sprites are added once to a fixed draw layer and any
+number of tags, and are removed again simply by calling their kill() method,
+so no groups need to be rebuilt when something spawns. Sprites on the HUD
+layer are only redrawn when they say they have changed. Every other sprite is
+drawn from one flat render list handed to a single Surface.blits() call, so
+drawing hundreds of sprites costs one call from Python rather than hundreds.
+'''
+import pygame
+
+#Draw layers, from back to front.
+POWERUP_LAYER = 0
+ASTEROID_LAYER = 1
+SHIELD_LAYER = 2
+SHIP_LAYER = 3
+UFO_LAYER = 4
+ROCKET_LAYER = 5
+ENEMY_ROCKET_LAYER = 6
+HUD_LAYER = 7
+LAYERS = 8
+
+class DirtyUpdates(pygame.sprite.RenderUpdates):
+    '''A RenderUpdates group for sprites that rarely change, like the HUD. A
+    sprite is only cleared and redrawn when its dirty attribute is set, or
+    when a sprite beneath it moves.
+
+    Instance Variables:
+    self.__redraw - set of the sprites to draw on the next call to draw()
+    '''
+    def __init__(self, *sprites):
+        '''Initializer method for the DirtyUpdates group.'''
+        pygame.sprite.RenderUpdates.__init__(self, *sprites)
+        self.__redraw = set()
+
+    def clear(self, surface, background, below=()):
+        '''Draws the background over the sprites that have changed or that
+        overlap any of the rects in below (where the sprites beneath were and
+        are now), and over the ones that have been removed. Only these are
+        drawn by the next draw().'''
+        for rect in self.lostsprites:
+            surface.blit(background, rect, rect)
+        self.__redraw = set()
+        for sprite, rect in self.spritedict.items():
+            if not rect or getattr(sprite, "dirty", 1) or rect.collidelist(below) != -1:
+                self.__redraw.add(sprite)
+                if rect:
+                    surface.blit(background, rect, rect)
+
+    def draw(self, surface, everything=False):
+        '''Draws the sprites picked by the last clear(), or every sprite if
+        everything is True, and returns the rects that changed. A sprite that
+        is only redrawn because of what moved beneath it adds no rect of its
+        own, since the rects of what moved are already in the list. The dirty
+        attribute of every sprite drawn is cleared.'''
+        dirty = []
+        for sprite in self.sprites():
+            if everything or sprite in self.__redraw:
+                old = self.spritedict[sprite]
+                new = surface.blit(sprite.image, sprite.rect)
+                if getattr(sprite, "dirty", 1) or not old or old != new:
+                    if old and new.colliderect(old):
+                        dirty.append(new.union(old))
+                    else:
+                        dirty.append(new)
+                        if old:
+                            dirty.append(old)
+                self.spritedict[sprite] = new
+                if hasattr(sprite, "dirty"):
+                    sprite.dirty = 0
+        dirty.extend(self.lostsprites)
+        self.lostsprites = []
+        self.__redraw = set()
+        return dirty
+
+class Scene(object):
+    '''Holds the sprites of a game in fixed draw layers, and in groups by tag
+    for collision checks. Adding and removing a sprite only touches the groups
+    it belongs to.
+
+    Instance Variables:
+    self.__layers - list of RenderUpdates groups, one per draw layer (the HUD
+                    layer is a DirtyUpdates group)
+    self.__tags - dict of tag name to the Group of sprites with that tag
+    '''
+    def __init__(self):
+        '''Initializer method for the Scene.'''
+        self.__layers = [pygame.sprite.RenderUpdates() for layer in range(LAYERS - 1)]
+        self.__layers.append(DirtyUpdates())
+        self.__tags = {}
+
+    def add(self, sprite, layer, *tags):
+        '''Adds a sprite to a draw layer and to the groups of the given tags.'''
+        self.__layers[layer].add(sprite)
+        for tag in tags:
+            self.group(tag).add(sprite)
+
+    def group(self, tag):
+        '''Gets/Returns the Group of sprites with the given tag. The group stays
+        the same for the life of the scene, so it can be kept and reused.'''
+        if tag not in self.__tags:
+            self.__tags[tag] = pygame.sprite.Group()
+        return self.__tags[tag]
+
+    def layer(self, number):
+        '''Gets/Returns the group of sprites on a draw layer.'''
+        return self.__layers[number]
+
+    def kill(self, tag):
+        '''Removes every sprite with the given tag from the scene.'''
+        for sprite in self.group(tag).sprites():
+            sprite.kill()
+
+    def __len__(self):
+        '''Returns the number of sprites in the scene.'''
+        return sum(len(layer) for layer in self.__layers)
+
+    def update(self, skip=()):
+        '''Updates every sprite, from the back layer to the front, except for
+        the sprites in the layers listed in skip.'''
+        for number, layer in enumerate(self.__layers):
+            if number not in skip:
+                layer.update()
+
+    def clear(self, screen, background, below=()):
+        '''Draws the background over every sprite drawn last frame, including
+        the ones that have been removed since. HUD sprites are left alone
+        unless they changed or something beneath them moved, or they overlap
+        one of the rects in below (used for things drawn outside the scene).'''
+        below = list(below)
+        for layer in self.__layers[:HUD_LAYER]:
+            below.extend(rect for rect in layer.spritedict.values() if rect)
+            below.extend(sprite.rect for sprite in layer)
+            below.extend(layer.lostsprites)
+            layer.clear(screen, background)
+        self.__layers[HUD_LAYER].clear(screen, background, below)
+
+    def draw(self, screen, everything=False, dirty=True):
+        '''Draws every sprite, from the back layer to the front, and returns
+        the list of rects that changed since the last draw. Unchanged HUD
+        sprites are skipped unless everything is True. If dirty is False the
+        whole screen is being redrawn every frame, so nothing is kept for
+        clear() and an empty list is returned.'''
+        layers = self.__layers[:HUD_LAYER]
+        sprites = [sprite for layer in layers for sprite in layer.spritedict]
+        render = [(sprite.image, sprite.rect) for sprite in sprites]
+        if not dirty:
+            screen.blits(render, False)
+            for layer in layers:
+                layer.lostsprites = []
+            self.__layers[HUD_LAYER].draw(screen, True)
+            return []
+
+        #Each layer remembers where its sprites were drawn, to clear them
+        #next frame. Where they were, where they are and where the removed
+        #ones were all changed.
+        drawn = screen.blits(render)
+        rects = []
+        first = 0
+        for layer in layers:
+            spritedict = layer.spritedict
+            last = first + len(spritedict)
+            rects.extend(rect for rect in spritedict.values() if rect)
+            rects.extend(layer.lostsprites)
+            layer.lostsprites = []
+            spritedict.update(zip(sprites[first:last], drawn[first:last]))
+            first = last
+        rects.extend(drawn)
+        rects.extend(self.__layers[HUD_LAYER].draw(screen, everything))
+        return rects
@@ -0,0 +1,131 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the SoundManager class, which plays the
+sound effects and music of Asteroids. Sounds are decoded once, looping sounds
+get a mixer channel of their own and are only started or stopped when they
+are not already, and the other sounds share a pool of channels. When the pool
+is full, a new sound takes the channel of a less important one, and a sound
+asked for again too soon after it last started is skipped, so that a frame
+full of explosions does not flood the mixer.
+'''
+import pygame, asteroidsAssets
+
+class SoundManager(object):
+    '''Plays named sounds on a fixed set of mixer channels.
+
+    Instance Variables:
+    self.__timer - function returning the current time in milliseconds
+    self.__sounds - dict of name to (Sound, priority, min_interval)
+    self.__loops - dict of loop name to its reserved Channel
+    self.__looping - set of the names of the loops that are playing
+    self.__pool - list of the Channels shared by the other sounds
+    self.__playing - dict of pool Channel to (name, priority, start time) of
+                     the sound last started on it
+    self.__last - dict of name to the time the sound last started
+    self.__music - path of the music loaded into the mixer, or None
+    self.__stats - dict of counts of sounds played, stolen, dropped and
+                   skipped by the rate limit
+    '''
+    def __init__(self, channels=8, loops=(), timer=pygame.time.get_ticks):
+        '''Initializer method for the SoundManager. The mixer must already be
+        initialized. One of the channels is reserved for each loop name, and
+        the rest are pooled.'''
+        self.__timer = timer
+        self.__sounds = {}
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(len(loops))
+        self.__loops = dict((name, pygame.mixer.Channel(number)) for number, name in enumerate(loops))
+        self.__looping = set()
+        self.__pool = [pygame.mixer.Channel(number) for number in range(len(loops), channels)]
+        self.__playing = {}
+        self.__last = {}
+        self.__music = None
+        self.__stats = {"played": 0, "stolen": 0, "dropped": 0, "limited": 0}
+
+    def load(self, name, path, volume=1.0, priority=0, min_interval=0):
+        '''Loads a sound from the asset cache, so it is only ever decoded once,
+        under a name. A sound with a higher priority may take the channel of
+        one with a lower priority. A sound is not started again until
+        min_interval milliseconds after it last started.'''
+        sound = asteroidsAssets.load_sound(path)
+        sound.set_volume(volume)
+        self.__sounds[name] = (sound, priority, min_interval)
+
+    def play(self, name):
+        '''Plays a sound once on a pooled channel. Returns True if it started,
+        or False if it was asked for too soon after it last started, or if
+        every channel is busy with a sound at least as important.'''
+        sound, priority, min_interval = self.__sounds[name]
+        now = self.__timer()
+        if name in self.__last and now - self.__last[name] < min_interval:
+            self.__stats["limited"] += 1
+            return False
+
+        channel = self.__find_channel(priority)
+        if channel is None:
+            self.__stats["dropped"] += 1
+            return False
+        channel.play(sound)
+        self.__playing[channel] = (name, priority, now)
+        self.__last[name] = now
+        self.__stats["played"] += 1
+        return True
+
+    def __find_channel(self, priority):
+        '''Returns a free pooled channel, or else the busy one playing the
+        oldest of the least important sounds if it is less important than
+        priority, or else None.'''
+        victim = None
+        for channel in self.__pool:
+            if not channel.get_busy():
+                return channel
+            playing = self.__playing.get(channel)
+            if playing and (victim is None or playing[1:] < self.__playing[victim][1:]):
+                victim = channel
+        if victim is not None and self.__playing[victim][1] < priority:
+            self.__stats["stolen"] += 1
+            victim.stop()
+            return victim
+        return None
+
+    def loop(self, name):
+        '''Starts a looping sound on its reserved channel, unless it is
+        already playing.'''
+        if name not in self.__looping:
+            self.__loops[name].play(self.__sounds[name][0], -1)
+            self.__looping.add(name)
+
+    def stop(self, name):
+        '''Stops a looping sound if it is playing, or every pooled channel
+        playing a sound of that name.'''
+        if name in self.__loops:
+            if name in self.__looping:
+                self.__loops[name].stop()
+                self.__looping.discard(name)
+            return
+        for channel, playing in self.__playing.items():
+            if playing[0] == name and channel.get_busy():
+                channel.stop()
+
+    def stop_all(self):
+        '''Stops every sound (but not the music).'''
+        for name in list(self.__looping):
+            self.stop(name)
+        for channel in self.__pool:
+            channel.stop()
+
+    def play_music(self, path, volume=1.0):
+        '''Plays music on a loop from the start. The file is only loaded into
+        the mixer again if it is not the music that was loaded last.'''
+        if path != self.__music:
+            pygame.mixer.music.load(path)
+            self.__music = path
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(-1)
+
+    def get_stats(self):
+        '''Returns a dict of the number of sounds played, stolen from a less
+        important sound, dropped because every channel was busy, and limited
+        because they were asked for too soon.'''
+        return dict(self.__stats)
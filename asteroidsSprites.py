@@ -2,9 +2,10 @@
 By: Deon Hua
 Date: 16 May 2013
 Description: This module contains the Spaceship, Asteroid, ScoreKeeper, Rocket, 
-UFO, Powerup, and Shield sprites for Asteroids.
+UFO, Powerup, and Shield sprites for Asteroids, and the RocketPool that recycles
+rockets.
 '''
-import pygame, random
+import pygame, random, asteroidsAssets
 
 class Spaceship(pygame.sprite.Sprite):
     '''Creates the spaceship that will be controlled by the user.
@@ -13,34 +14,35 @@ class Spaceship(pygame.sprite.Sprite):
     self.__screen - screen, used when the player goes off the screen
     self.__speed - speed of the spaceship, varies based on acceleration
     self.__angle - angle of the spaceship (direction it's facing)
+    self.__images - dict of angle to the image facing that angle
     '''
     def __init__(self, screen):
         '''Initializer method for the Spaceship sprite.'''
         pygame.sprite.Sprite.__init__(self)        
         
-        #Image attribute
-        self.image = pygame.image.load("spaceships.png")
+        #Image attribute, picked from images rotated once at load time.
+        self.__images = asteroidsAssets.load_rotations("spaceships.png", 90)
+        self.image = self.__images[90]
         
         #Set other attributes
         self.__screen = screen
         self.__speed = 0
         self.__angle = 90
         
-        #Set the rect attribute
+        #Set the rect attribute, in the middle of the screen
         self.rect = self.image.get_rect()
-        self.rect.centerx = 320
-        self.rect.centery = 240     
+        self.rect.center = self.__screen.get_rect().center
         
         
     def rotate_left(self):
         '''Rotates the spaceship counter-clockwise.'''        
-        self.image = pygame.transform.rotate(self.image, 90)
-        self.__angle += 90
+        self.__angle = (self.__angle + 90) % 360
+        self.image = self.__images[self.__angle]
         
     def rotate_right(self):
         '''Rotates the spaceship clockwise.'''
-        self.image = pygame.transform.rotate(self.image, -90)
-        self.__angle -= 90
+        self.__angle = (self.__angle - 90) % 360
+        self.image = self.__images[self.__angle]
 
     def move_forwards(self):
         '''Moves the spaceship in the direction it is facing. The max speed is 5
@@ -51,30 +53,34 @@ class Spaceship(pygame.sprite.Sprite):
     def get_angle(self):
         '''Returns the direction the spaceship is facing.'''        
         return self.__angle
+
+    def get_speed(self):
+        '''Returns the speed of the spaceship.'''
+        return self.__speed
+
+    def set_state(self, centerx, centery, angle, speed):
+        '''Puts the spaceship at a location, facing an angle and flying at a
+        speed, for example to match a ship that is simulated elsewhere.'''
+        self.__angle = angle
+        self.image = self.__images[angle]
+        self.rect = self.image.get_rect()
+        self.rect.center = (centerx, centery)
+        self.__speed = speed
            
     def reset(self):
         '''Resets the spaceship.'''
         #Ensures that the spaceship is always facing upwards when it resets.
-        while self.__angle != 90:
-            if self.__angle == -90:
-                self.__angle = 270 
-            self.rotate_right()            
+        self.__angle = 90
+        self.image = self.__images[self.__angle]
         
-        #Set the rect attribute
+        #Set the rect attribute, in the middle of the screen
         self.rect = self.image.get_rect()
-        self.rect.centerx = 320
-        self.rect.centery = 240
+        self.rect.center = self.__screen.get_rect().center
 
         self.__speed = 0
         
     def update(self):
         '''Updates location of the spaceship if it leaves the screen.'''
-        #Ensures that angles stay between 0 & 360
-        if self.__angle == -90:
-            self.__angle = 270
-        elif self.__angle == 450:
-            self.__angle = 90
-        
         #Flies in a certain direction given the shooter's angle.
         if self.__angle == 90:
             self.rect.centery -= self.__speed
@@ -82,7 +88,7 @@ class Spaceship(pygame.sprite.Sprite):
             self.rect.centerx -= self.__speed
         elif self.__angle == 270:
             self.rect.centery += self.__speed
-        elif (self.__angle == 0) or (self.__angle == 360):
+        elif self.__angle == 0:
             self.rect.centerx += self.__speed
         
         #If the spaceship goes off one side of the screen, it comes back in the other.
@@ -109,46 +115,91 @@ class Asteroid(pygame.sprite.Sprite):
     Instance Variables:
     self.__screen - screen, used for going off the screen.
     self.__moving - bool, used to check if the asteroid is moving or not.
-    self.__size - size, a larger number is a smaller asteroid.'''
-    def __init__(self, screen, image):
-        '''Initializer method for the Asteroid sprite.'''
+    self.__size - size, a larger number is a smaller asteroid.
+    self.__images - list of the image for each size, largest first
+    self.__store - EntityStore that moves the asteroid, or None
+    self.__slot - the asteroid's slot in the store
+    self.__random - random number generator for the position and movement'''
+    def __init__(self, screen, images, store=None, rng=None, size=1, center=None):
+        '''Initializer method for the Asteroid sprite. images is a list of the
+        asteroid image scaled to each of the three sizes. If an EntityStore is
+        given, the store moves the asteroid instead of update(). rng is a
+        random.Random to draw from, the random module by default. If a center
+        is given, the asteroid starts there instead of off the screen.'''
         pygame.sprite.Sprite.__init__(self)
         
         #Set other attributes
         self.__screen = screen
         self.__moving = False
-        self.__size = 1
+        self.__size = size
+        self.__store = store
+        self.__slot = None
+        self.__random = rng or random
         
         #Image Attributes
-        self.image = image        
+        self.__images = images
+        self.image = images[size - 1]
         self.reset()
-        
-    def collided(self):
-        '''Makes the asteroid smaller if it was hit with a rocket.'''
+        if center is not None:
+            self.rect.center = center
+            self.__moved()
+        
+    def collided(self, fragments=1):
+        '''Makes the asteroid smaller if it was hit with a rocket. If fragments
+        is more than 1, it splits: fragments - 1 new asteroids of the same
+        smaller size fly off from where it was. Returns the list of the new
+        asteroids, for the caller to add to its groups.'''
         if self.__size == 3:
             self.kill()
+            return []
+        
+        pieces = [Asteroid(self.__screen, self.__images, self.__store, self.__random, \
+                           self.__size + 1, self.rect.center) for piece in range(fragments - 1)]
                  
         self.__size += 1
         #Set image attribute
-        self.image = pygame.transform.scale(self.image, (69-10*self.__size, 65 - 10* self.__size))
+        self.image = self.__images[self.__size - 1]
         
-        #Set rect attribute
+        #Set rect attribute, ensuring the smaller asteroid is spawned at the
+        #point of the larger one
+        center = self.rect.center
         self.rect = self.image.get_rect()
-        
-        #Ensures the smaller asteroid is spawned at the point of the larger one
-        self.rect.centerx = self.__old_centerx
-        self.rect.centery = self.__old_centery
+        self.rect.center = center
         
         self.check_movement()
+        self.__moved()
+        return pieces
         
     def reset(self):
         '''Resets the asteroid off the screen at a random x coordinate.'''
         #Set the rect attribute
         self.rect = self.image.get_rect()        
-        self.rect.left = random.randint(0,640)
-        self.rect.top = 500
+        self.rect.left = self.__random.randint(0, self.__screen.get_width())
+        self.rect.top = self.__screen.get_height() + 20
         
         self.check_movement()
+        self.__moved()
+        
+    def __moved(self):
+        '''Tells the entity store, if there is one, where the asteroid now is,
+        how it moves and how big it is.'''
+        if self.__store is None:
+            return
+        if self.__slot is None:
+            self.__slot = self.__store.add(self, self.rect.centerx, self.rect.centery, \
+                                           self.__dx, self.__dy, self.__size, \
+                                           kind=self.__store.ASTEROID)
+        else:
+            self.__store.set_position(self.__slot, self.rect.centerx, self.rect.centery)
+            self.__store.set_velocity(self.__slot, self.__dx, self.__dy)
+            self.__store.set_size(self.__slot, self.__size)
+            
+    def kill(self):
+        '''Removes the asteroid from all of its groups and from the store.'''
+        pygame.sprite.Sprite.kill(self)
+        if self.__slot is not None:
+            self.__store.remove(self.__slot)
+            self.__slot = None
         
     def get_size(self):
         '''Gets/Returns the size of the asteroid.'''
@@ -159,14 +210,18 @@ class Asteroid(pygame.sprite.Sprite):
         self.__moving = False
         
         while not self.__moving:
-            self.__dx = random.randint(-self.__size*2, self.__size*2)
-            self.__dy = random.randint(-self.__size*2, self.__size*2)
+            self.__dx = self.__random.randint(-self.__size*2, self.__size*2)
+            self.__dy = self.__random.randint(-self.__size*2, self.__size*2)
             if self.__dx and self.__dy:
                 self.__moving = True
         
         
     def update(self):
-        '''Updates the position of the asteroid on the screen.'''
+        '''Updates the position of the asteroid on the screen, unless an
+        entity store moves it.'''
+        if self.__slot is not None:
+            return
+        
         self.rect.centerx += self.__dx
         self.rect.centery += self.__dy
         
@@ -179,9 +234,6 @@ class Asteroid(pygame.sprite.Sprite):
             self.rect.centery = self.__screen.get_height()
         if self.rect.centery > self.__screen.get_height():
             self.rect.centery = 0
-            
-        self.__old_centerx = self.rect.centerx
-        self.__old_centery = self.rect.centery
         
         
 class ScoreKeeper(pygame.sprite.Sprite):
@@ -193,29 +245,39 @@ class ScoreKeeper(pygame.sprite.Sprite):
     self.__score - player's score
     self.__shields - current shield level
     self.__max_capacity - max shield level
+    self.__shown - the score, lives and shields as last shown on screen
+    self.__texts - the rendered text of each of those fields
+    self.dirty - 1 if the image changed since the HUD was last drawn, otherwise 0
     '''
-    def __init__(self):
-        '''Initializer method for the ScoreKeeper sprite.'''
+    
+    #The fields of the status line, and the space between them.
+    FIELDS = ("Score: %d", "Lives: %d", "Shields: %d")
+    GAP = "   "
+    
+    def __init__(self, width=640):
+        '''Initializer method for the ScoreKeeper sprite. The status line is
+        centered across a screen of the given width.'''
         pygame.sprite.Sprite.__init__(self)
         
-        #Image Attributes
-        self.image = pygame.Surface((34,10))
-        self.image = self.image.convert()
-        self.image.fill((255,255,0))
+        # Load font
+        self.__font = asteroidsAssets.load_font("good times rg.ttf", 25)
+        
+        #Image Attributes. The image is always the same size, so that its rect
+        #never moves and only changes when a shown value does.
+        self.image = asteroidsAssets.new_surface((width, self.__font.get_height()), pygame.SRCALPHA)
         
         #Set the rect attribute
         self.rect = self.image.get_rect()
-        self.rect.left = random.randint(0,640)
-        self.rect.top = random.randint(0,480)
-        
-        # Load font
-        self.__font = pygame.font.Font("good times rg.ttf", 25)
+        self.rect.center = (width // 2 - 10, 15)
         
         #Initialize other attributes
         self.__life = 3
         self.__score = 0
         self.__shields = 100
         self.__max_capacity = 100
+        self.__shown = [None, None, None]
+        self.__texts = [None, None, None]
+        self.update()
         
     def add_life(self):
         '''If the player hits a +life powerup, this method adds a life to the 
@@ -241,6 +303,10 @@ class ScoreKeeper(pygame.sprite.Sprite):
         if self.__shields < self.__max_capacity:
             self.__shields += 0.25
             
+    def refill_shield(self):
+        '''Fills the shield back up to its maximum capacity.'''
+        self.__shields = self.__max_capacity
+        
     def add_capacity(self):
         '''Adds 10 to the maximum capacity of the shields when the appropriate
         powerup is activated.'''
@@ -259,14 +325,31 @@ class ScoreKeeper(pygame.sprite.Sprite):
         return self.__score
     
     def update(self):
-        '''Updates all the status indicators on screen.'''
-        
-        message = "Score: %d   Lives: %d   Shields: %d" %\
-                (self.__score, self.__life, self.__shields)
-        self.image = self.__font.render(message, 1, (255, 255, 255))
-
-        self.rect = self.image.get_rect()
-        self.rect.center = (310, 15)
+        '''Updates all the status indicators on screen. Only the fields whose
+        shown value changed are rendered again (the shields change by 0.25 a
+        frame, but are shown as a whole number), and the image is only put
+        back together if one of them did. dirty is left set until the HUD is
+        drawn, since the world may step more than once between draws.'''
+        values = (self.__score, self.__life, int(self.__shields))
+        changed = False
+        for field in range(len(values)):
+            if values[field] != self.__shown[field]:
+                self.__shown[field] = values[field]
+                self.__texts[field] = asteroidsAssets.render_text(self.__font, \
+                                                                  ScoreKeeper.FIELDS[field] % \
+                                                                  values[field], (255, 255, 255))
+                changed = True
+        
+        if changed:
+            self.dirty = 1
+            #Lay the fields out side by side, centered in the image.
+            gap = self.__font.size(ScoreKeeper.GAP)[0]
+            width = sum(text.get_width() for text in self.__texts) + gap * (len(self.__texts) - 1)
+            x = (self.image.get_width() - width) // 2
+            self.image.fill((0, 0, 0, 0))
+            for text in self.__texts:
+                self.image.blit(text, (x, 0))
+                x += text.get_width() + gap
      
                 
     
@@ -278,41 +361,81 @@ class Rocket(pygame.sprite.Sprite):
     self.__angle - direction of travel
     self.__distance - distance the rocket has travelled
     self.__speed - speed of the rocket
-    self.__screen - screen, used for going off the screen.'''
-    def __init__(self, direction, centerx, centery, screen, friendly):
-        '''Initializer method for the Rocket sprite.'''
+    self.__screen - screen, used for going off the screen.
+    self.__store - EntityStore that moves the rocket, or None
+    self.__slot - the rocket's slot in the store
+    self.__pool - RocketPool the rocket goes back to when killed, or None'''
+    
+    #The beam images, drawn once and shared by every rocket.
+    __beams = {}
+    
+    def __init__(self, direction, centerx, centery, screen, friendly, store=None, pool=None):
+        '''Initializer method for the Rocket sprite. If an EntityStore is
+        given, the store moves and expires the rocket instead of update().'''
         pygame.sprite.Sprite.__init__(self)
         
-        self.__angle = direction
-        self.__distance = 0
         self.__speed = 8
         self.__screen = screen
+        self.__store = store
+        self.__slot = None
+        self.__pool = pool
+        self.launch(direction, centerx, centery, friendly)
+        
+    def launch(self, direction, centerx, centery, friendly):
+        '''Sends the rocket off from a location in a direction. Called when the
+        rocket is made, and again each time a RocketPool reuses it.'''
+        self.__angle = direction
+        self.__distance = 0
         
         #Image Attributes
-
-        self.image = pygame.Surface((10, 10))
-        self.image.fill((0, 0, 0))
-        self.image.set_colorkey((0,0,0))
-        #The Rocket(Beam) will be green if friendly, red if enemy.
-        if friendly:
-            pygame.draw.circle(self.image, (0, 255, 0), (5, 5), 5, 0)
-        else:
-            pygame.draw.circle(self.image, (255, 0, 0), (5, 5), 5, 0)
-            
+        if friendly not in Rocket.__beams:
+            beam = asteroidsAssets.new_surface((10, 10))
+            beam.fill((0, 0, 0))
+            beam.set_colorkey((0,0,0))
+            #The Rocket(Beam) will be green if friendly, red if enemy.
+            if friendly:
+                pygame.draw.circle(beam, (0, 255, 0), (5, 5), 5, 0)
+            else:
+                pygame.draw.circle(beam, (255, 0, 0), (5, 5), 5, 0)
+            Rocket.__beams[friendly] = beam
+        self.image = Rocket.__beams[friendly]
         
         #Set the rect attribute
         self.rect = self.image.get_rect()
         self.rect.centerx = centerx
         self.rect.centery = centery
         
+        #The store wraps the rocket around before moving it, like update().
+        store = self.__store
+        if store is not None:
+            dx, dy = {90: (0, -1), 180: (-1, 0), 270: (0, 1), 0: (1, 0)}.get(direction % 360, (0, 0))
+            kind = store.ROCKET if friendly else store.ENEMY_ROCKET
+            self.__slot = store.add(self, centerx, centery, dx*self.__speed, dy*self.__speed, \
+                                    lifetime=50, wrap_first=True, kind=kind)
+        
     def reset(self):
         '''If told to reset, this sprite will kill itself, so that there are no
         rockets remaining on screen when the player resets.'''
         self.kill()
+        
+    def kill(self):
+        '''Removes the rocket from all of its groups and from the store, and
+        gives it back to its pool.'''
+        alive = self.alive()
+        pygame.sprite.Sprite.kill(self)
+        if self.__slot is not None:
+            self.__store.remove(self.__slot)
+            self.__slot = None
+        if alive and self.__pool is not None:
+            self.__pool.release(self)
     
     
     def update(self):
-        '''Updates the position of the rocket on the screen.'''
+        '''Updates the position of the rocket on the screen, unless an entity
+        store moves it.'''
+        if self.__slot is not None:
+            return
+        
         #Kills itself after travelling a certain distance.
         if self.__distance > 50:
             self.kill()
@@ -349,6 +472,62 @@ class Rocket(pygame.sprite.Sprite):
 
             
         
+class RocketPool(object):
+    '''Recycles killed rockets, so that firing doesn't make a new sprite (and
+    garbage) for every shot.
+
+    Instance Variables:
+    self.__screen - screen, passed on to new rockets
+    self.__store - EntityStore passed on to new rockets, or None
+    self.__capacity - most rockets kept waiting for reuse
+    self.__free - list of killed rockets waiting for reuse
+    self.__hits - number of launches that reused a rocket
+    self.__misses - number of launches that had to make a new rocket
+    self.__live - number of rockets from the pool in flight
+    self.__peak - largest number of rockets from the pool in flight at once
+    '''
+    def __init__(self, screen, capacity=64, store=None):
+        '''Initializer method for the RocketPool.'''
+        self.__screen = screen
+        self.__store = store
+        self.__capacity = capacity
+        self.__free = []
+        self.__hits = 0
+        self.__misses = 0
+        self.__live = 0
+        self.__peak = 0
+
+    def launch(self, direction, centerx, centery, friendly):
+        '''Returns a rocket flying from a location in a direction, reusing a
+        killed one if there is one.'''
+        if self.__free:
+            rocket = self.__free.pop()
+            rocket.launch(direction, centerx, centery, friendly)
+            self.__hits += 1
+        else:
+            rocket = Rocket(direction, centerx, centery, self.__screen, friendly, \
+                            self.__store, self)
+            self.__misses += 1
+        
+        self.__live += 1
+        if self.__live > self.__peak:
+            self.__peak = self.__live
+        return rocket
+
+    def release(self, rocket):
+        '''Takes back a killed rocket. Rockets beyond the pool's capacity are
+        left for the garbage collector.'''
+        self.__live -= 1
+        if len(self.__free) < self.__capacity:
+            self.__free.append(rocket)
+
+    def get_stats(self):
+        '''Returns a dict of the pool's hits, misses, peak and live rockets,
+        and the number of rockets waiting for reuse.'''
+        return {"hits": self.__hits, "misses": self.__misses, "peak": self.__peak, \
+                "live": self.__live, "free": len(self.__free)}
+
+
 class Powerup(pygame.sprite.Sprite):
     '''Creates a powerup of a random type.  Powerups that will randomly appear 
     on the playing field, giving the player a boost. This class does not
@@ -393,16 +572,19 @@ class UFO(pygame.sprite.Sprite):
     self.__player_centery - rect.centery of the player
     self.__dx - change in x direction per update cycle
     self.__dy - change in y direction per update cycle
+    self.__random - random number generator for the position and movement
     ''' 
     
-    def __init__(self, screen, image):
-        '''Initializer method for the UFO sprite.'''
+    def __init__(self, screen, image, rng=None):
+        '''Initializer method for the UFO sprite. rng is a random.Random to
+        draw from, the random module by default.'''
         pygame.sprite.Sprite.__init__(self)
         
         #Image Attributes
         self.image = image
         
         self.__screen = screen
+        self.__random = rng or random
         self.__moving = False
         self.reset()                 
         
@@ -423,7 +605,7 @@ class UFO(pygame.sprite.Sprite):
         '''Resets the UFO off the screen at a random x coordinate.'''
         #Set the rect attribute
         self.rect = self.image.get_rect()
-        self.rect.centerx = random.randint(0,640)
+        self.rect.centerx = self.__random.randint(0, self.__screen.get_width())
         self.rect.centery = 20
         
         self.check_movement()
@@ -433,8 +615,8 @@ class UFO(pygame.sprite.Sprite):
         to generate values until it does.'''
         self.__moving = False
         while not self.__moving:
-            self.__dx = random.randint(-5,5)
-            self.__dy = random.randint(-5,5)
+            self.__dx = self.__random.randint(-5,5)
+            self.__dy = self.__random.randint(-5,5)
             if self.__dx and self.__dy:
                 self.__moving = True
     
@@ -458,18 +640,29 @@ class Shield(pygame.sprite.Sprite):
     '''The Shield sprite, which forms a protective "bubble" around the player.
     
     Instance Variable:
-    self.__capacity - remaining capacity of the shields'''
+    self.__capacity - remaining capacity of the shields
+    self.mask - collision mask of the whole bubble, shared by every Shield'''
+    
+    __bubble_mask = None
     
     def __init__(self, centerx, centery, capacity):
         '''Initializer method for the Shield sprite.'''
         pygame.sprite.Sprite.__init__(self)
         
         #Image Attributes
-        self.image = pygame.Surface((60, 60))
+        self.image = asteroidsAssets.new_surface((60, 60))
         self.image.fill((0, 0, 0))
         self.image.set_colorkey((0,0,0))
         pygame.draw.circle(self.image, (0, 191, 225), (30, 30), 30, 2)
         
+        #Anything inside the bubble hits it, not only its outline.
+        if Shield.__bubble_mask is None:
+            bubble = asteroidsAssets.new_surface((60, 60))
+            bubble.set_colorkey((0, 0, 0))
+            pygame.draw.circle(bubble, (255, 255, 255), (30, 30), 30, 0)
+            Shield.__bubble_mask = pygame.mask.from_surface(bubble)
+        self.mask = Shield.__bubble_mask
+        
         #Set the rect attribute
         self.rect = self.image.get_rect()
         self.update_location(centerx, centery)
@@ -491,12 +684,12 @@ class Shield(pygame.sprite.Sprite):
             
 class Space(pygame.sprite.Sprite):    
     '''The background sprite, an image of space.'''
-    def __init__(self):
-        '''Initializes the Space sprite.'''
+    def __init__(self, size=(640, 480)):
+        '''Initializes the Space sprite, scaled to fill a screen of the given
+        size.'''
         pygame.sprite.Sprite.__init__(self)
         #Set image attributes
-        self.image = pygame.image.load("background.png")
-        self.image = self.image.convert()
+        self.image = asteroidsAssets.load_scaled("background.png", size)
         
         #Set rect attribute
         self.rect = self.image.get_rect()
@@ -507,7 +700,7 @@ class Cursor(pygame.sprite.Sprite):
         '''Initializes the Cursor sprite.'''
         pygame.sprite.Sprite.__init__(self)
         #Set image attribute
-        self.image = pygame.image.load("cursor.png")
+        self.image = asteroidsAssets.load_image("cursor.png")
         
         #Set rect attributes
         self.rect = self.image.get_rect()
@@ -527,13 +720,13 @@ class Button(pygame.sprite.Sprite):
         
         #Set image attributes
         if variant == "quit":
-            self.image = pygame.image.load("./Buttons/quit.png")
+            self.image = asteroidsAssets.load_image("./Buttons/quit.png")
         elif variant == "play":
-            self.image = pygame.image.load("./Buttons/play.png")
+            self.image = asteroidsAssets.load_image("./Buttons/play.png")
         elif variant == "help":
-            self.image = pygame.image.load("./Buttons/help.png")
+            self.image = asteroidsAssets.load_image("./Buttons/help.png")
         elif variant == "back":
-            self.image = pygame.image.load("./Buttons/back.png")
+            self.image = asteroidsAssets.load_image("./Buttons/back.png")
         
         #Set rect attributes
         self.rect = self.image.get_rect()
@@ -0,0 +1,633 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: This module contains the World class, which holds the game state
+for one game of Asteroids and advances it one frame at a time. It has no
+knowledge of the keyboard, the mixer or the display, so it can be driven by
+play() or run headless.
+'''
+import pygame, random, weakref, asteroidsAssets, asteroidsCollision, asteroidsEffects, asteroidsSprites, \
+       asteroidsScene
+
+#Actions the player can take during a frame. They are bit flags so that a
+#whole frame of input fits in one small integer.
+ROTATE_LEFT = 1
+ROTATE_RIGHT = 2
+THRUST = 4
+FIRE = 8
+SHIELD = 16
+
+#Draw layers whose sprites move smoothly enough to be blended between steps.
+INTERPOLATED_LAYERS = (asteroidsScene.ASTEROID_LAYER, asteroidsScene.SHIELD_LAYER, \
+                       asteroidsScene.SHIP_LAYER, asteroidsScene.UFO_LAYER, \
+                       asteroidsScene.ROCKET_LAYER, asteroidsScene.ENEMY_ROCKET_LAYER)
+
+#World options for the swarm stress mode: every hit splits an asteroid into
+#4, and 20 more asteroids are kept on the field for every 100 points scored.
+SWARM = {"fragments": 4, "spawn_rate": 20, "max_asteroids": 4000}
+
+#Most asteroids spawned in one step, so that a jump in the score does not
+#stall a frame.
+SPAWN_LIMIT = 50
+
+#Files a World loads its images from, for preloading.
+ASSETS = ("asteroid.png", "UFO.png", "./Powerups/1.png", "./Powerups/2.png", "./Powerups/3.png", \
+          "spaceships.png", "background.png", "good times rg.ttf") + \
+         tuple("./Explosion/%d.png" % number for number in range(1, 6))
+
+def load_images():
+    '''Gets the images shared by the sprites of a World from the asset cache.
+    Returns a dict with a list of the asteroid image in each size, the UFO
+    image, a list of the three powerup images and a list of the frames of the
+    explosion animation.'''
+    powerup_images = []
+    for number in range (1, 4):
+        image = asteroidsAssets.load_image("./Powerups/%d.png" %number)
+        powerup_images.append(image)
+    
+    #Sizes 2 and 3 are scaled from the full size image once, up front.
+    asteroid_images = [asteroidsAssets.load_image("asteroid.png")]
+    for size in (2, 3):
+        asteroid_images.append(asteroidsAssets.load_scaled("asteroid.png", \
+                                                           (69-10*size, 65-10*size)))
+    
+    explosion_images = [asteroidsAssets.load_image("./Explosion/%d.png" % number) \
+                        for number in range(1, 6)]
+    
+    return {"asteroid": asteroid_images,
+            "ufo": asteroidsAssets.load_image("UFO.png"),
+            "powerups": powerup_images,
+            "explosion": explosion_images}
+
+class Player(object):
+    '''One player of a game: their ship, score and shield.
+
+    Instance Variables:
+    self.spaceship - the player's Spaceship
+    self.scorekeeper - ScoreKeeper of the player's score, lives and shield
+    self.shield - the player's Shield, or None if it has never been raised
+    '''
+    def __init__(self, screen):
+        '''Initializer method for a Player, with a new ship in the middle of
+        the screen.'''
+        self.spaceship = asteroidsSprites.Spaceship(screen)
+        self.scorekeeper = asteroidsSprites.ScoreKeeper(screen.get_width())
+        self.shield = None
+
+    def is_shielded(self):
+        '''Returns True while the player's shield is up.'''
+        return self.shield is not None and self.shield.alive()
+
+class World(object):
+    '''The state of one game: the sprites, their scene and the score. Each
+    call to step() runs one frame of game logic. A game has one player, whose
+    score is shown, and more can join it with add_player() to share the field.
+
+    Instance Variables:
+    self.__screen - screen, used by the sprites for wrapping around
+    self.__images - dict of the asteroid, ufo and powerup images, see load_images()
+    self.__seed - seed of the world's random numbers, or None
+    self.__random - random.Random the world and its sprites draw from, or the
+                    random module itself when there is no seed
+    self.__frame_rate - frames per second of the world's own clock, or None
+    self.__asteroid_count - number of asteroids kept on the field
+    self.__fragments - number of asteroids an asteroid splits into when hit
+    self.__spawn_rate - extra asteroids kept on the field per 100 points
+    self.__max_asteroids - most asteroids kept on the field by spawning
+    self.__ufo_fire_period - milliseconds between the UFO's chances to shoot
+    self.__frame - number of frames stepped so far
+    self.__sounds - names of the sounds triggered since the last step
+    self.__dirty_rects - bool, if True only the changed parts are redrawn
+    self.__repaint - bool, set when the whole screen has to be redrawn
+    self.__scene - Scene holding every sprite by draw layer and by tag
+    self.__collided - function used to check two sprites for a collision, or
+                      None to use their rects
+    self.__store - EntityStore that moves the asteroids and rockets, or None
+    self.__rockets - RocketPool every rocket is launched from
+    self.__explosions - ExplosionPool playing the explosions, drawn over the
+                        scene
+    self.__particles - ParticleSystem drawing exhaust, debris and rocket
+                       trails between the scene and the explosions, or None
+    self.__interpolate - bool, if True draw() can blend between the last two
+                         steps
+    self.__previous - list of (sprite, center) of every moving sprite before
+                      the last step, used for blending
+    self.__profiler - FrameProfiler timing each phase of a step, or None
+    self.__players - list of the Players, the first being the one whose
+                     score is shown
+    self.__owners - WeakKeyDictionary of each friendly rocket to the Player
+                    who fired it, so that rockets the pool drops are forgotten
+    '''
+    def __init__(self, screen, images, frame_rate=None, asteroid_count=5, \
+                 ufo_fire_period=500, dirty_rects=True, masks=False, vectorized=False, \
+                 interpolate=False, seed=None, particles=False, fragments=1, spawn_rate=0, \
+                 max_asteroids=None):
+        '''Initializer method for the World. If frame_rate is given, the world
+        keeps its own clock that advances 1000/frame_rate ms per step instead
+        of reading pygame.time.get_ticks(). The UFO fire period is rounded
+        down to a multiple of 25 ms. If masks is True, sprites only collide
+        when their visible pixels touch, not just their rects. If vectorized
+        is True, asteroids and rockets are moved all at once by an EntityStore
+        (this needs NumPy). If interpolate is True, the center of every moving
+        sprite is remembered before each step, so that draw() can show them
+        part of the way between two steps. If a seed is given, the world is
+        deterministic: every random number comes from its own generator, and
+        it keeps its own clock (at 30 frames per second unless frame_rate says
+        otherwise), so the same seed and actions always play the same game. If
+        particles is True, the ship's engine, hit asteroids and rockets give
+        off particles (this needs NumPy). fragments, spawn_rate and
+        max_asteroids make a swarm (see SWARM): each asteroid hit splits into
+        fragments pieces, and the number of asteroids kept on the field grows
+        by spawn_rate for every 100 points, up to max_asteroids.'''
+        self.__screen = screen
+        self.__images = images
+        self.__seed = seed
+        self.__random = random
+        if seed is not None:
+            self.__random = random.Random(seed)
+            frame_rate = frame_rate or 30
+        self.__frame_rate = frame_rate
+        self.__asteroid_count = asteroid_count
+        self.__fragments = fragments
+        self.__spawn_rate = spawn_rate
+        self.__max_asteroids = max_asteroids
+        self.__ufo_fire_period = max(ufo_fire_period // 25, 1)
+        self.__frame = 0
+        self.__sounds = []
+        self.__dirty_rects = dirty_rects
+        self.__repaint = True
+        self.__scene = asteroidsScene.Scene()
+        self.__collided = None
+        if masks:
+            self.__collided = asteroidsCollision.collide_mask
+        self.__store = None
+        if vectorized:
+            #Imported here so that NumPy is only needed in vectorized mode.
+            import asteroidsEntities
+            self.__store = asteroidsEntities.EntityStore(screen.get_width(), screen.get_height())
+        self.__rockets = asteroidsSprites.RocketPool(screen, store=self.__store)
+        self.__explosions = asteroidsEffects.ExplosionPool(images["explosion"])
+        self.__particles = None
+        if particles:
+            #Imported here so that NumPy is only needed for particles.
+            import asteroidsParticles
+            self.__particles = asteroidsParticles.ParticleSystem(screen.get_width(), \
+                                                                 screen.get_height(), seed=seed)
+        self.__interpolate = interpolate
+        self.__previous = []
+        self.__profiler = None
+
+        #Create sprites. The background is not part of the scene; it is only
+        #painted when the whole screen is redrawn, and used to clear behind
+        #moving sprites.
+        self.__space = asteroidsSprites.Space(screen.get_size())
+        self.__players = []
+        self.__owners = weakref.WeakKeyDictionary()
+        self.__ufo = None
+        self.add_player()
+        self.__scene.add(self.__players[0].scorekeeper, asteroidsScene.HUD_LAYER)
+
+        #Groups of the scene used for spawning and collisions. Sprites leave
+        #them on their own when they are killed.
+        self.__asteroidSprites = self.__scene.group("asteroid")
+        self.__rocketSprites = self.__scene.group("friendly")
+        self.__shieldSprites = self.__scene.group("shield")
+        self.__powerupSprites = self.__scene.group("pickup")
+        self.__ufoSprites = self.__scene.group("ufo")
+        self.__dangerSprites = self.__scene.group("danger")
+
+    def get_ticks(self):
+        '''Gets/Returns the time in milliseconds used for UFO spawning and firing.'''
+        if self.__frame_rate:
+            return self.__frame * 1000 // self.__frame_rate
+        return pygame.time.get_ticks()
+
+    def set_profiler(self, profiler):
+        '''Sets the FrameProfiler that times each phase of control(),
+        collide(), update() and draw(), or None to stop timing them.'''
+        self.__profiler = profiler
+
+    def __lap(self, phase):
+        '''Ends a phase of the frame, if a profiler is set.'''
+        if self.__profiler is not None:
+            self.__profiler.lap(phase)
+
+    def get_seed(self):
+        '''Gets/Returns the seed of the world, or None if it is not seeded.'''
+        return self.__seed
+
+    def get_frame(self):
+        '''Gets/Returns the number of frames stepped so far.'''
+        return self.__frame
+
+    def add_player(self):
+        '''Adds a player with a new ship in the middle of the screen, and
+        returns their number (the first player is 0).'''
+        player = Player(self.__screen)
+        self.__players.append(player)
+        self.__scene.add(player.spaceship, asteroidsScene.SHIP_LAYER)
+        return len(self.__players) - 1
+
+    def remove_player(self, number):
+        '''Takes a player's ship and shield off the field. The player keeps
+        their number, and only plays again after respawn_player().'''
+        player = self.__players[number]
+        player.spaceship.kill()
+        if player.shield is not None:
+            player.shield.kill()
+
+    def respawn_player(self, number):
+        '''Starts a player over with a new ship in the middle of the screen
+        and a new score, for example when someone else takes their place.'''
+        self.remove_player(number)
+        old = self.__players[number]
+        player = self.__players[number] = Player(self.__screen)
+        self.__scene.add(player.spaceship, asteroidsScene.SHIP_LAYER)
+        if number == 0:
+            old.scorekeeper.kill()
+            self.__scene.add(player.scorekeeper, asteroidsScene.HUD_LAYER)
+
+    def get_player(self, number):
+        '''Gets/Returns the Player with the given number.'''
+        return self.__players[number]
+
+    def get_players(self):
+        '''Gets/Returns the list of every Player, in order of their numbers.'''
+        return list(self.__players)
+
+    def get_scorekeeper(self):
+        '''Gets/Returns the ScoreKeeper of the first player.'''
+        return self.__players[0].scorekeeper
+
+    def get_spaceship(self):
+        '''Gets/Returns the first player's Spaceship.'''
+        return self.__players[0].spaceship
+
+    def get_ufo(self):
+        '''Gets/Returns the UFO on the field, or None if there isn't one.'''
+        if self.__ufoSprites:
+            return self.__ufo
+        return None
+
+    def get_rocket_pool(self):
+        '''Gets/Returns the RocketPool the rockets of this game come from.'''
+        return self.__rockets
+
+    def get_store(self):
+        '''Gets/Returns the EntityStore moving the asteroids and rockets, or
+        None if the world is not vectorized.'''
+        return self.__store
+
+    def get_explosions(self):
+        '''Gets/Returns the ExplosionPool of this game.'''
+        return self.__explosions
+
+    def get_particles(self):
+        '''Gets/Returns the ParticleSystem of this game, or None.'''
+        return self.__particles
+
+    def get_scene(self):
+        '''Gets/Returns the Scene holding every sprite of this game.'''
+        return self.__scene
+
+    def is_shielded(self):
+        '''Returns True while the first player's shield is up.'''
+        return self.__players[0].is_shielded()
+
+    def is_over(self):
+        '''Returns True once every player has run out of lives or been
+        removed.'''
+        for player in self.__players:
+            if player.scorekeeper.get_lives() and player.spaceship.alive():
+                return False
+        return True
+
+    def step(self, actions):
+        '''Runs one frame of the game with the given action flags, or a list
+        of the flags of each player, and returns the names of the sounds that
+        were triggered during the frame.'''
+        self.control(actions)
+        self.collide()
+        self.update()
+
+        sounds = self.__sounds
+        self.__sounds = []
+        return sounds
+
+    def control(self, actions):
+        '''Applies the players' actions (the flags of the first player, or a
+        list of the flags of each player), then spawns asteroids and UFOs,
+        runs the UFO AI and charges or drains the shields.'''
+        if not isinstance(actions, (list, tuple)):
+            actions = (actions,)
+        for player, player_actions in zip(self.__players, actions):
+            if player.spaceship.alive():
+                self.__act(player, player_actions)
+        self.__lap("actions")
+
+        #The best score of any player drives spawning.
+        score = max(player.scorekeeper.get_score() for player in self.__players)
+
+        #Ensures that there are 5 (or asteroid_count) asteroids at all times,
+        #or in a swarm more and more as the score grows.
+        wanted = self.__asteroid_count
+        if self.__spawn_rate:
+            wanted += score * self.__spawn_rate // 100
+            if self.__max_asteroids is not None:
+                wanted = min(wanted, self.__max_asteroids)
+            wanted = min(wanted, len(self.__asteroidSprites) + SPAWN_LIMIT)
+        while len(self.__asteroidSprites) < wanted:
+            new_asteroid = asteroidsSprites.Asteroid(self.__screen, self.__images["asteroid"], \
+                                                     self.__store, self.__random)
+            self.__scene.add(new_asteroid, asteroidsScene.ASTEROID_LAYER, "asteroid", "danger")
+
+        #Spawns a UFO if none exist, every 10 sec. when the score is larger than 250
+        if not self.__ufoSprites and ((self.get_ticks()//1000 % 10) == 0) and \
+           (score >= 250):
+            self.spawn_ufo()
+        self.__lap("spawn")
+
+        #UFO AI shooting, at the nearest ship
+        ufo = self.__ufo
+        if self.__ufoSprites and ((self.get_ticks()//25 % self.__ufo_fire_period) == 0):
+            spaceship = self.__nearest_ship(ufo.rect.center)
+            shot = ufo.shoot(spaceship.rect.centerx, spaceship.rect.centery)
+            if shot == 1:
+                if spaceship.rect.centery < ufo.rect.centery:
+                    rocket = self.__rockets.launch(90, ufo.rect.centerx, ufo.rect.centery, False)
+                else:
+                    rocket = self.__rockets.launch(270, ufo.rect.centerx, ufo.rect.centery, False)
+                self.__scene.add(rocket, asteroidsScene.ENEMY_ROCKET_LAYER, "danger")
+                self.__sounds.append("laser")
+            elif shot == 2:
+                if spaceship.rect.centerx < ufo.rect.centerx:
+                    rocket = self.__rockets.launch(180, ufo.rect.centerx, ufo.rect.centery, False)
+                else:
+                    rocket = self.__rockets.launch(0, ufo.rect.centerx, ufo.rect.centery, False)
+                self.__scene.add(rocket, asteroidsScene.ENEMY_ROCKET_LAYER, "danger")
+                self.__sounds.append("laser")
+        self.__lap("ufo ai")
+
+        #Charging / Draining the shields.
+        for player in self.__players:
+            spaceship = player.spaceship
+            scorekeeper = player.scorekeeper
+            if player.is_shielded():
+                player.shield.update_location(spaceship.rect.centerx, spaceship.rect.centery)
+                player.shield.update_capacity(scorekeeper.get_shield())
+                #If shield is drained, take it down.
+                if not scorekeeper.get_shield():
+                    player.shield.kill()
+                scorekeeper.enable_shield()
+            else:
+                scorekeeper.recharge_shield()
+        self.__lap("shield")
+
+    def __act(self, player, actions):
+        '''Applies one player's action flags to their ship.'''
+        spaceship = player.spaceship
+        scorekeeper = player.scorekeeper
+
+        if actions & ROTATE_RIGHT:
+            spaceship.rotate_right()
+        if actions & ROTATE_LEFT:
+            spaceship.rotate_left()
+
+        #Activates the shields if the capacity is over 50, replacing the old one
+        if actions & SHIELD and (scorekeeper.get_shield() > 50):
+            if player.shield is not None:
+                player.shield.kill()
+            player.shield = asteroidsSprites.Shield(spaceship.rect.centerx, \
+                                                    spaceship.rect.centery, \
+                                                    scorekeeper.get_shield())
+            self.__scene.add(player.shield, asteroidsScene.SHIELD_LAYER, "shield")
+
+        if actions & FIRE:
+            rocket = self.__rockets.launch(spaceship.get_angle(), spaceship.rect.centerx, \
+                                           spaceship.rect.centery, True)
+            self.__scene.add(rocket, asteroidsScene.ROCKET_LAYER, "friendly")
+            self.__owners[rocket] = player
+            self.__sounds.append("laser")
+
+        if actions & THRUST:
+            spaceship.move_forwards()
+            if self.__particles is not None:
+                self.__particles.emit_exhaust(spaceship.rect.centerx, spaceship.rect.centery, \
+                                              spaceship.get_angle())
+
+    def __nearest_ship(self, position):
+        '''Returns the ship nearest to a position, out of the ships still
+        flying, or the first player's if none are.'''
+        x, y = position
+        nearest = self.__players[0].spaceship
+        distance = None
+        for player in self.__players:
+            spaceship = player.spaceship
+            if spaceship.alive():
+                dx = spaceship.rect.centerx - x
+                dy = spaceship.rect.centery - y
+                if distance is None or dx * dx + dy * dy < distance:
+                    nearest = spaceship
+                    distance = dx * dx + dy * dy
+        return nearest
+
+    def spawn_ufo(self):
+        '''Spawns a UFO, unless there is already one on the field.'''
+        if not self.__ufoSprites:
+            self.__ufo = asteroidsSprites.UFO(self.__screen, self.__images["ufo"], self.__random)
+            self.__scene.add(self.__ufo, asteroidsScene.UFO_LAYER, "ufo", "danger")
+
+    def collide(self):
+        '''Runs all of the collision checks for the frame. Large groups are
+        checked against each other through a spatial hash.'''
+        collided = self.__collided
+        size = self.__screen.get_size()
+        owners = self.__owners
+        first = self.__players[0]
+
+        explosions = self.__explosions
+
+        #Between the shields and anything dangerous to the players.
+        for shield, dangers in asteroidsCollision.groupcollide(self.__shieldSprites, \
+                                                               self.__dangerSprites, \
+                                                               True, True, collided, \
+                                                               size=size).items():
+            for danger in dangers:
+                explosions.spawn(danger.rect.centerx, danger.rect.centery)
+            self.__sounds.append("explosion")
+        self.__lap("hit shield")
+
+        #Between the asteroids and the rockets; the points go to whoever fired
+        for asteroid, rockets in asteroidsCollision.groupcollide(self.__asteroidSprites, \
+                                                                 self.__rocketSprites, \
+                                                                 False, True, collided, \
+                                                                 size=size).items():
+            owners.get(rockets[0], first).scorekeeper.add_score(10*asteroid.get_size())
+            explosions.spawn(asteroid.rect.centerx, asteroid.rect.centery)
+            if self.__particles is not None:
+                self.__particles.emit_debris(asteroid.rect.centerx, asteroid.rect.centery, \
+                                             asteroid.get_size())
+            for piece in asteroid.collided(self.__fragments):
+                self.__scene.add(piece, asteroidsScene.ASTEROID_LAYER, "asteroid", "danger")
+            self.__sounds.append("explosion")
+        self.__lap("hit asteroids")
+
+        #Rocket collision with the UFO, may spawn a powerup
+        hits = asteroidsCollision.groupcollide(self.__rocketSprites, self.__ufoSprites, \
+                                               False, False, collided, size=size)
+        if hits:
+            self.__sounds.append("explosion")
+            explosions.spawn(self.__ufo.rect.centerx, self.__ufo.rect.centery)
+            owners.get(next(iter(hits)), first).scorekeeper.add_score(50)
+            random_number = self.__random.randint(1,5)
+            if (random_number <= 3):
+                powerup = asteroidsSprites.Powerup(random_number, self.__ufo.rect.centerx, \
+                                                   self.__ufo.rect.centery, \
+                                                   self.__images["powerups"])
+                self.__scene.add(powerup, asteroidsScene.POWERUP_LAYER, "pickup")
+            asteroidsCollision.groupcollide(self.__rocketSprites, self.__ufoSprites, \
+                                            True, True, collided, size=size)
+        self.__lap("hit ufo")
+
+        for player in self.__players:
+            spaceship = player.spaceship
+            scorekeeper = player.scorekeeper
+            if not spaceship.alive() or \
+               not asteroidsCollision.spritecollide(spaceship, self.__dangerSprites, True, collided):
+                continue
+            scorekeeper.lose_life()
+            self.__sounds.append("explosion")
+            explosions.spawn(spaceship.rect.centerx, spaceship.rect.centery)
+
+            #Resets the spaceship in its "start position" if there are lives
+            #left. With one player, the field is reset along with it.
+            if scorekeeper.get_lives():
+                spaceship.reset()
+
+                if len(self.__players) == 1:
+                    for sprite in self.__dangerSprites:
+                        sprite.reset()
+                    self.__scene.kill("friendly")
+            else:
+                spaceship.kill()
+                if player.shield is not None:
+                    player.shield.kill()
+        self.__lap("hit ship")
+
+        #Give powerup buff to players
+        for player in self.__players:
+            spaceship = player.spaceship
+            scorekeeper = player.scorekeeper
+            if not spaceship.alive():
+                continue
+            for powerup in asteroidsCollision.spritecollide(spaceship, self.__powerupSprites, \
+                                                            True, collided):
+                if powerup.get_type() == 1:
+                    scorekeeper.add_capacity()
+                elif powerup.get_type() == 2:
+                    scorekeeper.add_life()
+                else:
+                    scorekeeper.add_score(100)
+                self.__sounds.append("powerup")
+        self.__lap("hit powerups")
+
+    def update(self):
+        '''Updates every sprite and advances the world's clock by one frame.'''
+        if self.__interpolate:
+            scene = self.__scene
+            self.__previous = [(sprite, sprite.rect.center) for layer in INTERPOLATED_LAYERS \
+                               for sprite in scene.layer(layer)]
+        if self.__store is not None:
+            #The store has already moved everything on these layers.
+            self.__store.step()
+            self.__store.sync()
+            self.__scene.update((asteroidsScene.ASTEROID_LAYER, asteroidsScene.ROCKET_LAYER, \
+                                 asteroidsScene.ENEMY_ROCKET_LAYER))
+        else:
+            self.__scene.update()
+        self.__explosions.update()
+        if self.__particles is not None:
+            self.__update_particles()
+        self.__frame += 1
+
+        profiler = self.__profiler
+        if profiler is not None:
+            profiler.lap("update")
+            for tag in ("asteroid", "friendly", "danger", "ufo", "shield", "pickup"):
+                profiler.count(tag, len(self.__scene.group(tag)))
+            profiler.count("sprites", len(self.__scene))
+            if self.__particles is not None:
+                profiler.count("particles", len(self.__particles))
+
+    def __update_particles(self):
+        '''Moves the particles, then leaves a trail behind every rocket.'''
+        particles = self.__particles
+        particles.update()
+        particles.emit_trails(self.__scene.layer(asteroidsScene.ROCKET_LAYER))
+        particles.emit_trails(self.__scene.layer(asteroidsScene.ENEMY_ROCKET_LAYER), True)
+
+    def draw(self, screen, alpha=1.0):
+        '''Draws every sprite onto the screen and returns the list of rects
+        that changed, to be passed to pygame.display.update(). With dirty
+        rects off, or on the first frame, the whole screen is repainted.
+        alpha is how far to show the moving sprites between where they were
+        before the last step (0) and where they are now (1); it is ignored
+        unless the world was made with interpolate on.'''
+        if self.__interpolate and alpha < 1:
+            return self.__draw_between(screen, alpha)
+        return self.__draw(screen)
+
+    def __draw_between(self, screen, alpha):
+        '''Moves every moving sprite part of the way back to where it was
+        before the last step, draws the world and puts the sprites back.
+        Sprites that wrapped around the screen are left where they are.'''
+        width, height = screen.get_size()
+        moved = []
+        for sprite, (x, y) in self.__previous:
+            rect = sprite.rect
+            centerx, centery = rect.center
+            dx = centerx - x
+            dy = centery - y
+            if (dx or dy) and abs(dx) < width // 2 and abs(dy) < height // 2:
+                moved.append((rect, centerx, centery))
+                rect.center = (x + int(round(dx * alpha)), y + int(round(dy * alpha)))
+        rects = self.__draw(screen)
+        for rect, centerx, centery in moved:
+            rect.center = (centerx, centery)
+        return rects
+
+    def __draw(self, screen):
+        '''Draws every sprite where it is now, then the particles and the
+        explosions over them, see draw().'''
+        particles = self.__particles
+        if self.__repaint or not self.__dirty_rects:
+            screen.blit(self.__space.image, (0, 0))
+            self.__lap("clear")
+            self.__scene.draw(screen, True, self.__dirty_rects)
+            if particles is not None:
+                particles.draw(screen)
+            self.__explosions.draw(screen)
+            self.__lap("draw")
+            self.__repaint = False
+            return [screen.get_rect()]
+        
+        #The HUD has to be redrawn wherever an explosion or a particle was or
+        #will be.
+        below = self.__explosions.get_rects()
+        self.__explosions.clear(screen, self.__space.image)
+        if particles is not None:
+            below.extend(particles.get_rects())
+            particles.clear(screen, self.__space.image)
+        self.__scene.clear(screen, self.__space.image, below)
+        self.__lap("clear")
+        rects = self.__scene.draw(screen)
+        if particles is not None:
+            rects.extend(particles.draw(screen))
+        rects.extend(self.__explosions.draw(screen))
+        self.__lap("draw")
+        return rects
+
+    def repaint(self):
+        '''Makes the next draw() redraw the whole screen, for example after
+        something else has been drawn over the game.'''
+        self.__repaint = True
@@ -0,0 +1,26 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Shared setup for the tests. The game runs on pygame's dummy video
+and audio drivers, and its assets are loaded relative to the repository root.
+'''
+import os, sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pytest, asteroidsHeadless, asteroidsWorld
+
+@pytest.fixture
+def screen():
+    '''An off-screen 640x480 display surface.'''
+    return asteroidsHeadless.init()
+
+@pytest.fixture
+def images(screen):
+    '''The images shared by the sprites of a World.'''
+    return asteroidsWorld.load_images()
@@ -0,0 +1,77 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Tests that the spatial hash finds the same collisions as testing
+every pair of sprites, including sprites that stick out past the edges of the
+playfield and playfields of other sizes than the display.
+'''
+import random, pygame, pytest, asteroidsCollision
+
+SIZES = [(640, 480), (1280, 720), (333, 257)]
+
+class Box(pygame.sprite.Sprite):
+    '''A sprite that is nothing but a rect.'''
+    def __init__(self, x, y, width, height):
+        '''Initializer method for the Box.'''
+        pygame.sprite.Sprite.__init__(self)
+        self.rect = pygame.Rect(x, y, width, height)
+
+def scatter(rng, count, size):
+    '''Returns a group of boxes spread over the playfield, a quarter of them
+    sticking out past an edge or a corner.'''
+    width, height = size
+    group = pygame.sprite.Group()
+    for number in range(count):
+        side = rng.randint(4, 60)
+        if number % 4:
+            x = rng.randint(0, width - side)
+            y = rng.randint(0, height - side)
+        else:
+            x = rng.choice([-side // 2, width - side // 2, rng.randint(0, width - side)])
+            y = rng.choice([-side // 2, height - side // 2, rng.randint(0, height - side)])
+        group.add(Box(x, y, side, side))
+    return group
+
+def pairs(crashed):
+    '''Returns the collisions found as a dict of sprite to a list of sprites.'''
+    return dict((spritea, list(spritesb)) for spritea, spritesb in crashed.items())
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("cell_size", [32, 64, 100])
+def test_groupcollide_matches_brute_force(size, cell_size):
+    rng = random.Random(size[0] * cell_size)
+    groupa = scatter(rng, 150, size)
+    groupb = scatter(rng, 150, size)
+    assert len(groupa) * len(groupb) > asteroidsCollision.BRUTE_FORCE_PAIRS
+    expected = pairs(pygame.sprite.groupcollide(groupa, groupb, False, False))
+    found = pairs(asteroidsCollision.groupcollide(groupa, groupb, False, False, \
+                                                  cell_size=cell_size, size=size))
+    assert expected
+    assert found == expected
+
+@pytest.mark.parametrize("size", SIZES)
+def test_groupcollide_kills_like_brute_force(size):
+    groups = []
+    for collide in (pygame.sprite.groupcollide, asteroidsCollision.groupcollide):
+        rng = random.Random(7)
+        groupa = scatter(rng, 120, size)
+        groupb = scatter(rng, 120, size)
+        boxes = groupa.sprites() + groupb.sprites()
+        kwargs = {"size": size} if collide is asteroidsCollision.groupcollide else {}
+        crashed = collide(groupa, groupb, True, True, **kwargs)
+        groups.append(([boxes.index(box) for box in crashed], \
+                       [box.alive() for box in boxes]))
+    assert groups[0] == groups[1]
+
+@pytest.mark.parametrize("size", SIZES)
+def test_query_finds_rects_across_the_edges(size):
+    width, height = size
+    boxes = [Box(x, y, 40, 40) for x in (-20, width // 2, width - 20) \
+                               for y in (-20, height // 2, height - 20)]
+    boxes.append(Box(-50, -50, width + 100, 30))
+    grid = asteroidsCollision.SpatialHash(width, height, 64)
+    grid.build(boxes)
+    for x in range(-30, width + 30, 17):
+        for y in range(-30, height + 30, 13):
+            rect = pygame.Rect(x, y, 25, 25)
+            assert grid.query(rect) == [box for box in boxes if rect.colliderect(box.rect)]
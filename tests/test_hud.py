@@ -0,0 +1,25 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Tests that the dirty-rect HUD shows the same thing as a full
+repaint.
+'''
+import pygame, asteroidsWorld
+
+def repainted(world, screen):
+    '''Returns the pixels of a full repaint of the world.'''
+    world.repaint()
+    world.draw(screen)
+    return pygame.image.tostring(screen, "RGB")
+
+def test_score_shows_with_several_steps_per_draw(screen, images):
+    world = asteroidsWorld.World(screen, images, frame_rate=30, asteroid_count=0, seed=1)
+    world.draw(screen)
+    for frame in range(60):
+        if frame == 0:
+            world.get_scorekeeper().add_score(100)
+        world.step(0)
+        world.step(0)
+        world.draw(screen)
+        drawn = pygame.image.tostring(screen, "RGB")
+        assert drawn == repainted(world, screen), "frame %d" % frame
@@ -0,0 +1,227 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Tests of network play on localhost: that clients rebuild the
+server's world from delta snapshots when packets are lost, that their ships
+agree with the server's, and that quiet clients are dropped and can join again.
+'''
+import random, socket, pytest, asteroidsHeadless, asteroidsNet, asteroidsWorld
+
+class Relay(object):
+    '''Passes the packets between one client and the server, losing a
+    fraction of them in each direction.
+
+    Instance Variables:
+    self.loss - fraction of the packets lost, from 0 to 1
+    self.__random - Random deciding which packets are lost
+    self.__front - socket the client sends to
+    self.__back - socket connected to the server
+    self.__client - address of the client, once it has sent a packet
+    '''
+    def __init__(self, server, loss, seed):
+        '''Initializer method for the Relay, to the server at (host, port).'''
+        self.loss = loss
+        self.__random = random.Random(seed)
+        self.__front = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__front.bind(("127.0.0.1", 0))
+        self.__front.setblocking(False)
+        self.__back = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__back.connect(server)
+        self.__back.setblocking(False)
+        self.__client = None
+
+    def get_address(self):
+        '''Gets/Returns the (host, port) the client sends to.'''
+        return self.__front.getsockname()
+
+    def pump(self):
+        '''Passes on every packet waiting in either direction, unless it is
+        lost.'''
+        while True:
+            try:
+                data, self.__client = self.__front.recvfrom(asteroidsNet.MAX_DATAGRAM)
+            except BlockingIOError:
+                break
+            if self.__random.random() >= self.loss:
+                self.__back.send(data)
+        while True:
+            try:
+                data = self.__back.recv(asteroidsNet.MAX_DATAGRAM)
+            except BlockingIOError:
+                break
+            if self.__client and self.__random.random() >= self.loss:
+                self.__front.sendto(data, self.__client)
+
+    def close(self):
+        '''Closes both sockets.'''
+        self.__front.close()
+        self.__back.close()
+
+def join(server, client, relay=None):
+    '''Joins the client to the server, trying again as long as the request
+    or the answer is lost.'''
+    for attempt in range(50):
+        client.join()
+        if relay:
+            relay.pump()
+        server.tick()
+        if relay:
+            relay.pump()
+        client.receive()
+        if client.is_joined():
+            return
+    raise AssertionError("the client never joined")
+
+def seen(server):
+    '''Returns the sorted kind and center of every entity in the server's
+    world.'''
+    scene = server.get_world().get_scene()
+    return sorted((kind,) + sprite.rect.center for layer, kind in asteroidsNet.LAYER_KINDS \
+                  for sprite in scene.layer(layer))
+
+@pytest.fixture
+def server(screen, images):
+    '''A server with a seeded world.'''
+    server = asteroidsNet.Server(screen, images, seed=1)
+    yield server
+    server.close()
+
+@pytest.fixture
+def empty_server(screen, images):
+    '''A server with no asteroids, where a ship only goes where it is flown.'''
+    server = asteroidsNet.Server(screen, images, seed=1, asteroid_count=0)
+    yield server
+    server.close()
+
+def test_deltas_rebuild_the_world_through_loss(server):
+    relays = [Relay(server.get_address(), loss, index) \
+              for index, loss in enumerate((0.0, 0.1, 0.3))]
+    clients = [asteroidsNet.Client(relay.get_address()) for relay in relays]
+    for client, relay in zip(clients, relays):
+        join(server, client, relay)
+    bots = [random.Random(index) for index in range(len(clients))]
+    checked = [0] * len(clients)
+    for tick in range(600):
+        for client, bot in zip(clients, bots):
+            if client.is_joined():
+                client.send_input(asteroidsHeadless.random_actions(bot))
+        for relay in relays:
+            relay.pump()
+        server.tick()
+        for relay in relays:
+            relay.pump()
+        expected = seen(server)
+        for index, client in enumerate(clients):
+            #Only a client that got this tick's snapshot is up to date.
+            if client.receive():
+                entities = client.get_entities().values()
+                assert sorted(fields[:3] for fields in entities) == expected
+                checked[index] += 1
+    assert checked[0] == 600
+    assert all(count > 300 for count in checked)
+    assert server.get_stats()["bytes"] < server.get_stats()["full_bytes"]
+    for client, relay in zip(clients, relays):
+        client.close()
+        relay.close()
+
+def test_prediction_matches_the_server(empty_server):
+    server = empty_server
+    client = asteroidsNet.Client(server.get_address())
+    join(server, client)
+    player = server.get_world().get_player(client.get_player())
+    spaceship = player.spaceship
+    bot = random.Random(3)
+    for tick in range(300):
+        if player.scorekeeper.get_lives() < 3:
+            break
+        client.send_input(asteroidsHeadless.random_actions(bot) & ~asteroidsWorld.SHIELD)
+        server.tick()
+        predicted = client.get_spaceship()
+        assert predicted.rect.center == spaceship.rect.center
+        assert predicted.get_angle() == spaceship.get_angle()
+        client.receive()
+    assert tick > 100
+    assert client.get_stats()["corrections"] == 0
+    client.close()
+
+def test_missing_inputs_do_not_turn_the_ship(empty_server):
+    server = empty_server
+    client = asteroidsNet.Client(server.get_address())
+    join(server, client)
+    player = server.get_world().get_player(client.get_player())
+    spaceship = player.spaceship
+    client.send_input(asteroidsWorld.ROTATE_LEFT)
+    for tick in range(4):
+        server.tick()
+    client.receive()
+    assert client.get_spaceship().get_angle() == spaceship.get_angle()
+    assert client.get_stats()["corrections"] == 0
+
+    #Inputs that never come while the client turns and thrusts.
+    bot = random.Random(5)
+    for tick in range(300):
+        if player.scorekeeper.get_lives() < 3:
+            break
+        if bot.random() < 0.7:
+            client.send_input(bot.choice([asteroidsWorld.ROTATE_LEFT, asteroidsWorld.ROTATE_RIGHT, \
+                                          asteroidsWorld.THRUST, 0]))
+        server.tick()
+        assert client.get_spaceship().get_angle() == spaceship.get_angle()
+        client.receive()
+        assert client.get_spaceship().get_angle() == spaceship.get_angle()
+    assert tick > 100
+    client.close()
+
+def test_quiet_clients_are_dropped_and_can_join_again(server):
+    world = server.get_world()
+    player = asteroidsNet.Client(server.get_address())
+    join(server, player)
+    relay = Relay(server.get_address(), 0.0, 0)
+    quiet = asteroidsNet.Client(relay.get_address())
+    join(server, quiet, relay)
+    number = quiet.get_player()
+    assert number == 1
+
+    #Nothing gets through either way, so the client misses being dropped.
+    relay.loss = 1.0
+    for tick in range(asteroidsNet.TIMEOUT):
+        player.send_input(0)
+        quiet.send_input(0)
+        relay.pump()
+        server.tick()
+        relay.pump()
+        player.receive()
+        quiet.receive()
+    assert server.get_stats()["dropped"] == 1
+    assert server.get_stats()["clients"] == 1
+    assert not world.get_player(number).spaceship.alive()
+    assert quiet.is_joined()
+
+    #Its next input is answered by being told it was dropped.
+    relay.loss = 0.0
+    quiet.send_input(0)
+    relay.pump()
+    server.tick()
+    relay.pump()
+    quiet.receive()
+    assert not quiet.is_joined()
+    with pytest.raises(ValueError):
+        quiet.send_input(0)
+
+    join(server, quiet, relay)
+    assert quiet.get_player() == number
+    assert world.get_player(number).spaceship.alive()
+    assert len(world.get_players()) == 2
+    player.close()
+    quiet.close()
+    relay.close()
+
+def test_dropped_clients_are_told_straight_away(server):
+    quiet = asteroidsNet.Client(server.get_address())
+    join(server, quiet)
+    for tick in range(asteroidsNet.TIMEOUT):
+        server.tick()
+    quiet.receive()
+    assert not quiet.is_joined()
+    assert quiet.get_entities() == {}
+    quiet.close()
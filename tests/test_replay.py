@@ -0,0 +1,72 @@
+'''
+By: Deon Hua
+Date: 18 October 2026
+Description: Tests that seeded games are deterministic, and that a recorded
+session plays back exactly the way it was recorded.
+'''
+import random, asteroidsClock, asteroidsHeadless, asteroidsReplay, asteroidsScene
+
+FRAMES = 1500
+
+def state(world):
+    '''Returns the frame, the score, lives and shield of every player, and the
+    kind and rect of every sprite on every layer.'''
+    players = [(player.scorekeeper.get_score(), player.scorekeeper.get_lives(), \
+                player.scorekeeper.get_shield()) for player in world.get_players()]
+    sprites = []
+    for number in range(asteroidsScene.LAYERS):
+        layer = world.get_scene().layer(number)
+        sprites.append(sorted((type(sprite).__name__, tuple(sprite.rect)) for sprite in layer))
+    return world.get_frame(), players, sprites
+
+def play(screen, images, recording, actions):
+    '''Steps the games of a recording with the given actions, starting a new
+    game whenever one is over, and returns the state after every step.'''
+    states = []
+    games = 1
+    world = recording.new_world(screen, images)
+    for frame_actions in actions:
+        world.step(frame_actions)
+        states.append(state(world))
+        if world.is_over():
+            world = recording.new_world(screen, images, games)
+            games += 1
+    return states, world, games
+
+def bot_actions(seed):
+    '''Returns the actions of the headless bot for FRAMES frames.'''
+    bot = random.Random(seed)
+    return [asteroidsHeadless.random_actions(bot) for frame in range(FRAMES)]
+
+def test_same_seed_gives_the_same_game(screen, images):
+    recording = asteroidsReplay.Recording(5, {"frame_rate": 30})
+    actions = bot_actions(5)
+    first = play(screen, images, recording, actions)[0]
+    second = play(screen, images, recording, actions)[0]
+    assert first == second
+    other = asteroidsReplay.Recording(6, {"frame_rate": 30})
+    assert play(screen, images, other, actions)[0] != first
+
+def test_recording_replays_the_same_states(screen, images, tmp_path):
+    recording = asteroidsReplay.Recording(3, {"frame_rate": 30, "fragments": 4, "spawn_rate": 2})
+    actions = bot_actions(3)
+    for frame_actions in actions:
+        recording.record(frame_actions)
+    recorded, world, games = play(screen, images, recording, actions)
+    recording.finish(world, games)
+
+    path = str(tmp_path / "session.rec")
+    recording.save(path)
+    loaded = asteroidsReplay.Recording.load(path)
+    assert len(loaded) == FRAMES
+    assert list(loaded.actions()) == actions
+    assert play(screen, images, loaded, loaded.actions())[0] == recorded
+    assert asteroidsReplay.replay(screen, loaded)["matched"] is True
+
+def test_fixed_timestep_steps_at_its_rate():
+    times = iter([0.0, 0.125, 0.75, 0.875, 3.0, 3.0625])
+    clock = asteroidsClock.FixedTimestep(rate=4, max_steps=5, max_fps=0, timer=lambda: next(times))
+    assert [clock.tick() for call in range(6)] == [1, 0, 3, 0, 5, 0]
+    assert clock.get_stats()["steps"] == 9
+    assert clock.get_stats()["dropped"] == 4
+    assert clock.get_alpha() == 0.25